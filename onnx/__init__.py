@@ -306,6 +306,7 @@ def save_model(
     location: str | None = None,
     size_threshold: int = 1024,
     convert_attribute: bool = False,
+    deduplicate_external_data: bool = False,
 ) -> None:
     """Saves the ModelProto to the specified path and optionally, serialize tensors with raw data as external data before saving.
 
@@ -331,6 +332,9 @@ def save_model(
         convert_attribute: Effective only if save_as_external_data is True.
             If true, convert all tensors to external data
             If false, convert only non-attribute tensors to external data
+        deduplicate_external_data: If true, tensors stored as external data
+            with byte-identical content are written once and share the same
+            location, offset and length. Their ``checksum`` is populated.
     """
     if isinstance(proto, bytes):
         proto = _get_serializer(_DEFAULT_FORMAT).deserialize_proto(proto, ModelProto())
@@ -343,7 +347,9 @@ def save_model(
     model_filepath = _get_file_path(f)
     if model_filepath is not None:
         basepath = os.path.dirname(model_filepath)
-        proto = write_external_data_tensors(proto, basepath)
+        proto = write_external_data_tensors(
+            proto, basepath, deduplicate=deduplicate_external_data
+        )
 
     serialized = _get_serializer(format, model_filepath).serialize_proto(proto)
     _save_bytes(serialized, f)
@@ -0,0 +1,86 @@
+# Copyright (c) ONNX Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""Runs a function over many model files and collects one report per model.
+
+The C++ checker and shape inference release the GIL, so a thread pool runs
+them concurrently. A process pool can be used instead for custom schemas or
+inference functions implemented in Python.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+
+@dataclasses.dataclass
+class ModelReport:
+    """Result of processing one model of a batch.
+
+    Attributes:
+        path: path of the model.
+        ok: True if the model was processed without error.
+        error: the error message if the model failed.
+        error_type: the name of the exception class if the model failed.
+        elapsed: processing time in seconds.
+    """
+
+    path: str
+    ok: bool
+    error: str | None = None
+    error_type: str | None = None
+    elapsed: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return dataclasses.asdict(self)
+
+
+def _run_one(func: Callable[..., None], path: str, *args: Any) -> ModelReport:
+    begin = time.perf_counter()
+    try:
+        func(path, *args)
+    except Exception as e:  # noqa: BLE001
+        return ModelReport(
+            path,
+            False,
+            error=str(e),
+            error_type=type(e).__name__,
+            elapsed=time.perf_counter() - begin,
+        )
+    return ModelReport(path, True, elapsed=time.perf_counter() - begin)
+
+
+def run_batch(
+    func: Callable[..., None],
+    paths: Sequence[str | os.PathLike],
+    args: Sequence[Sequence[Any]],
+    max_workers: int | None,
+    use_processes: bool,
+) -> list[ModelReport]:
+    """Calls ``func(path, *args[i])`` for every path and returns the reports in order.
+
+    `func` must be a module level function when `use_processes` is True.
+    """
+    paths = [os.fspath(p) for p in paths]
+    if max_workers is not None and max_workers < 1:
+        raise ValueError(f"max_workers must be positive, got {max_workers}.")
+    if max_workers == 1 or len(paths) <= 1:
+        return [_run_one(func, p, *a) for p, a in zip(paths, args, strict=True)]
+    executor_type = (
+        concurrent.futures.ProcessPoolExecutor
+        if use_processes
+        else concurrent.futures.ThreadPoolExecutor
+    )
+    with executor_type(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_run_one, func, p, *a)
+            for p, a in zip(paths, args, strict=True)
+        ]
+        return [f.result() for f in futures]
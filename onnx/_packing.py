@@ -0,0 +1,210 @@
+# Copyright (c) ONNX Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""Packing and unpacking of sub-byte element types (INT4, UINT4, FLOAT4E2M1, INT2, UINT2).
+
+ONNX stores 4-bit types two elements per byte and 2-bit types four elements
+per byte, the first element in the least significant bits. The functions in
+this module convert between the packed representation and one element per
+``uint8``. They process the source in fixed-size chunks and write straight
+into the output buffer (which may be preallocated by the caller), so the peak
+memory overhead is bounded by the chunk size rather than the size of the
+tensor. Sources can be any object supporting the buffer protocol, including
+:class:`numpy.memmap` instances, which are then streamed page by page.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# Number of packed bytes processed per iteration.
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def packed_size(num_elements: int, bits: int) -> int:
+    """Returns the number of bytes needed to store `num_elements` elements of `bits` bits."""
+    return (num_elements * bits + 7) // 8
+
+
+def _as_uint8(data: Any) -> npt.NDArray[np.uint8]:
+    """Returns a flat uint8 view over `data` without copying when possible."""
+    if isinstance(data, np.ndarray):
+        if data.dtype.itemsize != 1:
+            raise TypeError(
+                f"Expected an array with 1-byte elements, got dtype {data.dtype}."
+            )
+        return data.reshape(-1).view(np.uint8)
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def _check_out(
+    out: np.ndarray | None, size: int, shape: Sequence[int] | None = None
+) -> npt.NDArray[np.uint8]:
+    if out is None:
+        return np.empty(size if shape is None else tuple(shape), dtype=np.uint8)
+    if out.size != size or out.dtype.itemsize != 1:
+        raise ValueError(
+            f"Output buffer must hold {size} one-byte elements, "
+            f"got shape {out.shape} and dtype {out.dtype}."
+        )
+    if not out.flags.c_contiguous:
+        raise ValueError("Output buffer must be C-contiguous.")
+    return out
+
+
+def _unpack(
+    data: Any,
+    dims: Sequence[int],
+    bits: int,
+    out: np.ndarray | None,
+    chunk_size: int,
+) -> npt.NDArray[np.uint8]:
+    per_byte = 8 // bits
+    mask = (1 << bits) - 1
+    src = _as_uint8(data)
+    expected_elements = math.prod(dims)
+    if expected_elements > src.size * per_byte:
+        raise ValueError(
+            f"Packed {bits}-bit data ({src.size} bytes, {src.size * per_byte} "
+            f"elements unpacked) is too small for the declared shape {list(dims)} "
+            f"({expected_elements} elements required)."
+        )
+    result = _check_out(out, expected_elements, dims)
+    flat = result.reshape(-1).view(np.uint8)
+
+    full = expected_elements // per_byte
+    for start in range(0, full, chunk_size):
+        stop = min(start + chunk_size, full)
+        chunk = src[start:stop]
+        # Each column of `target` receives one element of every packed byte,
+        # the ufuncs write directly into the strided output without temporaries.
+        target = flat[start * per_byte : stop * per_byte].reshape(-1, per_byte)
+        for k in range(per_byte):
+            column = target[:, k]
+            if k == 0:
+                np.bitwise_and(chunk, mask, out=column)
+            else:
+                np.right_shift(chunk, k * bits, out=column)
+                if k < per_byte - 1:
+                    np.bitwise_and(column, mask, out=column)
+
+    tail = expected_elements - full * per_byte
+    if tail:
+        last = int(src[full])
+        for k in range(tail):
+            flat[full * per_byte + k] = (last >> (k * bits)) & mask
+    return result
+
+
+def _pack(
+    array: Any,
+    bits: int,
+    out: np.ndarray | None,
+    chunk_size: int,
+) -> npt.NDArray[np.uint8]:
+    per_byte = 8 // bits
+    mask = (1 << bits) - 1
+    src = _as_uint8(np.ascontiguousarray(array))
+    size = src.size
+    result = _check_out(out, packed_size(size, bits))
+    flat = result.reshape(-1).view(np.uint8)
+
+    full = size // per_byte
+    scratch = np.empty(min(chunk_size, full), dtype=np.uint8)
+    for start in range(0, full, chunk_size):
+        stop = min(start + chunk_size, full)
+        target = flat[start:stop]
+        values = src[start * per_byte : stop * per_byte].reshape(-1, per_byte)
+        tmp = scratch[: stop - start]
+        # The last element is shifted into the high bits, which discards its
+        # upper bits, so it does not need to be masked first.
+        np.left_shift(values[:, per_byte - 1], (per_byte - 1) * bits, out=target)
+        for k in range(per_byte - 1):
+            np.bitwise_and(values[:, k], mask, out=tmp)
+            if k:
+                np.left_shift(tmp, k * bits, out=tmp)
+            np.bitwise_or(target, tmp, out=target)
+
+    tail = size - full * per_byte
+    if tail:
+        last = 0
+        for k in range(tail):
+            last |= (int(src[full * per_byte + k]) & mask) << (k * bits)
+        flat[full] = last
+    return result
+
+
+def unpack_4bit(
+    data: Any,
+    dims: Sequence[int],
+    out: np.ndarray | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> npt.NDArray[np.uint8]:
+    """Unpacks 4-bit elements stored two per byte into one element per uint8.
+
+    Args:
+        data: packed bytes, a 1-byte numpy array (possibly a
+            :class:`numpy.memmap`) or any object supporting the buffer protocol.
+        dims: the shape of the unpacked tensor.
+        out: optional preallocated C-contiguous output with 1-byte elements
+            and ``prod(dims)`` elements.
+        chunk_size: number of packed bytes processed at once.
+
+    Returns:
+        A uint8 array of shape `dims` (or `out` if given).
+    """
+    return _unpack(data, dims, 4, out, chunk_size)
+
+
+def pack_4bitx2(
+    array: Any,
+    out: np.ndarray | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> npt.NDArray[np.uint8]:
+    """Packs an array with 1-byte elements into 4-bit elements stored two per byte.
+
+    Elements must already be in the range of the target type, only their
+    4 lower bits are kept.
+
+    Args:
+        array: an array with 1-byte elements (uint8, int8, ml_dtypes int4...).
+        out: optional preallocated C-contiguous output of ``ceil(array.size / 2)``
+            1-byte elements.
+        chunk_size: number of packed bytes produced at once.
+
+    Returns:
+        A flat uint8 array (or `out` if given).
+    """
+    return _pack(array, 4, out, chunk_size)
+
+
+def unpack_2bit(
+    data: Any,
+    dims: Sequence[int],
+    out: np.ndarray | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> npt.NDArray[np.uint8]:
+    """Unpacks 2-bit elements stored four per byte into one element per uint8.
+
+    See :func:`unpack_4bit` for the description of the arguments.
+    """
+    return _unpack(data, dims, 2, out, chunk_size)
+
+
+def pack_2bitx4(
+    array: Any,
+    out: np.ndarray | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> npt.NDArray[np.uint8]:
+    """Packs an array with 1-byte elements into 2-bit elements stored four per byte.
+
+    See :func:`pack_4bitx2` for the description of the arguments.
+    """
+    return _pack(array, 2, out, chunk_size)
@@ -4,17 +4,56 @@
 from __future__ import annotations
 
 import argparse
+import json
+import sys
 
 from onnx import NodeProto, checker, load
 
 
 def check_model() -> None:
     parser = argparse.ArgumentParser("check-model")
-    parser.add_argument("model_pb", type=argparse.FileType("rb"))
+    parser.add_argument("model_pb", nargs="+")
+    parser.add_argument(
+        "--full-check", action="store_true", help="also run shape inference"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of models checked concurrently when several models are given",
+    )
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="check the models in a process pool instead of a thread pool",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print the report in JSON format"
+    )
     args = parser.parse_args()
 
-    model = load(args.model_pb)
-    checker.check_model(model)
+    if len(args.model_pb) == 1 and not args.json:
+        with open(args.model_pb[0], "rb") as f:
+            model = load(f)
+        checker.check_model(model, full_check=args.full_check)
+        return
+
+    reports = checker.check_models(
+        args.model_pb,
+        full_check=args.full_check,
+        max_workers=args.jobs,
+        use_processes=args.processes,
+    )
+    if args.json:
+        json.dump([r.to_dict() for r in reports], sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for r in reports:
+            status = "OK" if r.ok else f"FAILED ({r.error_type}): {r.error}"
+            sys.stdout.write(f"{r.path}: {status} [{r.elapsed:.3f}s]\n")
+    if not all(r.ok for r in reports):
+        sys.exit(1)
 
 
 def check_node() -> None:
@@ -5,11 +5,14 @@
 #include "onnx/checker.h"
 
 #include <algorithm>
+#include <atomic>
 #include <cstdint>
+#include <exception>
 #include <filesystem> // NOLINT(build/c++17)
 #include <iostream>
 #include <limits>
 #include <string>
+#include <thread>
 #include <unordered_map>
 #include <unordered_set>
 #include <vector>
@@ -730,6 +733,45 @@ void check_attribute(const AttributeProto& attr, const CheckerContext& ctx, cons
   }
 }
 
+// Graphs with fewer nodes are checked sequentially, threads would cost more than they save.
+static constexpr int kMinNodesPerParallelCheck = 256;
+
+// Runs check(i) for i in [0, n) on up to ctx.get_num_threads() threads. Returns the exception
+// thrown by each check, by index, so that callers can report them in the order of a sequential
+// check.
+template <typename Check>
+static std::vector<std::exception_ptr> parallel_check(size_t n, const CheckerContext& ctx, Check&& check) {
+  std::vector<std::exception_ptr> errors(n);
+  std::atomic<size_t> next{0};
+  auto worker = [&]() {
+    for (size_t i = next++; i < n; i = next++) {
+      ONNX_TRY {
+        check(i);
+      }
+      ONNX_CATCH(...) {
+        ONNX_HANDLE_EXCEPTION([&]() { errors[i] = std::current_exception(); });
+      }
+    }
+  };
+  const size_t num_threads = std::min(n, static_cast<size_t>(std::max(ctx.get_num_threads(), 1)));
+  std::vector<std::thread> threads;
+  threads.reserve(num_threads);
+  for (size_t t = 1; t < num_threads; ++t) {
+    threads.emplace_back(worker);
+  }
+  worker();
+  for (auto& thread : threads) {
+    thread.join();
+  }
+  return errors;
+}
+
+static bool has_subgraph(const NodeProto& node) {
+  return std::any_of(node.attribute().begin(), node.attribute().end(), [](const AttributeProto& attr) {
+    return attr.type() == AttributeProto::GRAPH || attr.type() == AttributeProto::GRAPHS;
+  });
+}
+
 static void print_warning_if_has_experimental(const std::unordered_set<std::string>& used_experimental_ops) {
   if (!used_experimental_ops.empty()) {
     std::string all_experimental_ops;
@@ -826,7 +868,20 @@ void check_graph(const GraphProto& graph, const CheckerContext& ctx, const Lexic
 
   std::unordered_set<std::string> initializer_name_checker;
 
-  for (const auto& init : graph.initializer()) {
+  // The tensors (data size, external data...) are checked concurrently, the errors are raised
+  // below in the order of the sequential check.
+  std::vector<std::exception_ptr> tensor_errors;
+  std::vector<std::exception_ptr> sparse_tensor_errors;
+  if (ctx.get_num_threads() > 1) {
+    tensor_errors =
+        parallel_check(graph.initializer_size(), ctx, [&](size_t i) { check_tensor(graph.initializer(i), ctx); });
+    sparse_tensor_errors = parallel_check(graph.sparse_initializer_size(), ctx, [&](size_t i) {
+      check_sparse_tensor(graph.sparse_initializer(i), ctx);
+    });
+  }
+
+  for (int i = 0; i < graph.initializer_size(); ++i) {
+    const auto& init = graph.initializer(i);
     enforce_has_field(init, name);
     const auto& name = init.name();
     if (name.empty()) {
@@ -837,7 +892,11 @@ void check_graph(const GraphProto& graph, const CheckerContext& ctx, const Lexic
       fail_check(name + " initializer name is not unique");
     }
 
-    check_tensor(init, ctx);
+    if (tensor_errors.empty()) {
+      check_tensor(init, ctx);
+    } else if (tensor_errors[i]) {
+      std::rethrow_exception(tensor_errors[i]);
+    }
 
     if (ctx.get_ir_version() <= 0x00000003) {
       // Initializers are a subset of graph inputs for IR_VERSION <= 3
@@ -851,7 +910,8 @@ void check_graph(const GraphProto& graph, const CheckerContext& ctx, const Lexic
     }
   }
 
-  for (const auto& sparse_init : graph.sparse_initializer()) {
+  for (int i = 0; i < graph.sparse_initializer_size(); ++i) {
+    const auto& sparse_init = graph.sparse_initializer(i);
     const auto& values = sparse_init.values();
     enforce_has_field(values, name);
     const auto& name = values.name();
@@ -861,11 +921,29 @@ void check_graph(const GraphProto& graph, const CheckerContext& ctx, const Lexic
     if (!initializer_name_checker.insert(name).second) {
       fail_check(name + " sparse initializer name is not unique across initializers and sparse_initializers");
     }
-    check_sparse_tensor(sparse_init, ctx);
+    if (sparse_tensor_errors.empty()) {
+      check_sparse_tensor(sparse_init, ctx);
+    } else if (sparse_tensor_errors[i]) {
+      std::rethrow_exception(sparse_tensor_errors[i]);
+    }
     lex_ctx.add(name);
   }
+
+  // The nodes without subgraphs do not depend on the lexical scope and are verified against
+  // their schema concurrently. Nodes with subgraphs are checked in order below.
+  std::vector<std::exception_ptr> node_errors;
+  if (ctx.get_num_threads() > 1 && graph.node_size() >= kMinNodesPerParallelCheck) {
+    const LexicalScopeContext empty_lex_ctx;
+    node_errors = parallel_check(graph.node_size(), ctx, [&](size_t i) {
+      if (!has_subgraph(graph.node(i))) {
+        check_node(graph.node(i), ctx, empty_lex_ctx);
+      }
+    });
+  }
+
   std::unordered_set<std::string> used_experimental_ops;
-  for (const auto& node : graph.node()) {
+  for (int i = 0; i < graph.node_size(); ++i) {
+    const auto& node = graph.node(i);
     // nodes must be in topologically sorted order
     for (const auto& input : node.input()) {
       // explicit optional input
@@ -894,7 +972,11 @@ void check_graph(const GraphProto& graph, const CheckerContext& ctx, const Lexic
     // inner block
 
     ONNX_TRY {
-      check_node(node, ctx, lex_ctx);
+      if (node_errors.empty() || has_subgraph(node)) {
+        check_node(node, ctx, lex_ctx);
+      } else if (node_errors[i]) {
+        std::rethrow_exception(node_errors[i]);
+      }
     }
     ONNX_CATCH(ValidationError & ex) {
       ONNX_HANDLE_EXCEPTION([&]() {
@@ -1167,6 +1249,20 @@ void check_model_local_functions(
   CheckerContext ctx_copy = ctx;
   ctx_copy.set_opset_imports(model_opset_imports);
 
+  if (ctx.get_num_threads() > 1 && model.functions_size() > 1) {
+    // Functions are independent: each one is checked by a single thread.
+    CheckerContext function_ctx = ctx_copy;
+    function_ctx.set_num_threads(1);
+    const auto errors = parallel_check(model.functions_size(), ctx, [&](size_t i) {
+      check_function(model.functions(static_cast<int>(i)), function_ctx, parent_lex);
+    });
+    for (const auto& error : errors) {
+      if (error) {
+        std::rethrow_exception(error);
+      }
+    }
+    return;
+  }
   for (const auto& function_proto : model.functions()) {
     check_function(function_proto, ctx_copy, parent_lex);
   }
@@ -1308,7 +1404,8 @@ void check_model(
     const std::string& model_path,
     bool full_check,
     bool skip_opset_compatibility_check,
-    bool check_custom_domain) {
+    bool check_custom_domain,
+    int num_threads) {
   ModelProto model;
   LoadProtoFromPath(model_path, model);
 
@@ -1321,6 +1418,7 @@ void check_model(
   ctx.set_model_dir(model_dir);
   ctx.set_skip_opset_compatibility_check(skip_opset_compatibility_check);
   ctx.set_check_custom_domain(check_custom_domain);
+  ctx.set_num_threads(num_threads);
   check_model(model, ctx);
 
   if (full_check) {
@@ -1333,10 +1431,12 @@ void check_model(
     const ModelProto& model,
     bool full_check,
     bool skip_opset_compatibility_check,
-    bool check_custom_domain) {
+    bool check_custom_domain,
+    int num_threads) {
   CheckerContext ctx;
   ctx.set_skip_opset_compatibility_check(skip_opset_compatibility_check);
   ctx.set_check_custom_domain(check_custom_domain);
+  ctx.set_num_threads(num_threads);
   check_model(model, ctx);
   if (full_check) {
     ShapeInferenceOptions options{true, 1, false};
@@ -90,6 +90,16 @@ class CheckerContext final {
     check_custom_domain_ = value;
   }
 
+  // Number of threads used to check the nodes and initializers of large graphs and the
+  // model local functions. Errors are reported as by a sequential check.
+  int get_num_threads() const {
+    return num_threads_;
+  }
+
+  void set_num_threads(int num_threads) {
+    num_threads_ = num_threads;
+  }
+
   explicit CheckerContext() = default;
 
  private:
@@ -100,6 +110,7 @@ class CheckerContext final {
   std::string model_dir_;
   bool skip_opset_compatibility_check_ = false;
   bool check_custom_domain_ = false;
+  int num_threads_ = 1;
 };
 
 class LexicalScopeContext final {
@@ -180,12 +191,14 @@ ONNX_API void check_model(
     const ModelProto& model,
     bool full_check = false,
     bool skip_opset_compatibility_check = false,
-    bool check_custom_domain = false);
+    bool check_custom_domain = false,
+    int num_threads = 1);
 ONNX_API void check_model(
     const std::string& model_path,
     bool full_check = false,
     bool skip_opset_compatibility_check = false,
-    bool check_custom_domain = false);
+    bool check_custom_domain = false,
+    int num_threads = 1);
 std::filesystem::path resolve_external_data_location(
     const std::string& base_dir,
     const std::string& location,
@@ -10,12 +10,14 @@ __all__ = [
     "check_function",
     "check_graph",
     "check_model",
+    "check_models",
     "check_node",
     "check_sparse_tensor",
     "check_tensor",
     "check_value_info",
     "DEFAULT_CONTEXT",
     "LEXICAL_SCOPE_CONTEXT",
+    "ModelReport",
     "ValidationError",
     "C",
     "MAXIMUM_PROTOBUF",
@@ -26,9 +28,12 @@ from typing import TYPE_CHECKING
 
 import onnx.defs
 import onnx.onnx_cpp2py_export.checker as C  # noqa: N812
+from onnx._batch import ModelReport, run_batch
 from onnx.onnx_pb import IR_VERSION
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from google.protobuf.message import Message
 
 # Maximum single-protobuf size; matches the C++ parser limit in proto_utils.h (2 GiB - 1 byte)
@@ -122,6 +127,7 @@ def check_model(
     full_check: bool = False,
     skip_opset_compatibility_check: bool = False,
     check_custom_domain: bool = False,
+    num_threads: int = 1,
 ) -> None:
     """Check the consistency of a model.
 
@@ -141,6 +147,9 @@ def check_model(
             opset compatibility.
         check_custom_domain: If True, the function will check all domains. Otherwise
             only check built-in domains.
+        num_threads: Number of threads used to check the nodes of large graphs,
+            the initializers and the model local functions concurrently. The
+            first error of a sequential check is reported whatever the value.
     """
     # If model is a path instead of ModelProto
     if isinstance(model, (str, os.PathLike)):
@@ -149,6 +158,7 @@ def check_model(
             full_check,
             skip_opset_compatibility_check,
             check_custom_domain,
+            num_threads,
         )
     else:
         protobuf_string = (
@@ -165,7 +175,46 @@ def check_model(
             full_check,
             skip_opset_compatibility_check,
             check_custom_domain,
+            num_threads,
         )
 
 
+def check_models(
+    model_paths: Sequence[str | os.PathLike],
+    full_check: bool = False,
+    skip_opset_compatibility_check: bool = False,
+    check_custom_domain: bool = False,
+    *,
+    max_workers: int | None = None,
+    use_processes: bool = False,
+) -> list[ModelReport]:
+    """Check many models and report the result of every model.
+
+    The models are checked concurrently, the checker releases the GIL so a
+    thread pool is used by default. Errors are not raised but recorded in
+    the reports.
+
+    Args:
+        model_paths: Paths of the models to check.
+        full_check: See :func:`check_model`.
+        skip_opset_compatibility_check: See :func:`check_model`.
+        check_custom_domain: See :func:`check_model`.
+        max_workers: Maximum number of concurrent checks, the default of
+            :class:`concurrent.futures.ThreadPoolExecutor` or
+            :class:`concurrent.futures.ProcessPoolExecutor` if None.
+        use_processes: Use a process pool instead of a thread pool.
+
+    Returns:
+        One :class:`ModelReport` per model, in the order of `model_paths`.
+    """
+    args = (full_check, skip_opset_compatibility_check, check_custom_domain)
+    return run_batch(
+        check_model,
+        model_paths,
+        [args] * len(model_paths),
+        max_workers,
+        use_processes,
+    )
+
+
 ValidationError = C.ValidationError
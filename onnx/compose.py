@@ -16,7 +16,63 @@ from onnx import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import MutableMapping
+    from collections.abc import MutableMapping, Sequence
+
+
+class _NameIndex:
+    """Names of the edges, value infos, initializers and sparse initializers of graphs.
+
+    An index is built in a single pass over a graph and can be extended with
+    other graphs, so the names of many merged graphs are only visited once.
+    """
+
+    def __init__(self) -> None:
+        self.edges: set[str] = set()
+        self.value_infos: set[str] = set()
+        self.initializers: set[str] = set()
+        self.sparse_values: set[str] = set()
+        self.sparse_indices: set[str] = set()
+
+    def add(self, graph: GraphProto, exclude_edges: set[str] | None = None) -> None:
+        # Edges already cover input/output
+        edges = set()
+        for n in graph.node:
+            edges.update(n.input)
+            edges.update(n.output)
+        edges.discard("")
+        if exclude_edges:
+            edges.difference_update(exclude_edges)
+        self.edges.update(edges)
+        self.value_infos.update(e.name for e in graph.value_info)
+        self.initializers.update(e.name for e in graph.initializer)
+        self.sparse_values.update(e.values.name for e in graph.sparse_initializer)
+        self.sparse_indices.update(e.indices.name for e in graph.sparse_initializer)
+
+    @classmethod
+    def from_graph(
+        cls, graph: GraphProto, exclude_edges: set[str] | None = None
+    ) -> _NameIndex:
+        index = cls()
+        index.add(graph, exclude_edges)
+        return index
+
+    def overlapping(self, other: _NameIndex) -> list[tuple[str, list[str]]]:
+        result = []
+        overlap = list(self.edges & other.edges)
+        if overlap:
+            result.append(("edge", overlap))
+        overlap = list(self.value_infos & other.value_infos)
+        if overlap:
+            result.append(("value_info", overlap))
+        overlap = list(self.initializers & other.initializers)
+        if overlap:
+            result.append(("initializer", overlap))
+        overlap = list(self.sparse_values & other.sparse_values) + list(
+            self.sparse_indices & other.sparse_indices
+        )
+        if overlap:
+            result.append(("sparse_initializer", overlap))
+        return result
 
 
 def check_overlapping_names(
@@ -36,56 +92,42 @@ def check_overlapping_names(
     if not isinstance(g2, GraphProto):
         raise TypeError("g2 argument is not an ONNX graph")
 
-    def _overlapping(c1: list[str], c2: list[str]) -> list[str]:
-        return list(set(c1) & set(c2))
-
-    def _edge_names(graph: GraphProto, exclude: set[str] | None = None) -> list[str]:
-        if exclude is None:
-            exclude = set()
-        edges = []
-        for n in graph.node:
-            for i in n.input:
-                if i != "" and i not in exclude:
-                    edges.append(i)  # noqa: PERF401
-            for o in n.output:
-                if o != "" and o not in exclude:
-                    edges.append(o)  # noqa: PERF401
-        return edges
-
-    result = []
-
     if not io_map:
         io_map = []
     io_map_inputs = {elem[1] for elem in io_map}
+    return _NameIndex.from_graph(g1).overlapping(
+        _NameIndex.from_graph(g2, exclude_edges=io_map_inputs)
+    )
 
-    # Edges already cover input/output
-    overlap = _overlapping(_edge_names(g1), _edge_names(g2, exclude=io_map_inputs))
-    if overlap:
-        result.append(("edge", overlap))
 
-    overlap = _overlapping(
-        [e.name for e in g1.value_info], [e.name for e in g2.value_info]
-    )
-    if overlap:
-        result.append(("value_info", overlap))
+def _raise_overlapping_names(overlapping_names: list[tuple[str, list[str]]]) -> None:
+    if len(overlapping_names) > 0:
+        category, names = overlapping_names[0]
+        raise ValueError(
+            "Cant merge two graphs with overlapping names. "
+            f"Found repeated {category} names: "
+            + ", ".join(names)
+            + "\n"
+            + "Consider using ``onnx.compose.add_prefix`` to add a prefix to names in one of the graphs."
+        )
 
-    overlap = _overlapping(
-        [e.name for e in g1.initializer], [e.name for e in g2.initializer]
-    )
-    if overlap:
-        result.append(("initializer", overlap))
-
-    overlap = _overlapping(
-        [e.values.name for e in g1.sparse_initializer],
-        [e.values.name for e in g2.sparse_initializer],
-    ) + _overlapping(
-        [e.indices.name for e in g1.sparse_initializer],
-        [e.indices.name for e in g2.sparse_initializer],
-    )
-    if overlap:
-        result.append(("sparse_initializer", overlap))
 
-    return result
+def _connect_io(
+    graph: GraphProto, start: int, end: int, reversed_io_map: dict[str, str]
+) -> None:
+    """Renames the inputs of nodes[start:end] of graph and their subgraphs found in reversed_io_map."""
+    for node_idx in range(start, end):
+        node = graph.node[node_idx]
+        for attr in node.attribute:
+            if attr.type == AttributeProto.GRAPH:
+                _connect_io(attr.g, 0, len(attr.g.node), reversed_io_map)
+            elif attr.type == AttributeProto.GRAPHS:
+                for sub_g in attr.graphs:
+                    _connect_io(sub_g, 0, len(sub_g.node), reversed_io_map)
+
+        for index, name_ in enumerate(node.input):
+            if name_ in reversed_io_map:
+                node.input[index] = reversed_io_map[name_]
 
 
 def merge_graphs(
@@ -133,15 +175,10 @@ def merge_graphs(
 
     # Prefixing names in the graph if requested, adjusting io_map accordingly
     if prefix1 or prefix2:
+        # add_prefix_graph returns a renamed copy.
         if prefix1:
-            g1_copy = GraphProto()
-            g1_copy.CopyFrom(g1)
-            g1 = g1_copy
             g1 = add_prefix_graph(g1, prefix=prefix1)
         if prefix2:
-            g2_copy = GraphProto()
-            g2_copy.CopyFrom(g2)
-            g2 = g2_copy
             g2 = add_prefix_graph(g2, prefix=prefix2)
         io_map = [
             (
@@ -199,16 +236,7 @@ def merge_graphs(
             raise ValueError(f"Input {g2_in_name} is not present in g2")
 
     # Check for name collision
-    overlapping_names = check_overlapping_names(g1, g2, io_map)
-    if len(overlapping_names) > 0:
-        category, names = overlapping_names[0]
-        raise ValueError(
-            "Cant merge two graphs with overlapping names. "
-            f"Found repeated {category} names: "
-            + ", ".join(names)
-            + "\n"
-            + "Consider using ``onnx.compose.add_prefix`` to add a prefix to names in one of the graphs."
-        )
+    _raise_overlapping_names(check_overlapping_names(g1, g2, io_map))
 
     g = GraphProto()
 
@@ -217,23 +245,8 @@ def merge_graphs(
     g.node.extend(g2.node)
     g2_nodes_end = len(g.node)
 
-    # Search inputs of the subgraph recursively
-    def connect_io(sub_graph: GraphProto, start: int, end: int) -> None:
-        for node_idx in range(start, end):
-            node = sub_graph.node[node_idx]
-            for attr in node.attribute:
-                if attr.type == AttributeProto.GRAPH:
-                    connect_io(attr.g, 0, len(attr.g.node))
-                elif attr.type == AttributeProto.GRAPHS:
-                    for sub_g in attr.graphs:
-                        connect_io(sub_g, 0, len(sub_g.node))
-
-            for index, name_ in enumerate(node.input):
-                if name_ in reversed_io_map:
-                    node.input[index] = reversed_io_map[name_]
-
     # Connecting outputs of the first graph with the inputs of the second
-    connect_io(g, g2_nodes_begin, g2_nodes_end)
+    _connect_io(g, g2_nodes_begin, g2_nodes_end, reversed_io_map)
 
     if inputs:
         input_set = set(inputs)
@@ -358,31 +371,15 @@ def merge_models(
         )
     ir_version = m1.ir_version
 
-    opset_import_map: MutableMapping[str, int] = {}
     opset_imports = list(m1.opset_import) + list(m2.opset_import)
-
-    for entry in opset_imports:
-        if entry.domain in opset_import_map:
-            found_version = opset_import_map[entry.domain]
-            if entry.version != found_version:
-                raise ValueError(
-                    "Can't merge two models with different operator set ids for a given domain. "
-                    f"Got: {m1.opset_import} and {m2.opset_import}"
-                )
-        else:
-            opset_import_map[entry.domain] = entry.version
+    _merge_opset_imports([m1, m2])
 
     # Prefixing names in the graph if requested, adjusting io_map accordingly
     if prefix1 or prefix2:
+        # add_prefix returns a renamed copy.
         if prefix1:
-            m1_copy = ModelProto()
-            m1_copy.CopyFrom(m1)
-            m1 = m1_copy
             m1 = add_prefix(m1, prefix=prefix1)
         if prefix2:
-            m2_copy = ModelProto()
-            m2_copy.CopyFrom(m2)
-            m2 = m2_copy
             m2 = add_prefix(m2, prefix=prefix2)
         io_map = [
             (
@@ -411,34 +408,209 @@ def merge_models(
         ir_version=ir_version,
     )
 
+    _merge_metadata_and_functions(model, [m1, m2])
+    checker.check_model(model)
+    return model
+
+
+def _merge_opset_imports(models: Sequence[ModelProto]) -> MutableMapping[str, int]:
+    """Returns the version imported for every domain, raises if two models disagree."""
+    opset_import_map: MutableMapping[str, int] = {}
+    for m in models:
+        for entry in m.opset_import:
+            if entry.domain in opset_import_map:
+                found_version = opset_import_map[entry.domain]
+                if entry.version != found_version:
+                    raise ValueError(
+                        "Can't merge two models with different operator set ids for a given domain. "
+                        f"Got: {entry.domain} versions {found_version} and {entry.version}"
+                    )
+            else:
+                opset_import_map[entry.domain] = entry.version
+    return opset_import_map
+
+
+def _merge_metadata_and_functions(
+    model: ModelProto, models: Sequence[ModelProto]
+) -> None:
+    """Adds the metadata props and the local functions of `models` to `model`."""
     # Merging model metadata props
-    model_props = {}
-    for meta_entry in m1.metadata_props:
-        model_props[meta_entry.key] = meta_entry.value
-    for meta_entry in m2.metadata_props:
-        if meta_entry.key in model_props:
-            value = model_props[meta_entry.key]
-            if value != meta_entry.value:
-                raise ValueError(
-                    "Can't merge models with different values for the same model metadata property."
-                    f" Found: property = {meta_entry.key}, with values {value} and {meta_entry.value}."
-                )
-        else:
-            model_props[meta_entry.key] = meta_entry.value
+    model_props: dict[str, str] = {}
+    for m in models:
+        for meta_entry in m.metadata_props:
+            if meta_entry.key in model_props:
+                value = model_props[meta_entry.key]
+                if value != meta_entry.value:
+                    raise ValueError(
+                        "Can't merge models with different values for the same model metadata property."
+                        f" Found: property = {meta_entry.key}, with values {value} and {meta_entry.value}."
+                    )
+            else:
+                model_props[meta_entry.key] = meta_entry.value
     helper.set_model_props(model, model_props)
 
     # Merging functions
-    function_overlap = list(
-        {f.name for f in m1.functions} & {f.name for f in m2.functions}
-    )
-    if function_overlap:
+    function_names: set[str] = set()
+    for m in models:
+        names = {f.name for f in m.functions}
+        function_overlap = list(function_names & names)
+        if function_overlap:
+            raise ValueError(
+                "Can't merge models with overlapping local function names."
+                " Found in both graphs: " + ", ".join(function_overlap)
+            )
+        function_names |= names
+        model.functions.MergeFrom(m.functions)
+
+
+def merge_multiple_models(
+    models: Sequence[ModelProto],
+    io_maps: Sequence[list[tuple[str, str]]],
+    name: str | None = None,
+    doc_string: str | None = None,
+    producer_name: str | None = "onnx.compose.merge_models",
+    producer_version: str | None = "1.0",
+    domain: str | None = "",
+    model_version: int | None = 1,
+) -> ModelProto:
+    """Combines a sequence of ONNX models into a single one.
+
+    The result is the same as calling :func:`merge_models` repeatedly, each
+    model being merged with the combination of the previous ones, but every
+    model is visited and copied once, so the cost is linear in the total size
+    of the models. The names of all the graphs are gathered in a single index
+    to detect collisions.
+
+    Arguments:
+        models (list of ModelProto): Models to combine. They should have the
+            same IR version and the same operator sets imported.
+        io_maps (list of lists of pairs of string): ``io_maps[i]`` holds the pairs
+            of names [(out0, in0), (out1, in1), ...] connecting outputs of the
+            combination of ``models[:i + 1]`` to inputs of ``models[i + 1]``. Names
+            must be unique across models, see :func:`add_prefix`.
+        name (string): Optional name for the combined graph.
+            By default, the names of the graphs concatenated with an underscore delimiter
+        doc_string (string): Optional docstring for the combined graph
+        producer_name (string): Optional producer name for the combined model.
+        producer_version (string): Optional producer version for the combined model.
+        domain (string): Optional domain of the combined model.
+        model_version (int): Optional version of the graph encoded.
+
+    Returns:
+        ModelProto
+    """
+    if not models:
+        raise ValueError("At least one model is required.")
+    for m in models:
+        if not isinstance(m, ModelProto):
+            raise TypeError("models must contain ONNX models")
+    if len(io_maps) != len(models) - 1:
         raise ValueError(
-            "Can't merge models with overlapping local function names."
-            " Found in both graphs: " + ", ".join(function_overlap)
+            f"Expected {len(models) - 1} io_maps for {len(models)} models, got {len(io_maps)}."
         )
-    model.functions.MergeFrom(m1.functions)
-    model.functions.MergeFrom(m2.functions)
+    ir_version = models[0].ir_version
+    for m in models[1:]:
+        if m.ir_version != ir_version:
+            raise ValueError(
+                f"IR version mismatch {ir_version} != {m.ir_version}."
+                " All models should have the same IR version"
+            )
+    opset_import_map = _merge_opset_imports(models)
 
+    g = GraphProto()
+    first = models[0].graph
+    g.node.extend(first.node)
+    g.input.extend(first.input)
+    g.initializer.extend(first.initializer)
+    g.sparse_initializer.extend(first.sparse_initializer)
+    g.value_info.extend(first.value_info)
+    outputs = list(first.output)
+    index = _NameIndex.from_graph(first)
+    merged_name = first.name
+    merged_doc_string = first.doc_string
+
+    for io_map, m in zip(io_maps, models[1:], strict=True):
+        graph = m.graph
+        output_names = {o.name for o in outputs}
+        input_names = {i.name for i in graph.input}
+        for out_name, in_name in io_map:
+            if out_name not in output_names:
+                raise ValueError(
+                    f"Output {out_name} is not present in the merged graph"
+                )
+            if in_name not in input_names:
+                raise ValueError(f"Input {in_name} is not present in {graph.name}")
+        io_map_outs = {io[0] for io in io_map}
+        io_map_ins = {io[1] for io in io_map}
+        graph_index = _NameIndex.from_graph(graph, exclude_edges=io_map_ins)
+        _raise_overlapping_names(index.overlapping(graph_index))
+
+        begin = len(g.node)
+        g.node.extend(graph.node)
+        _connect_io(g, begin, len(g.node), {i: o for o, i in io_map})
+
+        # The connected inputs of the graph are dropped.
+        initializers = [
+            init for init in graph.initializer if init.name not in io_map_ins
+        ]
+        sparse_initializers = [
+            init
+            for init in graph.sparse_initializer
+            if init.values.name not in io_map_ins
+        ]
+        value_infos = [vi for vi in graph.value_info if vi.name not in io_map_ins]
+        g.input.extend([i for i in graph.input if i.name not in io_map_ins])
+        g.initializer.extend(initializers)
+        g.sparse_initializer.extend(sparse_initializers)
+        g.value_info.extend(value_infos)
+        index.edges |= graph_index.edges
+        index.initializers.update(init.name for init in initializers)
+        index.sparse_values.update(init.values.name for init in sparse_initializers)
+        index.sparse_indices.update(init.indices.name for init in sparse_initializers)
+        index.value_infos.update(vi.name for vi in value_infos)
+
+        # Connected outputs become intermediate values, their type is kept.
+        new_outputs = [o for o in outputs if o.name not in io_map_outs]
+        new_outputs.extend(graph.output)
+        new_output_names = {o.name for o in new_outputs}
+        connected = [
+            o
+            for o in outputs
+            if o.name in io_map_outs
+            and o.name not in index.value_infos
+            and o.name not in new_output_names
+        ]
+        g.value_info.extend(connected)
+        index.value_infos.update(o.name for o in connected)
+        outputs = new_outputs
+
+        # Same docstring as merge_graphs combining the previous graphs with this one.
+        merged_doc_string = (
+            f"Graph combining {merged_name} and {graph.name}\n"
+            + merged_name
+            + "\n\n"
+            + merged_doc_string
+            + "\n\n"
+            + graph.name
+            + "\n\n"
+            + graph.doc_string
+        )
+        merged_name = f"{merged_name}_{graph.name}"
+
+    g.output.extend(outputs)
+    g.name = name if name is not None else merged_name
+    g.doc_string = doc_string if doc_string is not None else merged_doc_string
+
+    model = helper.make_model(
+        g,
+        producer_name=producer_name,
+        producer_version=producer_version,
+        domain=domain,
+        model_version=model_version,
+        opset_imports=[helper.make_opsetid(d, v) for d, v in opset_import_map.items()],
+        ir_version=ir_version,
+    )
+    _merge_metadata_and_functions(model, models)
     checker.check_model(model)
     return model
 
@@ -187,6 +187,33 @@ static std::unordered_map<std::string, nb::bytes> CallNodeInferenceFunction(
   return typeProtoBytes;
 }
 
+// Copies the types produced by shape inference -- input, output and value_info of the graph
+// and of all its subgraphs (inference types the inputs of subgraphs) -- into delta. Nodes are
+// kept as placeholders holding only their graph attributes so that subgraphs can be matched
+// positionally with the original model.
+static void ExtractInferredTypes(const GraphProto& graph, GraphProto* delta) {
+  *delta->mutable_input() = graph.input();
+  *delta->mutable_output() = graph.output();
+  *delta->mutable_value_info() = graph.value_info();
+  for (const auto& node : graph.node()) {
+    auto* delta_node = delta->add_node();
+    for (const auto& attr : node.attribute()) {
+      if (attr.type() != AttributeProto::GRAPH && attr.type() != AttributeProto::GRAPHS) {
+        continue;
+      }
+      auto* delta_attr = delta_node->add_attribute();
+      delta_attr->set_name(attr.name());
+      delta_attr->set_type(attr.type());
+      if (attr.has_g()) {
+        ExtractInferredTypes(attr.g(), delta_attr->mutable_g());
+      }
+      for (const auto& subgraph : attr.graphs()) {
+        ExtractInferredTypes(subgraph, delta_attr->add_graphs());
+      }
+    }
+  }
+}
+
 template <typename T>
 static std::tuple<std::vector<T>, std::vector<const T*>> ConvertPyObjToPtr(const std::vector<nb::object>& pyObjs) {
   std::vector<T> objs;
@@ -618,26 +645,36 @@ NB_MODULE(onnx_cpp2py_export, onnx_cpp2py_export) { // NOLINT(cppcoreguidelines-
 
   checker.def(
       "check_model",
-      [](const nb::bytes& bytes, bool full_check, bool skip_opset_compatibility_check, bool check_custom_domain)
-          -> void {
+      [](const nb::bytes& bytes,
+         bool full_check,
+         bool skip_opset_compatibility_check,
+         bool check_custom_domain,
+         int num_threads) -> void {
         ModelProto proto{};
         ParseProtoFromPyBytesOrThrow(&proto, bytes);
-        checker::check_model(proto, full_check, skip_opset_compatibility_check, check_custom_domain);
+        nb::gil_scoped_release release;
+        checker::check_model(proto, full_check, skip_opset_compatibility_check, check_custom_domain, num_threads);
       },
       nb::arg("bytes"),
       nb::arg("full_check") = false,
       nb::arg("skip_opset_compatibility_check") = false,
-      nb::arg("check_custom_domain") = false);
+      nb::arg("check_custom_domain") = false,
+      nb::arg("num_threads") = 1);
 
   checker.def(
       "check_model_path",
       static_cast<void (*)(
-          const std::string& path, bool full_check, bool skip_opset_compatibility_check, bool check_custom_domain)>(
-          &checker::check_model),
+          const std::string& path,
+          bool full_check,
+          bool skip_opset_compatibility_check,
+          bool check_custom_domain,
+          int num_threads)>(&checker::check_model),
+      nb::call_guard<nb::gil_scoped_release>(),
       nb::arg("path"),
       nb::arg("full_check") = false,
       nb::arg("skip_opset_compatibility_check") = false,
-      nb::arg("check_custom_domain") = false);
+      nb::arg("check_custom_domain") = false,
+      nb::arg("num_threads") = 1);
 
   checker.def("_open_external_data", &checker::open_external_data);
 
@@ -689,6 +726,30 @@ NB_MODULE(onnx_cpp2py_export, onnx_cpp2py_export) { // NOLINT(cppcoreguidelines-
         return ProtoToBytes(model);
       });
 
+  // inline_local_functions_with_policy: Inlines the call-sites of model-local functions
+  // selected by the policy and returns the model with the inlining statistics.
+  inliner.def(
+      "inline_local_functions_with_policy",
+      [](const nb::bytes& bytes,
+         int64_t max_node_count,
+         bool inline_in_loops,
+         std::vector<std::pair<std::string, std::string>> always_inline) {
+        ModelProto model{};
+        ParseProtoFromPyBytesOrThrow(&model, bytes);
+        inliner::InliningPolicy policy;
+        policy.max_node_count = max_node_count;
+        policy.inline_in_loops = inline_in_loops;
+        policy.always_inline = std::move(always_inline);
+        auto stats = inliner::InlineLocalFunctionsWithPolicy(model, policy);
+        std::unordered_map<std::string, int64_t> stats_dict{
+            {"inlined_calls", stats.inlined_calls},
+            {"nodes_before", stats.nodes_before},
+            {"nodes_after", stats.nodes_after},
+            {"functions_before", stats.functions_before},
+            {"functions_after", stats.functions_after}};
+        return std::make_pair(ProtoToBytes(model), stats_dict);
+      });
+
   // Submodule `shape_inference`
   auto shape_inference = onnx_cpp2py_export.def_submodule("shape_inference");
   shape_inference.doc() = "Shape Inference submodule";
@@ -752,7 +813,10 @@ NB_MODULE(onnx_cpp2py_export, onnx_cpp2py_export) { // NOLINT(cppcoreguidelines-
         ModelProto proto{};
         ParseProtoFromPyBytesOrThrow(&proto, bytes);
         ShapeInferenceOptions options{check_type, strict_mode ? 1 : 0, data_prop};
-        shape_inference::InferShapes(proto, OpSchemaRegistry::Instance(), options);
+        {
+          nb::gil_scoped_release release;
+          shape_inference::InferShapes(proto, OpSchemaRegistry::Instance(), options);
+        }
         return ProtoToBytes(proto);
       },
       nb::arg("bytes"),
@@ -760,6 +824,43 @@ NB_MODULE(onnx_cpp2py_export, onnx_cpp2py_export) { // NOLINT(cppcoreguidelines-
       nb::arg("strict_mode") = false,
       nb::arg("data_prop") = false);
 
+  shape_inference.def(
+      "infer_shapes_delta",
+      [](const nb::bytes& bytes, bool check_type, bool strict_mode, bool data_prop) {
+        ModelProto proto{};
+        ParseProtoFromPyBytesOrThrow(&proto, bytes);
+        ShapeInferenceOptions options{check_type, strict_mode ? 1 : 0, data_prop};
+        shape_inference::InferShapes(proto, OpSchemaRegistry::Instance(), options);
+        GraphProto delta;
+        ExtractInferredTypes(proto.graph(), &delta);
+        return ProtoToBytes(delta);
+      },
+      nb::arg("bytes"),
+      nb::arg("check_type") = false,
+      nb::arg("strict_mode") = false,
+      nb::arg("data_prop") = false);
+
+  shape_inference.def(
+      "infer_shapes_incremental",
+      [](const nb::bytes& bytes,
+         const std::unordered_set<std::string>& changed_values,
+         bool check_type,
+         bool strict_mode,
+         bool data_prop) {
+        ModelProto proto{};
+        ParseProtoFromPyBytesOrThrow(&proto, bytes);
+        ShapeInferenceOptions options{check_type, strict_mode ? 1 : 0, data_prop};
+        shape_inference::InferShapesIncremental(proto, changed_values, OpSchemaRegistry::Instance(), options);
+        GraphProto delta;
+        ExtractInferredTypes(proto.graph(), &delta);
+        return ProtoToBytes(delta);
+      },
+      nb::arg("bytes"),
+      nb::arg("changed_values"),
+      nb::arg("check_type") = false,
+      nb::arg("strict_mode") = false,
+      nb::arg("data_prop") = false);
+
   shape_inference.def(
       "infer_shapes_path",
       [](const std::string& model_path,
@@ -769,7 +870,8 @@ NB_MODULE(onnx_cpp2py_export, onnx_cpp2py_export) { // NOLINT(cppcoreguidelines-
          bool data_prop) -> void {
         ShapeInferenceOptions options{check_type, strict_mode ? 1 : 0, data_prop};
         shape_inference::InferShapes(model_path, output_path, OpSchemaRegistry::Instance(), options);
-      });
+      },
+      nb::call_guard<nb::gil_scoped_release>());
 
   shape_inference.def(
       "infer_function_output_types",
@@ -791,6 +893,13 @@ NB_MODULE(onnx_cpp2py_export, onnx_cpp2py_export) { // NOLINT(cppcoreguidelines-
         return result;
       });
 
+  shape_inference.def("get_function_inference_cache_stats", []() -> std::pair<uint64_t, uint64_t> {
+    auto stats = shape_inference::GetFunctionInferenceCacheStats();
+    return {stats.hits, stats.misses};
+  });
+
+  shape_inference.def("reset_function_inference_cache_stats", &shape_inference::ResetFunctionInferenceCacheStats);
+
   // Submodule `parser`
   auto parser = onnx_cpp2py_export.def_submodule("parser");
   parser.doc() = "Parser submodule";
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import hashlib
 import os
 import re
 import sys
@@ -109,19 +110,18 @@ class ExternalDataInfo:
                 )
 
 
-def _validate_external_data_file_bounds(
+def _seek_external_data(
     data_file: IO[bytes],
     info: ExternalDataInfo,
     tensor_name: str,
-) -> bytes:
-    """Validate offset/length against actual file size and read data.
-
-    Layer 3 defense-in-depth (CWE-400): prevents memory exhaustion even if the
-    model was crafted via direct protobuf APIs that bypass Python parsing.
+) -> int:
+    """Validate offset/length against actual file size and seek to the data.
 
-    Returns the raw bytes read from the file.
+    Returns the number of bytes of the tensor data, which starts at the
+    current position of `data_file`.
     """
     file_size = os.fstat(data_file.fileno()).st_size
+    read_start = info.offset if info.offset is not None else 0
 
     if info.offset is not None:
         if info.offset > file_size:
@@ -131,17 +131,80 @@ def _validate_external_data_file_bounds(
             )
         data_file.seek(info.offset)
 
+    available = file_size - read_start
     if info.length is not None:
-        read_start = info.offset if info.offset is not None else 0
-        available = file_size - read_start
         if info.length > available:
             raise ValueError(
                 f"External data length ({info.length}) exceeds available data "
                 f"({available} bytes from offset {read_start}) "
                 f"for tensor {tensor_name!r}"
             )
-        return data_file.read(info.length)
-    return data_file.read()
+        return info.length
+    return available
+
+
+def _validate_external_data_file_bounds(
+    data_file: IO[bytes],
+    info: ExternalDataInfo,
+    tensor_name: str,
+) -> bytes:
+    """Validate offset/length against actual file size and read data.
+
+    Layer 3 defense-in-depth (CWE-400): prevents memory exhaustion even if the
+    model was crafted via direct protobuf APIs that bypass Python parsing.
+
+    Returns the raw bytes read from the file.
+    """
+    return data_file.read(_seek_external_data(data_file, info, tensor_name))
+
+
+# Number of bytes copied at once by _copy_external_data.
+_COPY_CHUNK_SIZE = 1 << 24
+
+
+def _copy_external_data(
+    model: ModelProto, base_dir: str, output_dir: str, location: str
+) -> None:
+    """Copies the data of the external tensors of `model` into one file.
+
+    Only the byte range of every tensor is read, in chunks, from the external
+    files in `base_dir` and appended to `location` in `output_dir`, which is
+    overwritten. Tensors sharing the same range share the copy. The tensors
+    are updated to point to the new file.
+    """
+    tensors = [t for t in _get_all_tensors(model) if uses_external_data(t)]
+    if not tensors:
+        return
+    infos = [ExternalDataInfo(tensor) for tensor in tensors]
+    dest_path = os.path.join(output_dir, location)
+    real_dest_path = os.path.realpath(dest_path)
+    for tensor, info in zip(tensors, infos, strict=True):
+        if os.path.realpath(os.path.join(base_dir, info.location)) == real_dest_path:
+            raise ValueError(
+                f"External data of tensor {tensor.name!r} is stored in {dest_path!r}, "
+                "which would be overwritten."
+            )
+
+    # (location, offset, length) in the source -> (offset, length) in the copy
+    copied: dict[tuple[str, int, int | None], tuple[int, int]] = {}
+    with open(dest_path, "wb") as dest:
+        for tensor, info in zip(tensors, infos, strict=True):
+            key = (info.location, info.offset or 0, info.length)
+            if key not in copied:
+                fd = _open_external_data_fd(base_dir, info.location, tensor.name, True)
+                with os.fdopen(fd, "rb") as src:
+                    remaining = _seek_external_data(src, info, tensor.name)
+                    offset = dest.tell()
+                    while remaining > 0:
+                        chunk = src.read(min(remaining, _COPY_CHUNK_SIZE))
+                        if not chunk:
+                            break
+                        dest.write(chunk)
+                        remaining -= len(chunk)
+                    copied[key] = (offset, dest.tell() - offset)
+            _set_external_data_entries(
+                tensor, location, *copied[key], checksum=info.checksum
+            )
 
 
 def load_external_data_for_tensor(tensor: TensorProto, base_dir: str) -> None:
@@ -188,7 +251,18 @@ def set_external_data(
         raise ValueError(
             f"Tensor {tensor.name} does not have raw_data field. Cannot set external data for this tensor."
         )
+    _set_external_data_entries(tensor, location, offset, length, checksum, basepath)
+
 
+def _set_external_data_entries(
+    tensor: TensorProto,
+    location: str,
+    offset: int | None = None,
+    length: int | None = None,
+    checksum: str | None = None,
+    basepath: str | None = None,
+) -> None:
+    """Same as :func:`set_external_data` without requiring the tensor to hold raw_data."""
     del tensor.external_data[:]
     tensor.data_location = TensorProto.EXTERNAL
     for k, v in {
@@ -404,7 +478,9 @@ def remove_external_data_field(tensor: TensorProto, field_key: str) -> None:
             del tensor.external_data[i]
 
 
-def write_external_data_tensors(model: ModelProto, filepath: str) -> ModelProto:
+def write_external_data_tensors(
+    model: ModelProto, filepath: str, deduplicate: bool = False
+) -> ModelProto:
     """Serializes data for all the tensors which have data location set to TensorProto.External.
 
     Note: This function also strips basepath information from all tensors' external_data fields.
@@ -412,17 +488,39 @@ def write_external_data_tensors(model: ModelProto, filepath: str) -> ModelProto:
     Arguments:
         model (ModelProto): Model object which is the source of tensors to serialize.
         filepath: System path to the directory which should be treated as base path for external data.
+        deduplicate: If true, tensors with byte-identical data are written only once,
+            all of them point to the same location, offset and length. The
+            ``checksum`` key of every written tensor is set to the SHA-1 digest
+            of its data.
 
     Returns:
         ModelProto: The modified model object.
     """
+    # (sha256 digest, length) -> (location, offset, length, sha1 checksum)
+    written: dict[tuple[bytes, int], tuple[str, int | None, int | None, str]] = {}
     for tensor in _get_all_tensors(model):
         # Writing to external data happens in 2 passes:
         # 1. Tensors with raw data which pass the necessary conditions (size threshold etc) are marked for serialization
         # 2. The raw data in these tensors is serialized to a file
         # Thus serialize only if tensor has raw data and it was marked for serialization
         if uses_external_data(tensor) and tensor.HasField("raw_data"):
-            save_external_data(tensor, filepath)
+            if deduplicate:
+                raw_data = tensor.raw_data
+                # SHA-256 identifies the payload, SHA-1 is the digest the
+                # external data specification defines for `checksum`.
+                key = (hashlib.sha256(raw_data).digest(), len(raw_data))
+                if key not in written:
+                    save_external_data(tensor, filepath)
+                    info = ExternalDataInfo(tensor)
+                    written[key] = (
+                        info.location,
+                        info.offset,
+                        info.length,
+                        hashlib.sha1(raw_data, usedforsecurity=False).hexdigest(),
+                    )
+                set_external_data(tensor, *written[key])
+            else:
+                save_external_data(tensor, filepath)
             tensor.ClearField("raw_data")
 
     return model
@@ -15,7 +15,7 @@ import numpy as np
 import typing_extensions
 
 import onnx
-from onnx import _mapping, defs
+from onnx import _mapping, _packing, defs
 from onnx.onnx_data_pb import MapProto, OptionalProto, SequenceProto
 from onnx.onnx_pb import (
     AttributeProto,
@@ -412,9 +412,9 @@ def make_tensor(
                 TensorProto.UINT4,
                 TensorProto.FLOAT4E2M1,
             }:
-                vals = onnx.numpy_helper._pack_4bitx2(vals)
+                vals = _packing.pack_4bitx2(vals)
             elif data_type in {TensorProto.UINT2, TensorProto.INT2}:
-                vals = onnx.numpy_helper._pack_2bitx4(vals)
+                vals = _packing.pack_2bitx4(vals)
 
             raw_data = onnx.numpy_helper.tobytes_little_endian(vals)
         elif isinstance(vals, bytes):
@@ -433,9 +433,9 @@ def make_tensor(
     assert not raw, "Bug: raw should be False at this point."
 
     if data_type == TensorProto.STRING:
-        vals = np.array(vals).flatten()
-        if len(vals) != 0:
-            vals = np.vectorize(_to_bytes)(vals)  # Convert to bytes
+        if not isinstance(vals, np.ndarray):
+            vals = np.array(vals, dtype=object)
+        vals = onnx.numpy_helper._encode_strings(vals)
     elif data_type in {
         TensorProto.FLOAT8E4M3FN,
         TensorProto.FLOAT8E4M3FNUZ,
@@ -473,10 +473,10 @@ def make_tensor(
         vals = vals.view(np.uint8)  # type: ignore[union-attr]
     elif data_type in {TensorProto.UINT4, TensorProto.INT4, TensorProto.FLOAT4E2M1}:
         # Convert to packed 4-bit representation
-        vals = onnx.numpy_helper._pack_4bitx2(vals)  # type: ignore[arg-type]
+        vals = _packing.pack_4bitx2(vals)  # type: ignore[arg-type]
     elif data_type in {TensorProto.UINT2, TensorProto.INT2}:
         # Convert to packed 2-bit representation
-        vals = onnx.numpy_helper._pack_2bitx4(vals)  # type: ignore[arg-type]
+        vals = _packing.pack_2bitx4(vals)  # type: ignore[arg-type]
     elif data_type == TensorProto.BOOL:
         vals = vals.astype(np.uint8)  # type: ignore[union-attr]
 
@@ -1345,7 +1345,10 @@ def np_dtype_to_tensor_dtype(np_dtype: np.dtype) -> TensorProto.DataType:
     }
     if np_dtype in _np_dtype_to_tensor_dtype:
         return typing.cast("TensorProto.DataType", _np_dtype_to_tensor_dtype[np_dtype])
-    if np.issubdtype(np_dtype, np.str_):
+    if np.issubdtype(np_dtype, np.str_) or np.issubdtype(np_dtype, np.bytes_):
+        return TensorProto.STRING  # type: ignore[return-value]
+    if getattr(np_dtype, "kind", None) == "T":
+        # numpy.dtypes.StringDType
         return TensorProto.STRING  # type: ignore[return-value]
 
     raise ValueError(
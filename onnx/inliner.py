@@ -58,3 +58,45 @@ def inline_selected_functions(
     inlined_model = onnx.ModelProto()
     inlined_model.ParseFromString(result)
     return inlined_model
+
+
+def inline_local_functions_with_policy(
+    model: onnx.ModelProto,
+    max_node_count: int = -1,
+    *,
+    inline_in_loops: bool = False,
+    always_inline: list[tuple[str, str]] | None = None,
+) -> tuple[onnx.ModelProto, dict[str, int]]:
+    """Inline the calls to model-local functions selected by a size policy.
+
+    A call is inlined if the function is listed in `always_inline`, if the
+    function has at most `max_node_count` nodes, or if the call is inside the
+    body of a Loop or Scan and `inline_in_loops` is true. Calls inside the
+    functions that are still called are inlined the same way, and the functions
+    no longer called are removed. Functions requiring a different opset version
+    than the model are not inlined.
+
+    Arguments:
+        model: an ONNX ModelProto
+        max_node_count: maximum number of nodes of an inlined function, nodes of
+            nested subgraphs included. Negative means no limit.
+        inline_in_loops: if true, calls inside Loop and Scan bodies are inlined
+            whatever the size of the function.
+        always_inline: list of functions always inlined. Each element is a tuple
+            of (function domain, function name).
+
+    Returns:
+        The inlined ModelProto and a dictionary with the number of inlined calls
+        (``inlined_calls``) and the number of nodes and functions before and after
+        inlining (``nodes_before``, ``nodes_after``, ``functions_before``,
+        ``functions_after``).
+    """
+    result, stats = C.inline_local_functions_with_policy(
+        model.SerializeToString(),
+        max_node_count,
+        inline_in_loops,
+        always_inline or [],
+    )
+    inlined_model = onnx.ModelProto()
+    inlined_model.ParseFromString(result)
+    return inlined_model, stats
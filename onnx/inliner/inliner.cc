@@ -4,6 +4,8 @@
 
 #include "onnx/inliner/inliner.h"
 
+#include <algorithm>
+#include <cstdint>
 #include <functional>
 #include <memory>
 #include <string>
@@ -495,6 +497,199 @@ class VectorSet : public FunctionIdSet {
   bool invert_;
 };
 
+// A function body in which every name that depends on the call-site is replaced
+// by a slot. Instantiating the template for a call-site produces the same nodes
+// as copying the body and renaming it with InliningRenamer, without visiting the
+// body and looking up every name again. Functions with attribute-references or
+// graph-valued attributes are not supported, they need a full copy per call-site.
+class BodyTemplate {
+ public:
+  static bool IsSupported(const FunctionProto& function) {
+    for (const auto& node : function.node()) {
+      for (const auto& attr : node.attribute()) {
+        if (!attr.ref_attr_name().empty() || attr.has_g() || attr.graphs_size() > 0)
+          return false;
+      }
+    }
+    return true;
+  }
+
+  explicit BodyTemplate(const FunctionProto& function) : nodes_(function.node()), value_infos_(function.value_info()) {
+    output_bases_.assign(function.output().begin(), function.output().end());
+    // Replays the renaming done by InliningRenamer::Rename. Fresh names are recorded
+    // in the order InliningRenamer creates them, so instantiation yields the same names.
+    std::unordered_map<std::string, Slot> scope;
+    for (int i = 0; i < function.input_size(); ++i)
+      scope[function.input(i)] = Slot{SlotKind::kInput, i};
+    for (int i = 0; i < function.output_size(); ++i)
+      scope[function.output(i)] = Slot{SlotKind::kOutput, i};
+    auto lookup = [&scope](const std::string& name) {
+      auto iter = name.empty() ? scope.end() : scope.find(name);
+      return iter == scope.end() ? Slot{} : iter->second;
+    };
+
+    node_slots_.reserve(nodes_.size());
+    for (const auto& node : nodes_) {
+      auto& slots = node_slots_.emplace_back();
+      slots.reserve(1 + node.input_size() + node.output_size());
+      slots.push_back(node.name().empty() ? Slot{} : AddFresh(node.name()));
+      for (const auto& x : node.input())
+        slots.push_back(lookup(x));
+      for (const auto& y : node.output()) {
+        Slot slot = lookup(y);
+        if (slot.kind == SlotKind::kLiteral && !y.empty()) {
+          slot = AddFresh(y);
+          scope[y] = slot;
+        }
+        slots.push_back(slot);
+      }
+    }
+    value_info_slots_.reserve(value_infos_.size());
+    for (const auto& vi : value_infos_)
+      value_info_slots_.push_back(lookup(vi.name()));
+  }
+
+  // Fills the nodes and value_infos of `callee` with the body renamed for `call_node`.
+  void Instantiate(const NodeProto& call_node, const std::string& suffix, NameGenerator& generator, FunctionProto& callee)
+      const {
+    std::vector<std::string> outputs;
+    outputs.reserve(output_bases_.size());
+    for (size_t i = 0; i < output_bases_.size(); ++i) {
+      const int index = static_cast<int>(i);
+      if (index < call_node.output_size() && !call_node.output(index).empty())
+        outputs.push_back(call_node.output(index));
+      else
+        outputs.push_back(generator.CreateNew(output_bases_[i] + suffix));
+    }
+    std::vector<std::string> fresh;
+    fresh.reserve(fresh_bases_.size());
+    for (const auto& base : fresh_bases_)
+      fresh.push_back(generator.CreateNew(base + suffix));
+
+    auto assign = [&](const Slot& slot, std::string& name) {
+      switch (slot.kind) {
+        case SlotKind::kLiteral:
+          break;
+        case SlotKind::kInput:
+          if (slot.index < call_node.input_size())
+            name = call_node.input(slot.index);
+          else
+            name.clear();
+          break;
+        case SlotKind::kOutput:
+          name = outputs[slot.index];
+          break;
+        case SlotKind::kFresh:
+          name = fresh[slot.index];
+          break;
+      }
+    };
+
+    *callee.mutable_node() = nodes_;
+    for (int n = 0; n < callee.node_size(); ++n) {
+      NodeProto& node = *callee.mutable_node(n);
+      const auto& slots = node_slots_[n];
+      // Unnamed nodes keep their name unset.
+      if (slots[0].kind != SlotKind::kLiteral)
+        assign(slots[0], *node.mutable_name());
+      size_t k = 1;
+      for (auto& x : *node.mutable_input())
+        assign(slots[k++], x);
+      for (auto& y : *node.mutable_output())
+        assign(slots[k++], y);
+    }
+    *callee.mutable_value_info() = value_infos_;
+    for (int i = 0; i < callee.value_info_size(); ++i) {
+      if (value_info_slots_[i].kind != SlotKind::kLiteral)
+        assign(value_info_slots_[i], *callee.mutable_value_info(i)->mutable_name());
+    }
+  }
+
+ private:
+  enum class SlotKind : uint8_t { kLiteral, kInput, kOutput, kFresh };
+
+  // Where a name comes from: kept as in the body, the actual input or output of the
+  // call-site at `index`, or the fresh name created for `fresh_bases_[index]`.
+  struct Slot {
+    SlotKind kind = SlotKind::kLiteral;
+    int index = 0;
+  };
+
+  Slot AddFresh(const std::string& base) {
+    fresh_bases_.push_back(base);
+    return Slot{SlotKind::kFresh, static_cast<int>(fresh_bases_.size() - 1)};
+  }
+
+  google::protobuf::RepeatedPtrField<NodeProto> nodes_;
+  ValueInfoList value_infos_;
+  std::vector<std::string> output_bases_;
+  std::vector<std::string> fresh_bases_;
+  std::vector<std::vector<Slot>> node_slots_;
+  std::vector<Slot> value_info_slots_;
+};
+
+// Counts the nodes of a graph or a function, including the nodes of nested subgraphs.
+class NodeCounter : private internal::Visitor {
+ public:
+  static int64_t Count(const GraphProto& graph) {
+    NodeCounter counter;
+    counter.VisitGraph(graph);
+    return counter.count_;
+  }
+
+  static int64_t Count(const FunctionProto& function) {
+    NodeCounter counter;
+    counter.VisitFunction(function);
+    return counter.count_;
+  }
+
+  static int64_t Count(const ModelProto& model) {
+    int64_t count = Count(model.graph());
+    for (const auto& function : model.functions())
+      count += Count(function);
+    return count;
+  }
+
+ private:
+  bool ProcessNode(const NodeProto& /*node*/) override {
+    ++count_;
+    return true;
+  }
+
+  int64_t count_ = 0;
+};
+
+// Collects the ids of the model-local functions called from the main graph of a
+// model, directly or through other model-local functions.
+class CalledFunctions : private internal::Visitor {
+ public:
+  static std::unordered_set<FunctionImplId> Collect(const ModelProto& model) {
+    std::unordered_map<FunctionImplId, const FunctionProto*> functions;
+    for (const auto& function : model.functions())
+      functions[GetFunctionImplId(function)] = &function;
+    CalledFunctions collector;
+    collector.VisitGraph(model.graph());
+    while (!collector.pending_.empty()) {
+      auto iter = functions.find(collector.pending_.back());
+      collector.pending_.pop_back();
+      if (iter != functions.end())
+        collector.VisitFunction(*iter->second);
+    }
+    return std::move(collector.called_);
+  }
+
+ private:
+  bool ProcessNode(const NodeProto& node) override {
+    auto id = GetCalleeId(node);
+    if (called_.insert(id).second)
+      pending_.push_back(std::move(id));
+    return true;
+  }
+
+  std::unordered_set<FunctionImplId> called_;
+  std::vector<FunctionImplId> pending_;
+};
+
 constexpr int64_t kNoConversion = -1;
 using FunctionMap = std::unordered_map<FunctionImplId, std::pair<const FunctionProto*, int64_t>>;
 
@@ -505,8 +700,14 @@ struct InlinerImpl {
   const FunctionIdSet& to_inline;
   const FunctionMap* function_map;
   const ISchemaRegistry* schema_registry = nullptr;
+  const InliningPolicy* policy = nullptr;
   NameGenerator name_generator;
   int inline_count = 0;
+  // Number of Loop or Scan bodies enclosing the nodes being processed.
+  int loop_depth = 0;
+  // Template of every function inlined so far, nullptr if the function is not supported.
+  std::unordered_map<const FunctionProto*, std::unique_ptr<BodyTemplate>> templates;
+  std::unordered_map<const FunctionProto*, int64_t> node_counts;
 
   // Construct inliner for inlining call-sites inside main graph of a model.
   InlinerImpl(
@@ -522,19 +723,23 @@ struct InlinerImpl {
 
   ~InlinerImpl() = default;
 
-  bool GetCallee(const NodeProto& node, FunctionProto& callee, int64_t& target_version) {
+  // Returns the function to inline for the given node, or nullptr if the node is not
+  // inlined. Context-dependent functions are built into `built`, which is returned.
+  const FunctionProto* GetCallee(const NodeProto& node, FunctionProto& built, int64_t& target_version) {
     const std::string& domain = node.domain();
     const std::string& function_name = node.op_type();
     if (!to_inline.Contains(domain, function_name)) {
-      return false;
+      return nullptr;
     }
 
     if (function_map != nullptr) {
       if (auto iter = this->function_map->find(GetCalleeId(node)); iter != this->function_map->end()) {
         const auto& [func_ptr, version] = iter->second;
-        callee = *func_ptr;
+        if (policy != nullptr && !IsSelectedByPolicy(*func_ptr)) {
+          return nullptr;
+        }
         target_version = version;
-        return true;
+        return func_ptr;
       }
     }
     if (schema_registry != nullptr) {
@@ -543,15 +748,14 @@ struct InlinerImpl {
 
       if (op_schema == nullptr) {
         // If the schema is not found, we cannot inline the function.
-        return false;
+        return nullptr;
       }
 
       if (op_schema->HasFunction()) {
         const FunctionProto* function_ptr = op_schema->GetFunction(domain_version, false);
         if (function_ptr != nullptr) {
-          callee = *function_ptr;
           target_version = kNoConversion;
-          return true;
+          return function_ptr;
         }
       }
 
@@ -564,10 +768,39 @@ struct InlinerImpl {
         }
         ONNX_NAMESPACE::FunctionBodyBuildContextImpl function_body_ctx(node, input_types);
         target_version = kNoConversion;
-        return op_schema->BuildContextDependentFunction(function_body_ctx, callee, domain_version);
+        if (op_schema->BuildContextDependentFunction(function_body_ctx, built, domain_version))
+          return &built;
       }
     }
-    return false;
+    return nullptr;
+  }
+
+  bool IsSelectedByPolicy(const FunctionProto& function) {
+    const auto& always_inline = policy->always_inline;
+    if (std::find(always_inline.begin(), always_inline.end(), std::make_pair(function.domain(), function.name())) !=
+        always_inline.end())
+      return true;
+    if (policy->inline_in_loops && loop_depth > 0)
+      return true;
+    if (policy->max_node_count < 0)
+      return true;
+    auto iter = node_counts.find(&function);
+    if (iter == node_counts.end())
+      iter = node_counts.emplace(&function, NodeCounter::Count(function)).first;
+    return iter->second <= policy->max_node_count;
+  }
+
+  // Returns the template of a model-local or schema-defined function, nullptr if
+  // the function cannot be represented as a template.
+  const BodyTemplate* GetTemplate(const FunctionProto& function) {
+    auto iter = templates.find(&function);
+    if (iter == templates.end()) {
+      std::unique_ptr<BodyTemplate> body_template;
+      if (BodyTemplate::IsSupported(function))
+        body_template = std::make_unique<BodyTemplate>(function);
+      iter = templates.emplace(&function, std::move(body_template)).first;
+    }
+    return iter->second.get();
   }
 
   /** Shared utility function used for inlining into either a GraphProto or a FunctionProto.
@@ -582,14 +815,24 @@ struct InlinerImpl {
     std::function<void(NodeProto & node)> append_node = [&](NodeProto& node) {
       FunctionProto callee;
       int64_t target_version = kNoConversion;
-      if (GetCallee(node, callee, target_version)) {
-        // Bind attribute parameters
-        internal::AttributeBinder::BindAttributes(node, callee);
-
-        // Rename variable names in callee
-        InliningRenamer::Rename(node, callee, "__" + std::to_string(++(this->inline_count)), this->name_generator);
-        if (target_version != kNoConversion) {
-          ConvertVersion(model, node, callee, static_cast<int>(target_version));
+      const FunctionProto* function = GetCallee(node, callee, target_version);
+      if (function != nullptr) {
+        std::string suffix = "__" + std::to_string(++(this->inline_count));
+        const BodyTemplate* body_template =
+            (function != &callee && target_version == kNoConversion) ? GetTemplate(*function) : nullptr;
+        if (body_template != nullptr) {
+          body_template->Instantiate(node, suffix, this->name_generator, callee);
+        } else {
+          if (function != &callee)
+            callee = *function;
+          // Bind attribute parameters
+          internal::AttributeBinder::BindAttributes(node, callee);
+
+          // Rename variable names in callee
+          InliningRenamer::Rename(node, callee, std::move(suffix), this->name_generator);
+          if (target_version != kNoConversion) {
+            ConvertVersion(model, node, callee, static_cast<int>(target_version));
+          }
         }
         std::unordered_set<std::string> actual_parameters;
         for (const auto& x : node.input())
@@ -607,6 +850,8 @@ struct InlinerImpl {
           append_node(callee_node);
       } else {
         // Append node without inlining.
+        const bool is_loop = IsOnnxDomain(node.domain()) && (node.op_type() == "Loop" || node.op_type() == "Scan");
+        loop_depth += is_loop ? 1 : 0;
         for (auto& attr : *node.mutable_attribute()) {
           if (attr.has_g()) {
             ProcessGraph(*attr.mutable_g());
@@ -615,6 +860,7 @@ struct InlinerImpl {
             ProcessGraph(g);
           }
         }
+        loop_depth -= is_loop ? 1 : 0;
 
         *nodes.Add() = std::move(node);
       }
@@ -722,6 +968,47 @@ struct InlinerImpl {
   static void InlineSelectedLocalFunctions(ModelProto& model, const FunctionIdSet& to_inline) {
     InlineSelectedFunctions(model, to_inline, nullptr);
   }
+
+  static InliningStats InlineLocalFunctionsWithPolicy(ModelProto& model, const InliningPolicy& policy) {
+    checker::check_function_call_cycles(model);
+    InliningStats stats;
+    stats.nodes_before = NodeCounter::Count(model);
+    stats.functions_before = model.functions_size();
+
+    FunctionIdVector empty_set;
+    VectorSet all_functions(std::move(empty_set), true);
+    OpsetMap model_imports(model);
+    FunctionMap map;
+    for (const auto& function : model.functions()) {
+      if (model_imports.Mismatches(function).empty())
+        map[GetFunctionImplId(function)] = std::pair<const FunctionProto*, int64_t>(&function, kNoConversion);
+    }
+
+    InlinerImpl inliner(model, all_functions, &map, nullptr);
+    inliner.policy = &policy;
+    inliner.ProcessGraph(*model.mutable_graph());
+
+    // Inline the call-sites in the functions that are still called. Their templates,
+    // if any, were built from the original bodies, which remain equivalent.
+    auto called = CalledFunctions::Collect(model);
+    for (auto& function : *model.mutable_functions()) {
+      if (called.count(GetFunctionImplId(function)) > 0)
+        inliner.ProcessFunction(function);
+    }
+
+    called = CalledFunctions::Collect(model);
+    FunctionMap unused;
+    for (const auto& [id, entry] : map) {
+      if (called.count(id) == 0)
+        unused.insert({id, entry});
+    }
+    RemoveInlinedFunctions(model, unused);
+
+    stats.inlined_calls = inliner.inline_count;
+    stats.nodes_after = NodeCounter::Count(model);
+    stats.functions_after = model.functions_size();
+    return stats;
+  }
 };
 
 } // namespace
@@ -746,6 +1033,10 @@ void InlineSelectedFunctions(ModelProto& model, const FunctionIdSet& to_inline)
   InlineSelectedLocalFunctions(model, to_inline);
 }
 
+InliningStats InlineLocalFunctionsWithPolicy(ModelProto& model, const InliningPolicy& policy) {
+  return InlinerImpl::InlineLocalFunctionsWithPolicy(model, policy);
+}
+
 void InlineSelectedFunctions(
     ModelProto& model,
     const FunctionIdSet& to_inline,
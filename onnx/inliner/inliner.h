@@ -5,6 +5,7 @@
 #ifndef ONNX_INLINER_INLINER_H_
 #define ONNX_INLINER_INLINER_H_
 
+#include <cstdint>
 #include <memory>
 #include <string>
 #include <utility>
@@ -79,6 +80,43 @@ void InlineSelectedFunctions(ModelProto& model, const FunctionIdSet& to_inline);
 // functions that use opset versions that are compatible with the model.
 void InlineLocalFunctions(ModelProto& model, bool convert_version = false);
 
+// Decides which call-sites of model-local functions are inlined by
+// InlineLocalFunctionsWithPolicy. A call-site is inlined if any of the
+// conditions below holds.
+struct InliningPolicy {
+  // Call-sites of functions with at most this many nodes (counting the nodes of
+  // nested subgraphs) are inlined. A negative value means no limit.
+  int64_t max_node_count = -1;
+  // Call-sites nested in the body of a Loop or Scan node are inlined, whatever
+  // the size of the function.
+  bool inline_in_loops = false;
+  // Functions whose call-sites are always inlined, whatever their size.
+  FunctionIdVector always_inline;
+};
+
+// Size of a model before and after InlineLocalFunctionsWithPolicy. Node counts
+// include the main graph, the model-local functions and nested subgraphs.
+struct InliningStats {
+  int64_t inlined_calls = 0;
+  int64_t nodes_before = 0;
+  int64_t nodes_after = 0;
+  int64_t functions_before = 0;
+  int64_t functions_after = 0;
+};
+
+/**
+ * @brief Inlines the call-sites of model-local functions selected by the given policy.
+ *
+ * Call-sites are inlined in the main graph and in the model-local functions that are
+ * still called afterwards. Functions that are no longer called are removed from the model.
+ * Functions requiring a different opset version than the model are not inlined.
+ *
+ * @param model The model in which functions will be inlined.
+ * @param policy The policy selecting the call-sites to inline.
+ * @return The number of inlined call-sites and the size of the model before and after.
+ */
+InliningStats InlineLocalFunctionsWithPolicy(ModelProto& model, const InliningPolicy& policy);
+
 /**
  * @brief A utility class for renaming variables during graph inlining operations.
  *
@@ -7,9 +7,10 @@ bigger than 2 Gb.
 
 from __future__ import annotations
 
+import collections
 import os
 import sys
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import numpy as np
 
@@ -78,28 +79,129 @@ def make_large_tensor_proto(
     return tensor
 
 
+class _ExternalTensor(NamedTuple):
+    """Where to find the data of a large initializer not loaded yet."""
+
+    base_dir: str
+    info: ext_data.ExternalDataInfo
+    tensor_name: str
+    dtype: np.dtype
+    shape: tuple[int, ...]
+
+
 class ModelContainer:
     """Implements an API to store large tensors outside the main ModelProto,
     it avoids copying large initializers when defining the model and these initializers
     are never serialized through protobuf.
     No tensor is stored on disk until the user explicitly saves the model.
+
+    When a model is loaded with ``lazy=True``, the large initializers are only
+    read from disk the first time they are accessed. `max_resident_bytes`
+    then caps the size of the initializers loaded that way: the least recently
+    used ones are released, and reloaded on their next access. Initializers
+    given by the user (:meth:`set_large_initializers`, :meth:`__setitem__`...)
+    are never released.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, max_resident_bytes: int | None = None) -> None:
         self.model_proto_: onnx.ModelProto | None = None
         self.large_initializers: dict[str, np.ndarray] = {}
+        self.max_resident_bytes = max_resident_bytes
+        self.use_mmap = False
+        # Initializers which can be (re)loaded from disk on demand.
+        self._external_tensors: dict[str, _ExternalTensor] = {}
+        # Initializers loaded from disk on demand, in least recently used order,
+        # with their size in bytes. They can be released.
+        self._resident: collections.OrderedDict[str, int] = collections.OrderedDict()
 
     def check_model(self):
         if self.model_proto is not None:
             onnx.checker.check_model(self.model_proto)
 
     def __getitem__(self, name: str) -> np.ndarray:
-        """Returns an external tensor given its name."""
-        if name not in self.large_initializers:
+        """Returns an external tensor given its name, loading it if needed."""
+        if name in self.large_initializers:
+            if name in self._resident:
+                self._resident.move_to_end(name)
+            return self.large_initializers[name]
+        if name not in self._external_tensors:
             raise ValueError(
-                f"Unable to find large tensor {name!r} among {sorted(self.large_initializers)}."
+                f"Unable to find large tensor {name!r} among {sorted(self._all_keys())}."
+            )
+        value = self._read_external_tensor(self._external_tensors[name])
+        self.large_initializers[name] = value
+        self._resident[name] = value.nbytes
+        self._release_resident(keep=name)
+        return value
+
+    def __setitem__(self, name: str, value: np.ndarray) -> None:
+        """Replaces or adds an external tensor, it is never released."""
+        if not self.is_in_memory_external_initializer(name):
+            raise ValueError(
+                f"The location {name!r} must start with '#' to be ignored by check model."
+            )
+        self.large_initializers[name] = value
+        self._resident.pop(name, None)
+        self._external_tensors.pop(name, None)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.large_initializers or name in self._external_tensors
+
+    def _all_keys(self) -> set[str]:
+        return set(self.large_initializers) | set(self._external_tensors)
+
+    @property
+    def resident_bytes(self) -> int:
+        """Size of the initializers loaded on demand and still in memory."""
+        return sum(self._resident.values())
+
+    def _release_resident(self, keep: str | None = None) -> None:
+        """Releases the least recently used initializers loaded on demand until
+        their total size fits into `max_resident_bytes`.
+        """
+        if self.max_resident_bytes is None:
+            return
+        total = self.resident_bytes
+        for name in list(self._resident):
+            if total <= self.max_resident_bytes:
+                break
+            if name == keep:
+                continue
+            total -= self._resident.pop(name)
+            del self.large_initializers[name]
+
+    def _read_external_tensor(self, ext: _ExternalTensor) -> np.ndarray:
+        info = ext.info
+        fd = ext_data._open_external_data_fd(
+            ext.base_dir, info.location, ext.tensor_name, True
+        )
+        with os.fdopen(fd, "rb") as data_file:
+            if self.use_mmap and sys.byteorder == "little":
+                offset = info.offset or 0
+                size = int(np.prod(ext.shape)) * ext.dtype.itemsize
+                file_size = os.fstat(data_file.fileno()).st_size
+                if offset + size > file_size or (
+                    info.length is not None and info.length < size
+                ):
+                    raise ValueError(
+                        f"External data for tensor {ext.tensor_name!r} "
+                        f"({size} bytes from offset {offset}) exceeds the "
+                        f"file size ({file_size}) or the declared length."
+                    )
+                if size == 0:
+                    return np.empty(ext.shape, dtype=ext.dtype)
+                # The mapping keeps its own reference to the file.
+                return np.memmap(
+                    data_file, dtype=ext.dtype, mode="r", offset=offset, shape=ext.shape
+                )
+            raw_data = ext_data._validate_external_data_file_bounds(
+                data_file, info, ext.tensor_name
             )
-        return self.large_initializers[name]
+        if sys.byteorder == "big":
+            return (
+                np.frombuffer(raw_data, dtype=ext.dtype).byteswap().reshape(ext.shape)
+            )
+        return np.frombuffer(raw_data, dtype=ext.dtype).reshape(ext.shape)
 
     @property
     def model_proto(self) -> onnx.ModelProto:
@@ -131,6 +233,41 @@ class ModelContainer:
                     f"The location {k!r} must start with '#' to be ignored by check model."
                 )
         self.large_initializers = large_initializers
+        self._external_tensors = {}
+        self._resident.clear()
+
+    def add_large_initializer(
+        self, name: str, array: np.ndarray, location: str | None = None
+    ) -> onnx.TensorProto:
+        """Registers an array as a large initializer and returns the TensorProto
+        referencing it. The array is kept as is, it is neither copied nor
+        serialized before the model is saved.
+
+        Arguments:
+            name: initializer name in the graph
+            array: the initializer value
+            location: in-memory location, must start with '#',
+                defaults to ``'#' + name``
+
+        Returns:
+            the TensorProto to add to the graph initializers
+        """
+        if location is None:
+            location = f"#{name}"
+        if not self.is_in_memory_external_initializer(location):
+            raise ValueError(
+                f"The location {location!r} must start with '#' to be ignored by check model."
+            )
+        if location in self:
+            raise ValueError(f"Location {location!r} is already used.")
+        tensor = make_large_tensor_proto(
+            location,
+            name,
+            onnx.helper.np_dtype_to_tensor_dtype(array.dtype),
+            array.shape,
+        )
+        self[location] = array
+        return tensor
 
     def check_large_initializers(self) -> None:
         for tensor in ext_data._get_all_tensors(self.model_proto):
@@ -144,11 +281,11 @@ class ModelContainer:
                 raise RuntimeError(
                     f"No location found for tensor name {tensor.name!r}."
                 )
-            if prop.value not in self.large_initializers:
+            if prop.value not in self:
                 raise RuntimeError(
                     f"Unable to find large tensor named {tensor.name!r} "
                     f"with location {prop.value!r} in "
-                    f"{sorted(self.large_initializers)}."
+                    f"{sorted(self._all_keys())}."
                 )
 
     def _save_external(
@@ -208,24 +345,25 @@ class ModelContainer:
                 raise RuntimeError(
                     f"No location found for tensor name {tensor.name!r}."
                 )
-            if prop.value not in self.large_initializers:
+            if prop.value not in self:
                 raise RuntimeError(
                     f"Unable to find large tensor named {tensor.name!r} "
                     f"with location {prop.value!r} in "
-                    f"{sorted(self.large_initializers)}."
+                    f"{sorted(self._all_keys())}."
                 )
-            np_tensor = self.large_initializers[prop.value]
+            np_tensor = self[prop.value]
 
-            tensor_bytes = onnx.numpy_helper.tobytes_little_endian(np_tensor)
+            # A view over the array memory, written without an intermediate bytes copy.
+            tensor_bytes = onnx.numpy_helper._little_endian_buffer(np_tensor)
 
             if all_tensors_to_one_file:
                 _set_external_data(
                     tensor,
                     location=file_weight,
                     offset=offset,
-                    length=len(tensor_bytes),
+                    length=tensor_bytes.nbytes,
                 )
-                offset += len(tensor_bytes)
+                offset += tensor_bytes.nbytes
                 with open(full_file_weight, "ab") as f:
                     f.write(tensor_bytes)
             else:
@@ -263,7 +401,13 @@ class ModelContainer:
             file_path, all_tensors_to_one_file=all_tensors_to_one_file
         )
 
-    def load(self, file_path: str, load_large_initializers: bool = True):
+    def load(
+        self,
+        file_path: str,
+        load_large_initializers: bool = True,
+        lazy: bool = False,
+        use_mmap: bool = False,
+    ):
         """Load the large model.
 
         Arguments:
@@ -272,20 +416,33 @@ class ModelContainer:
                 if not done, the model is incomplete but it can be used to
                 look into the model without executing it and method
                 :meth:`_load_large_initializers` can be used to load them later
+            lazy: the large initializers are only read when they are
+                accessed through :meth:`__getitem__`, the model is complete
+                but no weight is loaded in memory by this method,
+                `load_large_initializers` is ignored in that case
+            use_mmap: initializers loaded on demand are memory-mapped
+                instead of read (on little-endian machines)
         """
         self.model_proto_ = onnx.load_model(file_path, load_external_data=False)
-        if load_large_initializers:
+        self.use_mmap = use_mmap
+        if lazy:
+            self._load_large_initializers(file_path, lazy=True)
+        elif load_large_initializers:
             self._load_large_initializers(file_path)
 
-    def _load_large_initializers(self, file_path):
+    def _load_large_initializers(self, file_path, lazy: bool = False):
         """Loads large initializers.
 
         Arguments:
             file_path: model file, the weight are expected to be in the same folder as this file
+            lazy: only registers where to find every initializer,
+                the data is read on first access
         """
         if self.model_proto_ is None:
             raise RuntimeError("A model must be loaded before loading the weights.")
         self.large_initializers = {}
+        self._external_tensors = {}
+        self._resident.clear()
         base_dir = os.path.dirname(file_path)
         for i, tensor in enumerate(ext_data._get_all_tensors(self.model_proto_)):
             if not ext_data.uses_external_data(tensor):
@@ -295,25 +452,17 @@ class ModelContainer:
             key = f"#t{i}"
             _set_external_data(tensor, location=key)
 
-            fd = ext_data._open_external_data_fd(
-                base_dir, info.location, tensor.name, True
+            ext = _ExternalTensor(
+                base_dir,
+                info,
+                tensor.name,
+                onnx.helper.tensor_dtype_to_np_dtype(tensor.data_type),
+                tuple(tensor.dims),
             )
-            with os.fdopen(fd, "rb") as data_file:
-                raw_data = ext_data._validate_external_data_file_bounds(
-                    data_file, info, tensor.name
-                )
-
-                dtype = onnx.helper.tensor_dtype_to_np_dtype(tensor.data_type)
-                shape = tuple(tensor.dims)
-
-                if sys.byteorder == "big":
-                    np_tensor = (
-                        np.frombuffer(raw_data, dtype=dtype).byteswap().reshape(shape)
-                    )
-                else:
-                    np_tensor = np.frombuffer(raw_data, dtype=dtype).reshape(shape)
-
-                self.large_initializers[key] = np_tensor
+            if lazy:
+                self._external_tensors[key] = ext
+            else:
+                self.large_initializers[key] = self._read_external_tensor(ext)
 
 
 def make_large_model(
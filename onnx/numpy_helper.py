@@ -3,7 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
-import math
+import os
 import sys
 from typing import TYPE_CHECKING, Any
 
@@ -12,7 +12,7 @@ import numpy as np
 import numpy.typing as npt
 
 import onnx.external_data_helper
-from onnx import helper
+from onnx import _packing, helper
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -105,37 +105,12 @@ def _unpack_4bit(
     Returns:
         A numpy array of int8/uint8 reshaped to dims.
     """
-    result = np.empty([data.size * 2], dtype=data.dtype)
-    array_low = data & np.uint8(0x0F)
-    array_high = data & np.uint8(0xF0)
-    array_high >>= np.uint8(4)
-    result[0::2] = array_low
-    result[1::2] = array_high
-    expected_elements = math.prod(dims)
-    if result.size == expected_elements + 1:
-        # handle single-element padding due to odd number of elements
-        result = result[:-1]
-    if expected_elements > result.size:
-        raise ValueError(
-            f"Packed 4-bit data ({data.size} bytes, {result.size} elements unpacked) "
-            f"is too small for the declared shape {list(dims)} "
-            f"({expected_elements} elements required)."
-        )
-    result.resize(dims, refcheck=False)
-    return result
+    return _packing.unpack_4bit(data, dims)
 
 
 def _pack_4bitx2(array: np.ndarray) -> npt.NDArray[np.uint8]:
     """Convert a numpy array to flatten, packed int4/uint4. Elements must be in the correct range."""
-    # Create a 1D copy
-    array_flat = array.ravel().view(np.uint8).copy()
-    size = array.size
-    odd_sized = size % 2 == 1
-    if odd_sized:
-        array_flat.resize([size + 1], refcheck=False)
-    array_flat &= 0x0F
-    array_flat[1::2] <<= 4
-    return array_flat[0::2] | array_flat[1::2]
+    return _packing.pack_4bitx2(array)
 
 
 def _unpack_2bit(
@@ -150,41 +125,37 @@ def _unpack_2bit(
     Returns:
         A numpy array of int8/uint8 reshaped to dims.
     """
-    result = np.empty([data.size * 4], dtype=data.dtype)
-    result[0::4] = data & 0x03
-    result[1::4] = (data >> 2) & 0x03
-    result[2::4] = (data >> 4) & 0x03
-    result[3::4] = (data >> 6) & 0x03
-    expected_elements = math.prod(dims)
-    if result.size > expected_elements:
-        # handle padding due to non multiple of 4 elements
-        result = result[:expected_elements]
-    if expected_elements > result.size:
-        raise ValueError(
-            f"Packed 2-bit data ({data.size} bytes, {result.size} elements unpacked) "
-            f"is too small for the declared shape {list(dims)} "
-            f"({expected_elements} elements required)."
-        )
-    result.resize(dims, refcheck=False)
-    return result
+    return _packing.unpack_2bit(data, dims)
 
 
 def _pack_2bitx4(array: np.ndarray) -> npt.NDArray[np.uint8]:
     """Convert a numpy array to flatten, packed int2/uint2. Elements must be in the correct range."""
-    # Create a 1D copy
-    array_flat = array.ravel().view(np.uint8).copy()
-    size = array.size
-    pad_len = size % 4
-    if pad_len:
-        array_flat.resize([size + (4 - pad_len)], refcheck=False)
-    array_flat &= 0x03
-    array_flat[1::4] <<= 2
-    array_flat[2::4] <<= 4
-    array_flat[3::4] <<= 6
-    return array_flat[0::4] | array_flat[1::4] | array_flat[2::4] | array_flat[3::4]
-
-
-def to_array(tensor: onnx.TensorProto, base_dir: str = "") -> np.ndarray:  # noqa: PLR0911
+    return _packing.pack_2bitx4(array)
+
+
+# Array kinds converted to a STRING tensor: object, str_, bytes_ and StringDType.
+_STRING_KINDS = frozenset("OUST")
+
+
+def _encode_strings(array: np.ndarray) -> list[Any]:
+    """Converts a string array into a flat list of UTF-8 encoded bytes.
+
+    ``tolist()`` converts the whole array to Python objects in C, only the
+    encoding remains per element. Elements of object arrays which are neither
+    str nor bytes are returned unchanged.
+    """
+    values = array.ravel().tolist()
+    kind = array.dtype.kind
+    if kind == "S":
+        return values
+    if kind in ("U", "T"):
+        return [s.encode("utf-8") for s in values]
+    return [v.encode("utf-8") if isinstance(v, str) else v for v in values]
+
+
+def to_array(  # noqa: PLR0911
+    tensor: onnx.TensorProto, base_dir: str = "", *, decode_strings: bool = True
+) -> np.ndarray:
     """Converts a tensor def object to a numpy array.
 
     This function uses ml_dtypes if the dtype is not a native numpy dtype.
@@ -192,6 +163,10 @@ def to_array(tensor: onnx.TensorProto, base_dir: str = "") -> np.ndarray:  # noq
     Args:
         tensor: a TensorProto object.
         base_dir: if external tensor exists, base_dir can help to find the path to it
+        decode_strings: for string tensors, whether to decode the UTF-8 bytes
+            into str objects. If False, the array holds the raw bytes objects
+            and decoding is left to the caller, which avoids the cost when
+            only a few elements are used.
 
     Returns:
         arr: the converted array.
@@ -211,8 +186,13 @@ def to_array(tensor: onnx.TensorProto, base_dir: str = "") -> np.ndarray:  # noq
 
     if tensor.data_type == onnx.TensorProto.STRING:
         utf8_strings = getattr(tensor, storage_field)
-        ss = [s.decode("utf-8") for s in utf8_strings]
-        return np.asarray(ss).astype(np_dtype).reshape(dims)
+        # Build the object array directly, going through a fixed-width
+        # unicode array first would pad every element to the longest one.
+        if decode_strings:
+            values = [s.decode("utf-8") for s in utf8_strings]
+        else:
+            values = list(utf8_strings)
+        return np.array(values, dtype=np_dtype).reshape(dims)
 
     # Load raw data from external tensor if it exists
     if onnx.external_data_helper.uses_external_data(tensor):
@@ -309,13 +289,47 @@ def tobytes_little_endian(array: np.ndarray) -> bytes:
 
     .. versionadded:: 1.20
     """
+    return _to_little_endian(array).tobytes()
+
+
+def _to_little_endian(array: np.ndarray) -> np.ndarray:
+    """Returns the array with a little-endian byte order, without copying it
+    when it already has one.
+    """
     if array.dtype.byteorder == ">" or (
         sys.byteorder == "big" and array.dtype.byteorder == "="
     ):
         # Ensure that the bytes will be in little-endian byte-order.
         array = array.astype(array.dtype.newbyteorder("<"))
+    return array
+
 
-    return array.tobytes()
+def _little_endian_buffer(array: np.ndarray) -> npt.NDArray[np.uint8]:
+    """Returns a flat uint8 view over the little-endian bytes of the array.
+
+    Unlike :func:`tobytes_little_endian`, no copy is made when the array is
+    already C-contiguous and little-endian. The result can be written to a
+    file through the buffer protocol.
+    """
+    return np.ascontiguousarray(_to_little_endian(array)).reshape(-1).view(np.uint8)
+
+
+def _pack_sub_byte(array: np.ndarray, dtype: int) -> np.ndarray:
+    """Packs arrays of 4-bit and 2-bit types, returns other arrays unchanged."""
+    if dtype in {
+        onnx.TensorProto.INT4,
+        onnx.TensorProto.UINT4,
+        onnx.TensorProto.FLOAT4E2M1,
+    }:
+        # Pack the array into int4
+        return _pack_4bitx2(array)
+    if dtype in {
+        onnx.TensorProto.UINT2,
+        onnx.TensorProto.INT2,
+    }:
+        # Pack the array into int2
+        return _pack_2bitx4(array)
+    return array
 
 
 def from_array(array: np.ndarray, /, name: str | None = None) -> onnx.TensorProto:
@@ -332,7 +346,7 @@ def from_array(array: np.ndarray, /, name: str | None = None) -> onnx.TensorProt
     tensor.dims.extend(array.shape)
     if name:
         tensor.name = name
-    if array.dtype == object or np.issubdtype(array.dtype, np.str_):
+    if array.dtype.kind in _STRING_KINDS:
         # Special care for strings.
         tensor.data_type = onnx.TensorProto.STRING
         # TODO: Introduce full string support.
@@ -343,39 +357,73 @@ def from_array(array: np.ndarray, /, name: str | None = None) -> onnx.TensorProt
         # is to put them into a flat array then specify type astype(object)
         # (otherwise all strings may have different types depending on their length)
         # and then specify shape .reshape([x, y, z])
-        flat_array = array.flatten()
-        for e in flat_array:
-            if isinstance(e, str):
-                tensor.string_data.append(e.encode("utf-8"))
-            elif isinstance(e, bytes):
-                tensor.string_data.append(e)
-            else:
-                raise NotImplementedError(
-                    f"Unrecognized object in the object array, expect a string, or array of bytes: {type(e)}"
-                )
+        encoded = _encode_strings(array)
+        try:
+            tensor.string_data.extend(encoded)
+        except TypeError:
+            e = next(e for e in encoded if not isinstance(e, bytes))
+            raise NotImplementedError(
+                f"Unrecognized object in the object array, expect a string, or array of bytes: {type(e)}"
+            ) from None
         return tensor
 
     dtype = helper.np_dtype_to_tensor_dtype(array.dtype)
-    if dtype in {
-        onnx.TensorProto.INT4,
-        onnx.TensorProto.UINT4,
-        onnx.TensorProto.FLOAT4E2M1,
-    }:
-        # Pack the array into int4
-        array = _pack_4bitx2(array)
-
-    if dtype in {
-        onnx.TensorProto.UINT2,
-        onnx.TensorProto.INT2,
-    }:
-        # Pack the array into int2
-        array = _pack_2bitx4(array)
+    array = _pack_sub_byte(array, dtype)
 
+    # protobuf only accepts bytes for raw_data, one copy cannot be avoided here.
+    # Use from_array_to_external_data to build large tensors without it.
     tensor.raw_data = tobytes_little_endian(array)
     tensor.data_type = dtype  # type: ignore[assignment]
     return tensor
 
 
+def from_array_to_external_data(
+    array: np.ndarray,
+    /,
+    name: str | None = None,
+    *,
+    base_path: str,
+    location: str,
+) -> onnx.TensorProto:
+    """Converts an array into a TensorProto storing its data in an external file.
+
+    The data is appended to file `location` (created if it does not exist)
+    directly from the array memory, it is never copied into a bytes object
+    nor into the returned TensorProto. The model this tensor is added to must
+    be saved in `base_path` for the location to remain valid.
+
+    Args:
+        array: a numpy array, string arrays are not supported.
+        name: (optional) the name of the tensor.
+        base_path: folder containing the external data file.
+        location: path of the external data file relative to `base_path`.
+
+    Returns:
+        TensorProto: the converted tensor def, with no raw_data.
+    """
+    tensor = onnx.TensorProto()
+    tensor.dims.extend(array.shape)
+    if name:
+        tensor.name = name
+    if array.dtype.kind in _STRING_KINDS:
+        raise TypeError("String tensors cannot be stored as external data.")
+    dtype = helper.np_dtype_to_tensor_dtype(array.dtype)
+    tensor.data_type = dtype  # type: ignore[assignment]
+
+    data = _little_endian_buffer(_pack_sub_byte(array, dtype))
+    fd = onnx.external_data_helper._open_external_data_fd(
+        base_path, location, tensor.name, False
+    )
+    with os.fdopen(fd, "r+b") as data_file:
+        offset = data_file.seek(0, 2)
+        data_file.write(data)
+        length = data_file.tell() - offset
+    onnx.external_data_helper._set_external_data_entries(
+        tensor, location, offset, length
+    )
+    return tensor
+
+
 def to_list(sequence: onnx.SequenceProto) -> list[Any]:
     """Converts a sequence def to a Python list.
 
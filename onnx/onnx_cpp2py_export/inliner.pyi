@@ -24,3 +24,14 @@ def inline_selected_functions2(
     case it inlines all functions except those specified in function_ids.
     Both input and output are serialized ModelProtos.
     """
+
+def inline_local_functions_with_policy(
+    model: bytes,
+    max_node_count: int,
+    inline_in_loops: bool,
+    always_inline: list[tuple[str, str]],
+) -> tuple[bytes, dict[str, int]]:
+    """Inlines the calls to model-local functions selected by the policy and returns
+    the serialized model with the number of inlined calls and the number of nodes
+    and functions before and after inlining.
+    """
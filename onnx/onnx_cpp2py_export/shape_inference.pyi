@@ -31,6 +31,16 @@ class InferenceContext:
 def infer_shapes(
     b: bytes, check_type: bool, strict_mode: bool, data_prop: bool
 ) -> bytes: ...
+def infer_shapes_delta(
+    b: bytes, check_type: bool, strict_mode: bool, data_prop: bool
+) -> bytes: ...
+def infer_shapes_incremental(
+    b: bytes,
+    changed_values: set[str],
+    check_type: bool,
+    strict_mode: bool,
+    data_prop: bool,
+) -> bytes: ...
 def infer_shapes_path(
     model_path: str,
     output_path: str,
@@ -43,3 +53,5 @@ def infer_function_output_types(
     input_types: list[bytes],
     attributes: list[bytes],
 ) -> list[bytes]: ...
+def get_function_inference_cache_stats() -> tuple[int, int]: ...
+def reset_function_inference_cache_stats() -> None: ...
@@ -206,6 +206,7 @@ class OpRun(abc.ABC):
                 verbose=max(0, self.run_params.get("verbose", 0) - 2),
                 new_ops=None if new_ops is None else list(new_ops.values()),
                 functions=functions,
+                mode=self.run_params.get("mode", None),
             )
 
         conversion_function = _attribute_conversion_function(att.type)  # type: ignore[arg-type]
@@ -0,0 +1,110 @@
+# Copyright (c) ONNX Project Contributors
+
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import numpy as np
+
+
+def _check_direction(direction: str, num_directions: int) -> None:
+    if direction not in {"forward", "reverse", "bidirectional"}:
+        raise RuntimeError(f"Unknown direction {direction!r}.")
+    expected_num_directions = 2 if direction == "bidirectional" else 1
+    if num_directions != expected_num_directions:
+        raise RuntimeError(
+            f"direction={direction!r} requires num_directions={expected_num_directions} "
+            f"but got {num_directions}."
+        )
+
+
+def _stack_directions(
+    X: np.ndarray, direction: str, sequence_lens: np.ndarray | None
+) -> tuple[np.ndarray, list[np.ndarray | None], np.ndarray | None]:
+    """Returns the sequences every direction processes in their processing
+    order stacked along a new first axis, the time indices of every step
+    for every direction (None when a direction follows the natural order)
+    and a boolean mask of shape `(seq_length, batch_size)` telling which
+    steps are within `sequence_lens` (None if all of them are).
+
+    A reverse direction processes every sequence from its last valid
+    step, the padded steps remain at the end.
+    """
+    seq_length, batch_size = X.shape[:2]
+    mask = None
+    reverse_index = None
+    if sequence_lens is not None:
+        lens = np.asarray(sequence_lens, dtype=np.int64).reshape((1, -1))
+        if (lens < seq_length).any():
+            steps = np.arange(seq_length).reshape((-1, 1))
+            mask = steps < lens
+            # The same indices restore the natural order.
+            reverse_index = np.where(mask, lens - 1 - steps, steps)
+
+    directions = ["forward", "reverse"] if direction == "bidirectional" else [direction]
+    stacked = []
+    orders: list[np.ndarray | None] = []
+    for d in directions:
+        if d == "forward":
+            stacked.append(X)
+            orders.append(None)
+        elif reverse_index is None:
+            stacked.append(X[::-1])
+            orders.append(np.arange(seq_length)[::-1])
+        else:
+            stacked.append(X[reverse_index, np.arange(batch_size)])
+            orders.append(reverse_index)
+    return np.stack(stacked), orders, mask
+
+
+def _unstack_directions(Y: np.ndarray, orders: list[np.ndarray | None]) -> np.ndarray:
+    """Puts the outputs of shape `(num_directions, seq_length, batch_size,
+    hidden_size)` computed by every direction back into the natural order
+    and returns them with shape `(seq_length, num_directions, batch_size,
+    hidden_size)`.
+    """
+    batch = np.arange(Y.shape[2])
+    restored = []
+    for y, order in zip(Y, orders, strict=True):
+        if order is None:
+            restored.append(y)
+        elif order.ndim == 1:
+            restored.append(y[order])
+        else:
+            restored.append(y[order, batch])
+    return np.stack(restored, axis=1)
+
+
+def _input_projection(X: np.ndarray, W: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Computes `X W^T + B` for all directions and all steps with a single
+    batched matrix multiplication.
+
+    Args:
+        X: stacked inputs `(num_directions, seq_length, batch_size, input_size)`
+        W: weights `(num_directions, gates * hidden_size, input_size)`
+        B: bias `(num_directions, gates * hidden_size)`
+
+    Returns:
+        `(num_directions, seq_length, batch_size, gates * hidden_size)`
+    """
+    num_directions, seq_length, batch_size, input_size = X.shape
+    proj = X.reshape((num_directions, -1, input_size)) @ np.transpose(W, (0, 2, 1))
+    proj = proj + B[:, np.newaxis, :]
+    return proj.reshape((num_directions, seq_length, batch_size, -1))
+
+
+def _masked_step(
+    mask: np.ndarray | None, t: int, new: np.ndarray, old: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the state carried to the next step and the output of step `t`.
+
+    The recurrent operators run all the directions at once on the sequences
+    stacked by :func:`_stack_directions`, with shape `(num_directions,
+    seq_length, batch_size, input_size)`, after computing the input
+    projection of all the steps with :func:`_input_projection`. The states
+    `new` and `old` have shape `(num_directions, batch_size, hidden_size)`.
+    A step outside `mask` keeps the previous state and outputs zeros.
+    """
+    if mask is None:
+        return new, new
+    valid = mask[t][:, np.newaxis]
+    return np.where(valid, new, old), np.where(valid, new, 0)
@@ -6,7 +6,6 @@ from __future__ import annotations
 import numpy as np
 
 from onnx.reference.op_run import OpRun
-from onnx.reference.ops.op_conv import _conv_implementation
 
 
 class CausalConvWithState(OpRun):
@@ -45,18 +44,18 @@ class CausalConvWithState(OpRun):
             pad = past_state
         padded = np.concatenate([pad, input], axis=2)
 
-        # Step 2: depthwise Conv1d (group = channels, valid padding).
-        conv_out = _conv_implementation(
-            padded,
-            weight,
-            bias,
-            "NOTSET",
-            [1],
-            channels,
-            [k],
-            [0, 0],
-            [1],
-        ).astype(input.dtype)
+        # Step 2: depthwise Conv1d (group = channels, valid padding), one
+        # multiply-add per kernel tap over all batches, channels and positions.
+        length = padded.shape[2] - k + 1
+        acc_dtype = np.result_type(input.dtype, np.float32)
+        acc = np.zeros((batch_size, channels, length), dtype=acc_dtype)
+        for i in range(k):
+            acc += weight[:, 0, i : i + 1].astype(acc_dtype) * padded[
+                :, :, i : i + length
+            ].astype(acc_dtype)
+        conv_out = acc.astype(input.dtype)
+        if bias is not None:
+            conv_out += bias.reshape((1, -1, 1)).astype(input.dtype)
 
         # Step 3: optional fused SiLU/Swish activation.
         if activation in ("silu", "swish"):
@@ -3,6 +3,8 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import functools
+
 import numpy as np
 
 from onnx.reference.op_run import OpRun
@@ -184,6 +186,99 @@ def col2im_naive_implementation(
     return data_im
 
 
+@functools.lru_cache(maxsize=128)
+def _col2im_indices(
+    image_shape: tuple[int, ...],
+    kernel_shape: tuple[int, ...],
+    dilations: tuple[int, ...],
+    pads: tuple[int, ...],
+    strides: tuple[int, ...],
+) -> tuple[tuple[np.ndarray, np.ndarray], ...]:
+    """Returns, for every kernel position, the flat indices of the columns
+    falling inside the image and the flat indices of the pixels they are
+    added to. Two columns of the same kernel position never share a pixel.
+    """
+    n_dims = len(image_shape)
+    dim_col = [
+        (
+            image_shape[i]
+            + pads[i]
+            + pads[i + n_dims]
+            - (dilations[i] * (kernel_shape[i] - 1) + 1)
+        )
+        // strides[i]
+        + 1
+        for i in range(n_dims)
+    ]
+    col_size = int(np.prod(dim_col))
+    # Position along every dimension of every column of the first kernel
+    # position, the other kernel positions are shifted by the dilations.
+    grids = np.meshgrid(*[np.arange(d) for d in dim_col], indexing="ij")
+    base = [
+        (g.ravel() * strides[i] - pads[i]).astype(np.int64) for i, g in enumerate(grids)
+    ]
+    result = []
+    for c_col in range(int(np.prod(kernel_shape))):
+        offset = np.unravel_index(c_col, kernel_shape)
+        ind_im = [base[i] + offset[i] * dilations[i] for i in range(n_dims)]
+        inside = np.ones(col_size, dtype=bool)
+        for i in range(n_dims):
+            inside &= (ind_im[i] >= 0) & (ind_im[i] < image_shape[i])
+        col_idx = np.flatnonzero(inside)
+        im_idx = np.ravel_multi_index(tuple(ind[inside] for ind in ind_im), image_shape)
+        col_idx.flags.writeable = False
+        im_idx.flags.writeable = False
+        result.append((col_idx, im_idx))
+    return tuple(result)
+
+
+def col2im(data, image_shape, kernel_shape, dilations, pads, strides):
+    """Vectorized `col2im` of a batch of column matrices.
+
+    Args:
+        data: array of shape ``(..., prod(kernel_shape), number of blocks)``.
+        image_shape: spatial shape of the image.
+        kernel_shape: block shape.
+        dilations: dilations.
+        pads: pads, begins then ends.
+        strides: strides.
+
+    Returns:
+        An array of shape ``(..., *image_shape)``, the same values as
+        :func:`col2im_naive_implementation` applied to every matrix of the
+        batch. The indices depend only on the shapes and attributes and are
+        cached.
+    """
+    image_shape = tuple(int(i) for i in image_shape)
+    kernel_shape = tuple(int(i) for i in kernel_shape)
+    n_dims = len(image_shape)
+    new_pads = np.array([(pads[i], pads[i + n_dims]) for i in range(n_dims)])
+    _col2im_shape_check(
+        data.reshape((-1, data.shape[-1])),
+        image_shape,
+        kernel_shape,
+        dilations,
+        new_pads,
+        strides,
+    )
+    indices = _col2im_indices(
+        image_shape,
+        kernel_shape,
+        tuple(int(i) for i in dilations),
+        tuple(int(i) for i in pads),
+        tuple(int(i) for i in strides),
+    )
+
+    batch_shape = data.shape[:-2]
+    data_col = data.reshape((-1, *data.shape[-2:]))
+    data_im = np.zeros((data_col.shape[0], int(np.prod(image_shape))), dtype=data.dtype)
+    # Indices of a kernel position are unique, a fancy-indexed addition
+    # accumulates them without np.add.at.
+    for c_col, (col_idx, im_idx) in enumerate(indices):
+        data_im[:, im_idx] += data_col[:, c_col, col_idx]
+    return data_im.reshape(batch_shape + image_shape)
+
+
 class Col2Im(OpRun):
     def _run(
         self, data, image_shape, block_shape, dilations=None, pads=None, strides=None
@@ -198,16 +293,5 @@ class Col2Im(OpRun):
         bl = np.prod(block_shape, dtype=np.int64)
         C = data.shape[1] // bl
         data = data.reshape((*data.shape[:1], C, bl, *data.shape[2:]))
-
-        ks = tuple(block_shape)
-        res = None
-        for n in range(data.shape[0]):
-            for c in range(data.shape[1]):
-                out = col2im_naive_implementation(
-                    data[n, c, ...], image_shape, ks, dilations, pads, strides
-                )
-                if res is None:
-                    new_shape = data.shape[:2] + out.shape
-                    res = np.empty(new_shape, dtype=data.dtype)
-                res[n, c, ...] = out
+        res = col2im(data, image_shape, block_shape, dilations, pads, strides)
         return (res,)
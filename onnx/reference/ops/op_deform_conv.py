@@ -3,10 +3,11 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import itertools
+
 import numpy as np
 
 from onnx.reference.op_run import OpRun
-from onnx.reference.ops import op_grid_sample
 
 
 def _deform_conv_implementation(
@@ -37,7 +38,6 @@ def _deform_conv_implementation(
 
     if ic % offset_group != 0:
         raise ValueError("Number of input channels must be divisible by offset_group.")
-    ics_per_offset_group = ic // offset_group
 
     if (
         offset_group * np.prod(kernel_shape, dtype=np.int64) * len(kernel_shape)
@@ -57,92 +57,95 @@ def _deform_conv_implementation(
         )
     mask = mask.reshape((n, offset_group, *kernel_shape, *output_shape))
 
-    if len(X.shape) == 4:
-        ih, iw = X.shape[2:]
-        oh, ow = offset.shape[-2:]
-        kh, kw = kernel_shape
-        sth, stw = strides
-        dh, dw = dilations
-        kh_new, kw_new = (kh - 1) * dh + 1, (kw - 1) * dw + 1
-
-        if oh != int(((ih - kh_new + pads[0] + pads[2]) / sth) + 1) or ow != int(
-            ((iw - kw_new + pads[1] + pads[3]) / stw) + 1
-        ):
+    n_dims = len(kernel_shape)
+    input_shape = X.shape[2:]
+    for d in range(n_dims):
+        kernel_extent = (kernel_shape[d] - 1) * dilations[d] + 1
+        expected = int(
+            ((input_shape[d] - kernel_extent + pads[d] + pads[d + n_dims]) / strides[d])
+            + 1
+        )
+        if output_shape[d] != expected:
             raise RuntimeError(
                 "Padding, dilation, stride, and kernel shape incompatible with output shape."
             )
 
-        bh, bw = -pads[0], -pads[1]
+    cols = _deformable_im2col(
+        X, offset, mask, kernel_shape, dilations, pads, strides, offset_group
+    )
+
+    # One matmul per group, all images at once:
+    # (group, ocs, ics * K) x (n, group, ics * K, O) -> (n, group, ocs, O)
+    kernel_size = int(np.prod(kernel_shape))
+    output_size = int(np.prod(output_shape))
+    w = W.reshape((group, ocs_per_group, ics_per_group * kernel_size))
+    cols = cols.reshape((n, group, ics_per_group * kernel_size, output_size))
+    res = np.matmul(w, cols).reshape((n, oc, *output_shape))
+    if B is not None:
+        res += B.reshape((1, -1) + (1,) * n_dims)
+    return res.astype(X.dtype)
 
-        res = np.zeros((n, oc, oh, ow), dtype=X.dtype)
-        if B is not None:
-            res[:, :, :, :] = B.reshape((1, -1, 1, 1))
 
-        # Calculate coordinates of sampling points within kernel
-        kernel_pos_w, kernel_pos_h = np.meshgrid(
-            np.arange(0, kw_new, dw), np.arange(0, kh_new, dh)
+def _deformable_im2col(
+    X, offset, mask, kernel_shape, dilations, pads, strides, offset_group
+):
+    """Returns the deformable im2col matrix of shape
+    ``(n, ic, *kernel_shape, *output_shape)``.
+
+    Every kernel position of every output position is sampled at its regular
+    location shifted by `offset` with a multilinear interpolation, pixels
+    outside the input read zero (as GridSample with ``align_corners=1`` and
+    ``padding_mode="zeros"``), and scaled by `mask`. All sampling points are
+    computed at once, the input is gathered once per interpolation corner.
+    """
+    n, ic = X.shape[:2]
+    input_shape = X.shape[2:]
+    n_dims = len(kernel_shape)
+    output_shape = offset.shape[-n_dims:]
+
+    # Sampling coordinates along every dimension,
+    # shape (n, offset_group, *kernel_shape, *output_shape).
+    corners = []
+    for d in range(n_dims):
+        shape_k = [1] * (2 * n_dims)
+        shape_k[d] = kernel_shape[d]
+        shape_o = [1] * (2 * n_dims)
+        shape_o[n_dims + d] = output_shape[d]
+        regular = (np.arange(kernel_shape[d]) * dilations[d]).reshape(shape_k) + (
+            np.arange(output_shape[d]) * strides[d] - pads[d]
+        ).reshape(shape_o)
+        coord = regular + offset[(slice(None),) * (2 + n_dims) + (d,)]
+        low = np.floor(coord)
+        ratio = coord - low
+        low = low.astype(np.int64)
+        # (index, weight, inside) of both neighbours along this dimension.
+        corners.append(
+            [
+                (low + t, w, (low + t >= 0) & (low + t < input_shape[d]))
+                for t, w in ((0, 1 - ratio), (1, ratio))
+            ]
         )
-        kernel_pos_wrt_first_elem = np.stack(
-            (kernel_pos_h, kernel_pos_w), axis=2
-        )  # shape (kH, kW, 2)
-
-        for batch_idx in range(n):
-            for oc_idx in range(oc):
-                for ic_idx in range(ic):
-                    # Group convolution logic
-                    if ic_idx // ics_per_group != oc_idx // ocs_per_group:
-                        # Input channel and output channel don't belong to same group
-                        continue
-
-                    # Offset group logic
-                    offset_group_idx = ic_idx // ics_per_offset_group
-
-                    for i in range(oh):
-                        h_coord = bh + sth * i
-                        for j in range(ow):
-                            w_coord = bw + stw * j
-                            # (h_coord, w_coord) is coord of top left elem of kernel
-
-                            kernel = np.copy(kernel_pos_wrt_first_elem).astype(float)
-                            kernel[:, :, 0] += (
-                                h_coord
-                                + offset[batch_idx, offset_group_idx, :, :, 0, i, j]
-                            )
-                            kernel[:, :, 1] += (
-                                w_coord
-                                + offset[batch_idx, offset_group_idx, :, :, 1, i, j]
-                            )
-
-                            # GridSample expects normalized grid coordinates
-                            kernel[:, :, 0] = kernel[:, :, 0] / (ih - 1) * 2 - 1
-                            kernel[:, :, 1] = kernel[:, :, 1] / (iw - 1) * 2 - 1
-
-                            kernel = np.expand_dims(kernel, 0)  # add batch dimension
-                            kernel = np.flip(
-                                kernel, 3
-                            )  # spatial GridSample expects (x, y) input
-                            grid_sample_output = op_grid_sample.GridSample.eval(
-                                X[batch_idx : batch_idx + 1, ic_idx : ic_idx + 1],
-                                kernel,
-                                align_corners=1,
-                            )
-
-                            conv_value = np.multiply(
-                                grid_sample_output,
-                                W[oc_idx, ic_idx % ics_per_group, :, :],
-                            )
-                            conv_value = np.multiply(
-                                conv_value,
-                                mask[batch_idx, offset_group_idx, :, :, i, j],
-                            )
-                            res[batch_idx, oc_idx, i, j] += np.sum(conv_value)
-
-        return res
-
-    raise RuntimeError(
-        f"The convolution for X.shape={X.shape}, W.shape={W.shape}, "
-        f"kernel_shape={kernel_shape} is not implemented yet."
-    )
+
+    # Input channels grouped by offset group, channels last after the gather.
+    X_g = X.reshape((n, offset_group, ic // offset_group, *input_shape))
+    batch = np.arange(n).reshape((-1,) + (1,) * (2 * n_dims + 1))
+    group = np.arange(offset_group).reshape((1, -1) + (1,) * (2 * n_dims))
+    cols = None
+    for corner in itertools.product(*corners):
+        weight = mask
+        inside = None
+        gather = [batch, group, slice(None)]
+        for index, w, ok in corner:
+            weight = weight * w
+            inside = ok if inside is None else inside & ok
+            gather.append(np.where(ok, index, 0))
+        weight = np.where(inside, weight, 0)
+        values = X_g[tuple(gather)] * weight[..., None]
+        cols = values if cols is None else cols + values
+
+    # (n, offset_group, *K, *O, ics) -> (n, ic, *K, *O)
+    cols = np.moveaxis(cols, -1, 2)
+    return cols.reshape((n, ic, *kernel_shape, *output_shape))
 
 
 class DeformConv(OpRun):
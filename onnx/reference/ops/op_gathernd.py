@@ -35,24 +35,42 @@ def _gather_nd_impl(
         + list(data.shape)[batch_dims + indices.shape[-1] :]
     )
 
-    # Placeholder for output data.
-    output_data_buffer = []
-
-    # Flatten 'indices' to 2D array.
-    reshaped_indices = indices.reshape(batch_dims_size, -1, indices.shape[-1])
-
-    # Flatten 'data' to array of shape
-    # (batch_dim_size, data.shape[batch_dimes:]).
-    reshaped_data = data.reshape((batch_dims_size, *data.shape[batch_dims:]))
+    # Flatten 'indices' to a 3D array (batch, outer, index).
+    k = indices.shape[-1]
+    n_outer = int(np.prod(indices.shape[batch_dims:-1], dtype=np.int64))
+    reshaped_indices = np.asarray(indices, dtype=np.int64).reshape(
+        (batch_dims_size, n_outer, k)
+    )
 
-    # Gather each scalar value from 'data'.
-    for batch_dim in range(reshaped_indices.shape[0]):
-        for outer_dim in range(reshaped_indices.shape[1]):
-            gather_index = tuple(reshaped_indices[batch_dim][outer_dim])
-            output_data_buffer.append(reshaped_data[(batch_dim, *gather_index)])
-    return (np.asarray(output_data_buffer, dtype=data.dtype).reshape(output_shape),)
+    # Every index becomes a linear index in 'data' flattened to
+    # (batch_dims_size * prod(indexed dims), data.shape[batch_dims + k:]),
+    # one take then gathers all the slices of all the batches.
+    indexed_dims = data.shape[batch_dims : batch_dims + k]
+    n_indexed = int(np.prod(indexed_dims, dtype=np.int64))
+    linear = np.arange(batch_dims_size, dtype=np.int64).reshape((-1, 1)) * n_indexed
+    if k > 0:
+        dims = np.array(indexed_dims, dtype=np.int64)
+        # Negative indices count from the end.
+        reshaped_indices = np.where(
+            reshaped_indices < 0, reshaped_indices + dims, reshaped_indices
+        )
+        if np.any((reshaped_indices < 0) | (reshaped_indices >= dims)):
+            raise IndexError(
+                f"GatherND indices are out of bounds for data of shape {data.shape} "
+                f"and batch_dims={batch_dims}."
+            )
+        linear = linear + np.ravel_multi_index(
+            tuple(np.moveaxis(reshaped_indices, -1, 0)), indexed_dims
+        )
+    else:
+        linear = np.broadcast_to(linear, (batch_dims_size, n_outer))
+    reshaped_data = data.reshape(
+        (batch_dims_size * n_indexed, *data.shape[batch_dims + k :])
+    )
+    output = np.take(reshaped_data, linear.ravel(), axis=0)
+    return (output.reshape(output_shape),)
 
 
 class GatherND(OpRun):
     def _run(self, data, indices, batch_dims=None):
-        return _gather_nd_impl(data, indices, batch_dims)
+        return _gather_nd_impl(data, indices, batch_dims or 0)
@@ -6,6 +6,13 @@ from __future__ import annotations
 import numpy as np
 
 from onnx.reference.op_run import OpRun
+from onnx.reference.ops._op_common_rnn import (
+    _check_direction,
+    _input_projection,
+    _masked_step,
+    _stack_directions,
+    _unstack_directions,
+)
 
 
 class CommonGRU(OpRun):
@@ -27,45 +34,40 @@ class CommonGRU(OpRun):
         B: np.ndarray,
         W: np.ndarray,
         H_0: np.ndarray,
+        mask: np.ndarray | None = None,
     ) -> tuple[np.ndarray, np.ndarray]:
-        """Run a single forward pass of the GRU.
-
-        Assumes that the num_directions axis has been squeezed out of the
-        inputs. (And returns Y, Yh without it.)
-        """
+        """Runs all the directions at once, returns Y and Yh."""
         h_list = []
 
-        [w_z, w_r, w_h] = np.split(W, 3)
-        [r_z, r_r, r_h] = np.split(R, 3)
-        [w_bz, w_br, w_bh, r_bz, r_br, r_bh] = np.split(B, 6)
-
-        gates_w = np.transpose(np.concatenate((w_z, w_r)))
-        gates_r = np.transpose(np.concatenate((r_z, r_r)))
-        gates_b = np.add(np.concatenate((w_bz, w_br)), np.concatenate((r_bz, r_br)))
+        hidden_size = R.shape[-1]
+        n_zr = 2 * hidden_size
+        w_b, r_b = np.split(B, 2, axis=-1)
+        r_bh = r_b[:, np.newaxis, n_zr:]
+        if self.linear_before_reset:
+            # r_bh is multiplied by the reset gate inside the loop.
+            r_b = np.concatenate([r_b[:, :n_zr], np.zeros_like(r_b[:, n_zr:])], -1)
+        gates_x = _input_projection(X, W, w_b + r_b)
+        R_t = np.ascontiguousarray(np.transpose(R, (0, 2, 1)))
+        r_zr = R_t[:, :, :n_zr]
+        r_h = R_t[:, :, n_zr:]
 
         H_t = H_0
-        for x in X:
-            gates = np.dot(x, gates_w) + np.dot(H_t, gates_r) + gates_b
-            z, r = np.split(gates, 2, -1)
-            z = self.f(z)
-            r = self.f(r)
-            h_default = self.g(
-                np.dot(x, np.transpose(w_h))
-                + np.dot(r * H_t, np.transpose(r_h))
-                + w_bh
-                + r_bh
-            )
-            h_linear = self.g(
-                np.dot(x, np.transpose(w_h))
-                + r * (np.dot(H_t, np.transpose(r_h)) + r_bh)
-                + w_bh
-            )
-            h = h_linear if self.linear_before_reset else h_default
+        for t in range(X.shape[1]):
+            x_zr = gates_x[:, t, :, :n_zr]
+            x_h = gates_x[:, t, :, n_zr:]
+            if self.linear_before_reset:
+                gates_h = H_t @ R_t
+                z, r = np.split(self.f(x_zr + gates_h[:, :, :n_zr]), 2, -1)
+                h = self.g(x_h + r * (gates_h[:, :, n_zr:] + r_bh))
+            else:
+                z, r = np.split(self.f(x_zr + H_t @ r_zr), 2, -1)
+                h = self.g(x_h + (r * H_t) @ r_h)
             H = (1 - z) * h + z * H_t
-            h_list.append(H)
+            H, Y_t = _masked_step(mask, t, H, H_t)
+            h_list.append(Y_t)
             H_t = H
 
-        Y = np.stack(h_list, axis=0)
+        Y = np.stack(h_list, axis=1)
         Y_h = H_t
         return Y, Y_h
 
@@ -77,55 +79,12 @@ class CommonGRU(OpRun):
         W: np.ndarray,
         H_0: np.ndarray,
         num_directions: int,
+        sequence_lens: np.ndarray | None = None,
     ) -> tuple[np.ndarray, np.ndarray]:
-        if self.direction not in {"forward", "reverse", "bidirectional"}:
-            raise RuntimeError(f"Unknown direction {self.direction!r}.")
-        expected_num_directions = 2 if self.direction == "bidirectional" else 1
-        if num_directions != expected_num_directions:
-            raise RuntimeError(
-                f"direction={self.direction!r} requires num_directions={expected_num_directions} "
-                f"but got {num_directions}."
-            )
-
-        if self.direction == "forward":
-            Y, Y_h = self._run_forward(
-                X,
-                R[0],
-                B[0],
-                W[0],
-                H_0[0],
-            )
-            Y = np.expand_dims(Y, 1)
-            Y_h = np.expand_dims(Y_h, 0)
-        elif self.direction == "reverse":
-            Y, Y_h = self._run_forward(
-                np.flip(X, axis=0),
-                R[0],
-                B[0],
-                W[0],
-                H_0[0],
-            )
-            Y = np.flip(Y, axis=0)
-            Y = np.expand_dims(Y, 1)
-            Y_h = np.expand_dims(Y_h, 0)
-        else:
-            Yf, Yf_h = self._run_forward(
-                X,
-                R[0],
-                B[0],
-                W[0],
-                H_0[0],
-            )
-            Yb, Yb_h = self._run_forward(
-                np.flip(X, axis=0),
-                R[1],
-                B[1],
-                W[1],
-                H_0[1],
-            )
-            Yb = np.flip(Yb, axis=0)
-            Y = np.stack([Yf, Yb], axis=1)
-            Y_h = np.stack([Yf_h, Yb_h], axis=0)
+        _check_direction(self.direction, num_directions)
+        X, orders, mask = _stack_directions(X, self.direction, sequence_lens)
+        Y, Y_h = self._run_forward(X, R, B, W, H_0, mask)
+        Y = _unstack_directions(Y, orders)
 
         if self.layout:
             Y = np.transpose(Y, [2, 0, 1, 3])
@@ -139,7 +98,7 @@ class CommonGRU(OpRun):
         W,
         R,
         B=None,
-        sequence_lens=None,  # noqa: ARG002
+        sequence_lens=None,
         initial_h=None,
         activation_alpha=None,  # noqa: ARG002
         activation_beta=None,  # noqa: ARG002
@@ -177,7 +136,15 @@ class CommonGRU(OpRun):
         B = b
         H_0 = h_0
 
-        Y, Y_h = self._step(X, R, B, W, H_0, num_directions=num_directions)
+        Y, Y_h = self._step(
+            X,
+            R,
+            B,
+            W,
+            H_0,
+            num_directions=num_directions,
+            sequence_lens=sequence_lens,
+        )
         Y = Y.astype(X.dtype)
         return (Y,) if self.n_outputs == 1 else (Y, Y_h.astype(X.dtype))
 
@@ -19,6 +19,94 @@ def _unpack_3d_to_4d(x: np.ndarray, num_heads: int) -> np.ndarray:
     return x.reshape(b, t, num_heads, d).transpose(0, 2, 1, 3)
 
 
+# Largest cumulated log decay within a chunk for which exp(G) and exp(-G)
+# are computed without overflow in float32.
+_MAX_FACTORIZED_DECAY = 40.0
+
+
+def _linear_attention_chunk(
+    q: np.ndarray,
+    k: np.ndarray,
+    v: np.ndarray,
+    state: np.ndarray,
+    g: np.ndarray | None,
+    beta: np.ndarray | None,
+    scale: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Processes one chunk of C tokens of the recurrence at once.
+
+    Args:
+        q: queries (B, H_kv, group_size, C, d_k)
+        k: keys (B, H_kv, C, d_k)
+        v: values (B, H_kv, C, d_v)
+        state: state before the chunk (B, H_kv, d_k, d_v)
+        g: log decay (B, H_kv, C, 1 or d_k) or None without gating
+        beta: delta rule strength (B, H_kv or 1, C, 1) or None without
+            delta correction
+        scale: factor applied to the outputs
+
+    Returns:
+        outputs (B, H_kv, group_size, C, d_v) and the state after the chunk
+
+    With G the cumulated decay since the beginning of the chunk, the state
+    after token t is `exp(G_t) S_0 + sum_{j<=t} exp(G_t - G_j) k_j u_j^T`
+    where `u_j` is the value written by token j. It is `v_j` without delta
+    correction, otherwise `beta_j (v_j - S_{j-1}^T k_j)` which gives a unit
+    lower triangular system solved for all the tokens of the chunk (WY
+    representation).
+    """
+    c = k.shape[2]
+    causal = np.tril(np.ones((c, c), dtype=bool))
+    if g is None:
+        kk = k @ np.swapaxes(k, -1, -2)
+        qk = q @ np.swapaxes(k, -1, -2)[:, :, np.newaxis]
+        q_state, k_state, k_end, decay_end = q, k, k, None
+    else:
+        G = np.cumsum(g, axis=2)
+        if G.shape[-1] == 1:
+            # Scalar decay per head: the decay between two tokens is a
+            # (C, C) matrix, exponents are masked before exp to avoid
+            # overflows above the diagonal.
+            diff = G[:, :, :, np.newaxis, 0] - G[:, :, np.newaxis, :, 0]
+            w = np.exp(np.where(causal, diff, -np.inf))
+            kk = (k @ np.swapaxes(k, -1, -2)) * w
+            qk = (q @ np.swapaxes(k, -1, -2)[:, :, np.newaxis]) * w[:, :, np.newaxis]
+        elif np.abs(G).max() < _MAX_FACTORIZED_DECAY:
+            # Decay per key dimension: exp(G_t - G_j) = exp(G_t) exp(-G_j)
+            # can be folded into the queries and the keys.
+            k_in = k * np.exp(-G)
+            kk = (k * np.exp(G)) @ np.swapaxes(k_in, -1, -2)
+            qk = (q * np.exp(G)[:, :, np.newaxis]) @ np.swapaxes(k_in, -1, -2)[
+                :, :, np.newaxis
+            ]
+        else:
+            # The factorization would overflow, the (C, C, d_k) decays are
+            # computed instead.
+            diff = G[:, :, :, np.newaxis] - G[:, :, np.newaxis]
+            w = np.exp(np.where(causal[:, :, np.newaxis], diff, -np.inf))
+            kk = np.einsum("bhtd,bhjd,bhtjd->bhtj", k, k, w)
+            qk = np.einsum("bhgtd,bhjd,bhtjd->bhgtj", q, k, w)
+        eG = np.exp(G)
+        q_state = q * eG[:, :, np.newaxis]
+        k_state = k * eG
+        k_end = k * np.exp(G[:, :, -1:] - G)
+        decay_end = eG[:, :, -1, :, np.newaxis]
+
+    if beta is None:
+        u = v
+    else:
+        # (I + diag(beta) strict_tril(K K^T)) U = diag(beta) (V - K S_0)
+        system = np.eye(c, dtype=kk.dtype) + beta * np.tril(kk, -1)
+        u = np.linalg.solve(system, beta * (v - k_state @ state))
+
+    qk = np.where(causal, qk, 0)
+    outputs = scale * (q_state @ state[:, :, np.newaxis] + qk @ u[:, :, np.newaxis])
+    if decay_end is not None:
+        state = state * decay_end
+    state = state + np.swapaxes(k_end, -1, -2) @ u
+    return outputs, state
+
+
 class LinearAttention(OpRun):
     def _run(
         self,
@@ -28,7 +116,7 @@ class LinearAttention(OpRun):
         past_state=None,
         decay=None,
         beta=None,
-        chunk_size=None,  # noqa: ARG002 — tuning hint, no effect on output
+        chunk_size=None,
         kv_num_heads=None,
         q_num_heads=None,
         scale=None,
@@ -139,37 +227,26 @@ class LinearAttention(OpRun):
         else:
             scale_val = float(scale)
 
-        # --- Step 7+8: recurrence with GQA expansion at read time ---
-        outputs = np.zeros((b, q_num_heads, t, d_v), dtype=np.float32)
-        for i in range(t):
-            q_t = q4[:, :, i, :]  # (B, H_q, d_k)
-            k_t = k4[:, :, i, :]  # (B, H_kv, d_k)
-            v_t = v4[:, :, i, :]  # (B, H_kv, d_v)
-
-            # Decay: state *= exp(g_t)
-            if gating:
-                g_t = decay4[:, :, i, :]  # (B, H_kv, 1) or (B, H_kv, d_k)
-                state = state * np.exp(g_t)[..., None]  # broadcast over d_v
-
-            # Delta correction: v_t <- beta_t * (v_t - S^T @ k_t)
-            if delta_correction:
-                # retrieved[b, h, m] = sum_d state[b, h, d, m] * k_t[b, h, d]
-                retrieved = np.einsum("bhdm,bhd->bhm", state, k_t)
-                v_t = beta4[:, :, i, :] * (v_t - retrieved)
-
-            # Write: state += k_t ⊗ v_t  (outer product over last dims)
-            state = state + k_t[..., :, None] * v_t[..., None, :]
-
-            # Read with GQA: replicate KV-head state across query heads.
-            if group_size == 1:
-                state_for_read = state
-            else:
-                # (B, H_kv, d_k, d_v) -> (B, H_q, d_k, d_v) by interleave-repeat
-                state_for_read = np.repeat(state, group_size, axis=1)
-            # o_t[b, h, m] = scale * sum_d q_t[b, h, d] * state_for_read[b, h, d, m]
-            outputs[:, :, i, :] = scale_val * np.einsum(
-                "bhd,bhdm->bhm", q_t, state_for_read
+        # --- Step 7+8: chunked recurrence with GQA expansion at read time ---
+        # Query head h reads the state of kv head h // group_size.
+        if chunk_size is None:
+            chunk_size = 64
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+        q5 = q4.reshape((b, kv_num_heads, group_size, t, d_k))
+        outputs = np.zeros((b, kv_num_heads, group_size, t, d_v), dtype=np.float32)
+        for start in range(0, t, chunk_size):
+            chunk = slice(start, min(start + chunk_size, t))
+            outputs[:, :, :, chunk], state = _linear_attention_chunk(
+                q5[:, :, :, chunk],
+                k4[:, :, chunk],
+                v4[:, :, chunk],
+                state,
+                decay4[:, :, chunk] if gating else None,
+                beta4[:, :, chunk] if delta_correction else None,
+                scale_val,
             )
+        outputs = outputs.reshape((b, q_num_heads, t, d_v))
 
         # --- Step 9: repack output (B, H_q, T, d_v) -> (B, T, H_q*d_v) ---
         output = outputs.transpose(0, 2, 1, 3).reshape(b, t, q_num_heads * d_v)
@@ -6,6 +6,13 @@ from __future__ import annotations
 import numpy as np
 
 from onnx.reference.op_run import OpRun
+from onnx.reference.ops._op_common_rnn import (
+    _check_direction,
+    _input_projection,
+    _masked_step,
+    _stack_directions,
+    _unstack_directions,
+)
 
 
 class CommonLSTM(OpRun):
@@ -32,23 +39,18 @@ class CommonLSTM(OpRun):
         P: np.ndarray,
         H_0: np.ndarray,
         C_0: np.ndarray,
+        mask: np.ndarray | None = None,
     ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-        """Run a forward pass of the LSTM.
-
-        Assumes that the num_directions axis has been squeezed out of the
-        inputs. (And returns Y, Yh, Yc without it.)
-        """
+        """Runs all the directions at once, returns Y, Yh and Yc."""
         h_list = []
 
-        [p_i, p_o, p_f] = np.split(P, 3)
+        gates_x = _input_projection(X, W, np.add(*np.split(B, 2, axis=-1)))
+        R_t = np.ascontiguousarray(np.transpose(R, (0, 2, 1)))
+        [p_i, p_o, p_f] = (p[:, np.newaxis] for p in np.split(P, 3, axis=-1))
         H_t = H_0
         C_t = C_0
-        for x in X:
-            gates = (
-                np.dot(x, np.transpose(W))
-                + np.dot(H_t, np.transpose(R))
-                + np.add(*np.split(B, 2))
-            )
+        for t in range(X.shape[1]):
+            gates = gates_x[:, t] + H_t @ R_t
             i, o, f, c = np.split(gates, 4, -1)
             i = self.f(i + p_i * C_t)
             f = self.f(f + p_f * C_t)
@@ -56,11 +58,13 @@ class CommonLSTM(OpRun):
             C = f * C_t + i * c
             o = self.f(o + p_o * C)
             H = o * self.h(C)
-            h_list.append(H)
+            C, _ = _masked_step(mask, t, C, C_t)
+            H, Y_t = _masked_step(mask, t, H, H_t)
+            h_list.append(Y_t)
             H_t = H
             C_t = C
 
-        Y = np.stack(h_list, axis=0)
+        Y = np.stack(h_list, axis=1)
         Y_h = H_t
         Y_c = C_t
         return Y, Y_h, Y_c
@@ -75,67 +79,12 @@ class CommonLSTM(OpRun):
         C_0: np.ndarray,
         P: np.ndarray,
         num_directions: int,
+        sequence_lens: np.ndarray | None = None,
     ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
-        if self.direction not in {"forward", "reverse", "bidirectional"}:
-            raise RuntimeError(f"Unknown direction {self.direction!r}.")
-        expected_num_directions = 2 if self.direction == "bidirectional" else 1
-        if num_directions != expected_num_directions:
-            raise RuntimeError(
-                f"direction={self.direction!r} requires num_directions={expected_num_directions} "
-                f"but got {num_directions}."
-            )
-
-        if self.direction == "forward":
-            Y, Y_h, Y_c = self._run_forward(
-                X,
-                W[0],
-                R[0],
-                B[0],
-                P[0],
-                H_0[0],
-                C_0[0],
-            )
-            # Add num_directions axis to outputs
-            Y = np.expand_dims(Y, 1)
-            Y_h = np.expand_dims(Y_h, 0)
-            Y_c = np.expand_dims(Y_c, 0)
-        elif self.direction == "reverse":
-            Y, Y_h, Y_c = self._run_forward(
-                np.flip(X, axis=0),
-                W[0],
-                R[0],
-                B[0],
-                P[0],
-                H_0[0],
-                C_0[0],
-            )
-            Y = np.flip(Y, axis=0)
-            Y = np.expand_dims(Y, 1)
-            Y_h = np.expand_dims(Y_h, 0)
-            Y_c = np.expand_dims(Y_c, 0)
-        else:
-            Yf, Yf_h, Yf_c = self._run_forward(
-                X,
-                W[0],
-                R[0],
-                B[0],
-                P[0],
-                H_0[0],
-                C_0[0],
-            )
-            Yb, Yb_h, Yb_c = self._run_forward(
-                np.flip(X, axis=0),
-                W[1],
-                R[1],
-                B[1],
-                P[1],
-                H_0[1],
-                C_0[1],
-            )
-            Yb = np.flip(Yb, axis=0)
-            Y = np.stack([Yf, Yb], axis=1)
-            Y_h = np.stack([Yf_h, Yb_h], axis=0)
-            Y_c = np.stack([Yf_c, Yb_c], axis=0)
+        _check_direction(self.direction, num_directions)
+        X, orders, mask = _stack_directions(X, self.direction, sequence_lens)
+        Y, Y_h, Y_c = self._run_forward(X, W, R, B, P, H_0, C_0, mask)
+        Y = _unstack_directions(Y, orders)
 
         if self.layout:
             Y = np.transpose(Y, [2, 0, 1, 3])
@@ -150,7 +99,7 @@ class CommonLSTM(OpRun):
         W,
         R,
         B=None,
-        sequence_lens=None,  # noqa: ARG002
+        sequence_lens=None,
         initial_h=None,
         initial_c=None,
         P=None,
@@ -195,7 +144,15 @@ class CommonLSTM(OpRun):
             )
 
         Y, Y_h, Y_c = self._step(
-            X, R, B, W, initial_h, initial_c, P, num_directions=num_directions
+            X,
+            R,
+            B,
+            W,
+            initial_h,
+            initial_c,
+            P,
+            num_directions=num_directions,
+            sequence_lens=sequence_lens,
         )
         Y = Y.astype(X.dtype)
 
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import functools
 import math
 from typing import TYPE_CHECKING, Any
 
@@ -367,32 +368,33 @@ def _compute_x_ori(
     return x_ori, is_extrapolated
 
 
-def _interpolate_1d_along_axis(
-    data: np.ndarray,
-    axis: int,
-    scale_factor: float,
-    output_width_int: int,
+@functools.lru_cache(maxsize=256)
+def _axis_weights(
     get_coeffs: Callable[[float, float], np.ndarray],
-    roi: np.ndarray | list[float] | None = None,
-    extrapolation_value: float = 0.0,
-    coordinate_transformation_mode: str = "half_pixel",
-    exclude_outside: bool = False,
-) -> np.ndarray:
-    """Vectorized 1-D resize along a single axis.
-
-    Computes the same result as calling :func:`_interpolate_1d_with_x` for
-    every output coordinate along ``axis``, but in a single batched numpy
-    operation. Resize interpolation is separable along axes, so resizing an
-    N-D tensor reduces to applying this routine once per axis.
+    input_width: int,
+    output_width_int: int,
+    scale_factor: float,
+    roi: tuple[float, float] | None,
+    roi_types: tuple[type, type] | None,
+    coordinate_transformation_mode: str,
+    exclude_outside: bool,
+) -> tuple[np.ndarray, np.ndarray | None, np.ndarray | None]:
+    """Returns the interpolation tables of one axis.
+
+    The result is ``(indices, coeffs, is_extrapolated)``: output position ``i``
+    is ``sum(coeffs[i, k] * data[indices[i, k]])``. When every output position
+    copies a single input element (nearest mode), ``indices`` has one column and
+    ``coeffs`` is None. ``is_extrapolated`` flags the positions replaced by
+    the extrapolation value (``tf_crop_and_resize`` only).
+
+    The tables only depend on the arguments and are cached, the coefficient
+    function is part of the key so :class:`Resize` passes the same function
+    object for the same attributes (see :func:`_coeffs_function`).
+    ``roi_types`` is only part of the key: the source coordinates are computed
+    in the precision of ``roi``, a float32 roi and a float roi holding the
+    same values are different entries.
     """
-    if output_width_int == 0:
-        # Zero-sized output along this axis — nothing to interpolate, but
-        # downstream code indexes ratios[0] / coeffs[0], so bail out early.
-        empty_shape = list(data.shape)
-        empty_shape[axis] = 0
-        return np.empty(empty_shape, dtype=data.dtype)
-
-    input_width = data.shape[axis]
+    del roi_types  # only used as a cache key
     output_width = scale_factor * input_width
     y = np.arange(output_width_int, dtype=np.float64)
 
@@ -405,6 +407,8 @@ def _interpolate_1d_along_axis(
         output_width_int,
         roi,
     )
+    if is_extrapolated is not None and not is_extrapolated.any():
+        is_extrapolated = None
 
     x_ori_int = np.floor(x_ori).astype(np.int64)
     # Match the scalar code: prefer the pixel on the left of x_ori by
@@ -453,14 +457,72 @@ def _interpolate_1d_along_axis(
 
     # Edge-padding is equivalent to clamping indices into the valid range.
     # intp cast: np.take rejects int64 indices on 32-bit platforms.
-    clamped = np.clip(neighbor_idxes, 0, input_width - 1).astype(np.intp)
-    gathered = np.take(data, clamped, axis=axis)
+    indices = np.clip(neighbor_idxes, 0, input_width - 1).astype(np.intp)
+
+    nonzero = coeffs != 0
+    if np.all(nonzero.sum(axis=1) == 1) and np.all(coeffs[nonzero] == 1):
+        # Every output position copies one input element, a gather is enough.
+        indices = indices[np.arange(output_width_int), nonzero.argmax(axis=1)]
+        indices = indices[:, None]
+        result_coeffs = None
+    else:
+        result_coeffs = coeffs
+
+    for a in (indices, result_coeffs, is_extrapolated):
+        if a is not None:
+            a.flags.writeable = False
+    return indices, result_coeffs, is_extrapolated
 
-    coeff_shape = (1,) * axis + coeffs.shape + (1,) * (data.ndim - axis - 1)
-    weighted = gathered * coeffs.reshape(coeff_shape)
-    result = weighted.sum(axis=axis + 1)
 
-    if is_extrapolated is not None and is_extrapolated.any():
+def _interpolate_1d_along_axis(
+    data: np.ndarray,
+    axis: int,
+    scale_factor: float,
+    output_width_int: int,
+    get_coeffs: Callable[[float, float], np.ndarray],
+    roi: np.ndarray | list[float] | None = None,
+    extrapolation_value: float = 0.0,
+    coordinate_transformation_mode: str = "half_pixel",
+    exclude_outside: bool = False,
+) -> np.ndarray:
+    """Vectorized 1-D resize along a single axis.
+
+    Computes the same result as calling :func:`_interpolate_1d_with_x` for
+    every output coordinate along ``axis``, but in a single batched numpy
+    operation. Resize interpolation is separable along axes, so resizing an
+    N-D tensor reduces to applying this routine once per axis.
+    """
+    if output_width_int == 0:
+        # Zero-sized output along this axis — nothing to interpolate.
+        empty_shape = list(data.shape)
+        empty_shape[axis] = 0
+        return np.empty(empty_shape, dtype=data.dtype)
+
+    indices, coeffs, is_extrapolated = _axis_weights(
+        get_coeffs,
+        data.shape[axis],
+        output_width_int,
+        float(scale_factor),
+        None if roi is None else (roi[0], roi[1]),
+        None if roi is None else (type(roi[0]), type(roi[1])),
+        coordinate_transformation_mode,
+        bool(exclude_outside),
+    )
+
+    if coeffs is None:
+        result = np.take(data, indices[:, 0], axis=axis)
+    else:
+        # One gather per tap, this avoids materializing a tensor n times
+        # larger than the output.
+        coeff_shape = (1,) * axis + (output_width_int,) + (1,) * (data.ndim - axis - 1)
+        result = np.take(data, indices[:, 0], axis=axis)
+        result *= coeffs[:, 0].reshape(coeff_shape)
+        for k in range(1, indices.shape[1]):
+            term = np.take(data, indices[:, k], axis=axis)
+            term *= coeffs[:, k].reshape(coeff_shape)
+            result += term
+
+    if is_extrapolated is not None:
         mask_shape = (1,) * axis + (output_width_int,) + (1,) * (data.ndim - axis - 1)
         mask = is_extrapolated.reshape(mask_shape)
         result = np.where(mask, extrapolation_value, result)
@@ -576,6 +638,39 @@ def _interpolate_nd(
     return result
 
 
+@functools.lru_cache(maxsize=64)
+def _coeffs_function(
+    mode: str | None,
+    nearest_mode: str | None,
+    antialias: int | None,
+    cubic_coeff_a: float | None,
+) -> Callable[[float, float], np.ndarray]:
+    """Returns the coefficient function of a Resize node.
+
+    The same object is returned for the same attributes so that the tables
+    cached by :func:`_axis_weights` are shared between calls.
+    """
+    if mode == "nearest":
+        if antialias:
+            raise RuntimeError(
+                f"antilias={antialias!r} is not supported for mode={mode!r}."
+            )
+        if nearest_mode is not None:
+
+            def fct(x, scale_factor):
+                del scale_factor  # unused
+                return _nearest_coeffs(x, mode=nearest_mode)
+
+            return fct
+        return _nearest_coeffs
+    if mode == "cubic":
+        fct_ = _cubic_coeffs_antialias if antialias else _cubic_coeffs
+        return functools.partial(fct_, A=cubic_coeff_a)
+    if mode == "linear":
+        return _linear_coeffs_antialias if antialias else _linear_coeffs
+    raise ValueError(f"Unexpected value {mode!r} for mode.")
+
+
 class Resize(OpRun):
     def _run(
         self,
@@ -593,73 +688,21 @@ class Resize(OpRun):
         mode: str | None = None,
         nearest_mode=None,
     ):
-        if mode == "nearest":
-            if antialias:
-                raise RuntimeError(
-                    f"antilias={antialias!r} is not supported for mode={mode!r}."
-                )
-            if nearest_mode is not None:
-
-                def fct(x, scale_factor):
-                    del scale_factor  # unused
-                    return _nearest_coeffs(x, mode=nearest_mode)
-
-            else:
-                fct = _nearest_coeffs
-        elif mode == "cubic":
-            fct_ = _cubic_coeffs_antialias if antialias else _cubic_coeffs
-
-            def fct(x, scale):
-                return fct_(x, scale, A=cubic_coeff_a)
-
-        elif mode == "linear":
-            fct = _linear_coeffs_antialias if antialias else _linear_coeffs
-        else:
-            raise ValueError(f"Unexpected value {mode!r} for mode.")
-
-        if axes is None:
-            output = onnx.numpy_helper.saturate_cast(
-                _interpolate_nd(
-                    X,
-                    fct,
-                    scale_factors=scales,
-                    output_size=sizes,
-                    roi=roi,
-                    keep_aspect_ratio_policy=keep_aspect_ratio_policy,
-                    exclude_outside=exclude_outside,
-                    coordinate_transformation_mode=coordinate_transformation_mode,
-                    extrapolation_value=extrapolation_value,
-                ),
-                X.dtype,
-            )
-            return (output,)
-
-        # axes is not None
-        not_axes = [a for a in range(len(X.shape)) if a not in axes]
-        perm = tuple(not_axes + axes)
-        permuted = np.transpose(X, perm)
-        new_shape = (-1, *tuple(X.shape[a] for a in axes))
-        reshaped = permuted.reshape(new_shape)
-        res = None
-        for i in range(reshaped.shape[0]):
-            output = _interpolate_nd(
-                reshaped[i],
-                fct,
-                scale_factors=scales,
-                output_size=sizes,
-                roi=roi,
-                keep_aspect_ratio_policy=keep_aspect_ratio_policy,
-                exclude_outside=exclude_outside,
-                coordinate_transformation_mode=coordinate_transformation_mode,
-                extrapolation_value=extrapolation_value,
-            )
-            if res is None:
-                res = np.empty((reshaped.shape[0], *output.shape), dtype=X.dtype)
-            res[i] = onnx.numpy_helper.saturate_cast(output, X.dtype)
-
-        res_reshaped = res.reshape(tuple(X.shape[a] for a in not_axes) + res[0].shape)
-        new_perm = list(perm)
-        for i, a in enumerate(perm):
-            new_perm[a] = i
-        final = np.transpose(res_reshaped, tuple(new_perm))
-        return (final,)
+        fct = _coeffs_function(mode, nearest_mode, antialias, cubic_coeff_a)
+        if axes is not None:
+            axes = [int(a) % X.ndim for a in axes]
+        # The interpolation is separable, every axis is resized at once for
+        # all the positions of the other axes.
+        output = _interpolate_nd(
+            X,
+            fct,
+            scale_factors=scales,
+            output_size=sizes,
+            axes=axes,
+            roi=roi,
+            keep_aspect_ratio_policy=keep_aspect_ratio_policy,
+            exclude_outside=exclude_outside,
+            coordinate_transformation_mode=coordinate_transformation_mode,
+            extrapolation_value=extrapolation_value,
+        )
+        return (onnx.numpy_helper.saturate_cast(output, X.dtype),)
@@ -6,6 +6,13 @@ from __future__ import annotations
 import numpy as np
 
 from onnx.reference.op_run import OpRun
+from onnx.reference.ops._op_common_rnn import (
+    _check_direction,
+    _input_projection,
+    _masked_step,
+    _stack_directions,
+    _unstack_directions,
+)
 
 
 class CommonRNN(OpRun):
@@ -82,24 +89,20 @@ class CommonRNN(OpRun):
         B: np.ndarray,
         W: np.ndarray,
         H_0: np.ndarray,
+        mask: np.ndarray | None = None,
     ) -> tuple[np.ndarray, np.ndarray]:
-        """Run a forward pass of the RNN.
-
-        Assumes that the num_directions axis has been squeezed out of the
-        inputs. (And returns Y, Yh without it.)
-        """
+        """Runs all the directions at once, returns Y and Yh."""
         h_list = []
+        gates_x = _input_projection(X, W, np.add(*np.split(B, 2, axis=-1)))
+        R_t = np.ascontiguousarray(np.transpose(R, (0, 2, 1)))
         H_t = H_0
-        for x in X:
-            H = self.f1(
-                np.dot(x, np.transpose(W))
-                + np.dot(H_t, np.transpose(R))
-                + np.add(*np.split(B, 2))
-            )
-            h_list.append(H)
+        for t in range(X.shape[1]):
+            H = self.f1(gates_x[:, t] + H_t @ R_t)
+            H, Y_t = _masked_step(mask, t, H, H_t)
+            h_list.append(Y_t)
             H_t = H
-        output = np.stack(h_list, axis=0)
-        return output, h_list[-1]
+        output = np.stack(h_list, axis=1)
+        return output, H_t
 
     def _run(
         self,
@@ -107,7 +110,7 @@ class CommonRNN(OpRun):
         W,
         R,
         B=None,
-        sequence_lens=None,  # noqa: ARG002
+        sequence_lens=None,
         initial_h=None,
         activation_alpha=None,  # noqa: ARG002
         activation_beta=None,  # noqa: ARG002
@@ -136,55 +139,10 @@ class CommonRNN(OpRun):
             else np.zeros((self.num_directions, batch_size, hidden_size), dtype=X.dtype)
         )
 
-        if self.direction not in {"forward", "reverse", "bidirectional"}:
-            raise RuntimeError(f"Unknown direction {self.direction!r}.")
-        expected_num_directions = 2 if self.direction == "bidirectional" else 1
-        if self.num_directions != expected_num_directions:
-            raise RuntimeError(
-                f"direction={self.direction!r} requires num_directions={expected_num_directions} "
-                f"but got {self.num_directions}."
-            )
-
-        if self.direction == "forward":
-            Y, Y_h = self._run_forward(
-                X,
-                R[0],
-                B[0],
-                W[0],
-                H_0[0],
-            )
-            # Singleton num_directions axis
-            Y = np.expand_dims(Y, 1)
-            Y_h = np.expand_dims(Y_h, 0)
-        elif self.direction == "reverse":
-            Y, Y_h = self._run_forward(
-                np.flip(X, axis=0),
-                R[0],
-                B[0],
-                W[0],
-                H_0[0],
-            )
-            Y = np.flip(Y, axis=0)
-            Y = np.expand_dims(Y, 1)
-            Y_h = np.expand_dims(Y_h, 0)
-        else:
-            Yf, Yf_h = self._run_forward(
-                X,
-                R[0],
-                B[0],
-                W[0],
-                H_0[0],
-            )
-            Yb, Yb_h = self._run_forward(
-                np.flip(X, axis=0),
-                R[1],
-                B[1],
-                W[1],
-                H_0[1],
-            )
-            Yb = np.flip(Yb, axis=0)
-            Y = np.stack([Yf, Yb], axis=1)
-            Y_h = np.stack([Yf_h, Yb_h], axis=0)
+        _check_direction(self.direction, self.num_directions)
+        X, orders, mask = _stack_directions(X, self.direction, sequence_lens)
+        Y, Y_h = self._run_forward(X, R, B, W, H_0, mask)
+        Y = _unstack_directions(Y, orders)
 
         if layout == 1:
             Y = np.transpose(Y, [2, 0, 1, 3])
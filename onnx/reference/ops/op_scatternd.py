@@ -7,25 +7,53 @@ import numpy as np
 
 from onnx.reference.op_run import OpRun
 
+_UFUNC_REDUCTIONS = {
+    "add": np.add,
+    "mul": np.multiply,
+    "max": np.maximum,
+    "min": np.minimum,
+}
+
 
 def _scatter_nd_impl(data, indices, updates, reduction=None):
+    """Scatters all the updates at once.
+
+    Every index of `indices` is converted into a linear index over the
+    first ``indices.shape[-1]`` dimensions of `data`, each of them selects
+    one slice of the flattened output. Reductions use the unbuffered
+    ``ufunc.at`` so that duplicated indices are all applied, in order. Without
+    reduction, the last update of a duplicated index wins, as if the updates
+    were applied one after the other.
+    """
     output = np.copy(data)
-    for i in np.ndindex(indices.shape[:-1]):
-        if reduction == "add":
-            output[tuple(indices[i])] += updates[i]
-        elif reduction == "mul":
-            output[tuple(indices[i])] *= updates[i]
-        elif reduction == "max":
-            output[tuple(indices[i])] = np.maximum(
-                output[tuple(indices[i])], updates[i]
-            )
-        elif reduction == "min":
-            output[tuple(indices[i])] = np.minimum(
-                output[tuple(indices[i])], updates[i]
+    k = indices.shape[-1]
+    prefix_shape = data.shape[:k]
+    slice_shape = data.shape[k:]
+    flat_output = output.reshape((-1, *slice_shape))
+    flat_updates = np.asarray(updates).reshape((-1, *slice_shape))
+
+    n_updates = int(np.prod(indices.shape[:-1]))
+    flat_indices = np.asarray(indices, dtype=np.int64).reshape((n_updates, k))
+    if k == 0:
+        linear = np.zeros(n_updates, dtype=np.int64)
+    else:
+        # Negative indices count from the end like numpy indexing.
+        dims = np.array(prefix_shape, dtype=np.int64)
+        flat_indices = np.where(flat_indices < 0, flat_indices + dims, flat_indices)
+        if np.any((flat_indices < 0) | (flat_indices >= dims)):
+            raise IndexError(
+                f"ScatterND indices are out of bounds for data of shape {data.shape}."
             )
-        else:
-            output[tuple(indices[i])] = updates[i]
-    return output
+        linear = np.ravel_multi_index(tuple(flat_indices.T), prefix_shape)
+
+    if reduction in _UFUNC_REDUCTIONS:
+        _UFUNC_REDUCTIONS[reduction].at(flat_output, linear, flat_updates)
+    else:
+        # Keeps the last occurrence of every index.
+        _, last = np.unique(linear[::-1], return_index=True)
+        last = linear.shape[0] - 1 - last
+        flat_output[linear[last]] = flat_updates[last]
+    return flat_output.reshape(data.shape)
 
 
 class ScatterND(OpRun):
@@ -19,6 +19,8 @@ class TensorScatter(OpRun):
         input_shape = past_cache.shape
         update_shape = update.shape
         axis = axis % len(input_shape)
+        if axis == 0:
+            raise ValueError("axis cannot be 0 (the batch dimension).")
 
         for i in range(len(input_shape)):
             if i != axis:
@@ -36,15 +38,23 @@ class TensorScatter(OpRun):
         sequence_length = update_shape[axis]
         present_cache = np.copy(past_cache)
 
-        for prefix_idx in np.ndindex(input_shape[:axis]):
-            batch_idx = prefix_idx[0]
-            for sequence_idx in range(sequence_length):
-                cache_idx = (*prefix_idx, write_indices[batch_idx] + sequence_idx)
-                if mode == "circular":
-                    cache_idx = tuple(
-                        np.mod(np.asarray(cache_idx), max_sequence_length)
-                    )
-                update_idx = (*prefix_idx, sequence_idx)
-                present_cache[cache_idx] = update[update_idx]
-
-        return (present_cache.reshape(input_shape),)
+        # Positions written along axis for every batch, shape (batch, sequence).
+        positions = np.asarray(write_indices, dtype=np.int64).reshape((-1, 1))
+        positions = positions + np.arange(sequence_length, dtype=np.int64)
+        update = np.moveaxis(update, axis, 1)
+        if mode == "circular":
+            positions = np.mod(positions, max_sequence_length)
+        elif np.any(positions >= max_sequence_length):
+            raise IndexError(
+                f"write_indices {write_indices} and sequence length "
+                f"{sequence_length} exceed the cache size {max_sequence_length}."
+            )
+
+        # The batch and sequence indices are broadcast together, numpy moves
+        # these two dimensions first when other dimensions separate them,
+        # which is why the sequence axis of update is moved next to the batch.
+        batch = np.arange(input_shape[0]).reshape((-1, 1))
+        index = (batch, *([slice(None)] * (axis - 1)), positions)
+        present_cache[index] = update
+
+        return (present_cache,)
@@ -3,8 +3,23 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+from onnx.reference.ops_optimized._registry import (
+    FastKernel,
+    fast_kernels,
+    register_fast_kernel,
+    verified_kernel,
+)
 from onnx.reference.ops_optimized.op_conv_optimized import Conv
 
+register_fast_kernel(Conv, rtol=1e-4, atol=1e-5)
+
 optimized_operators = [Conv]
 
-__all__ = ["Conv", "optimized_operators"]
+__all__ = [
+    "Conv",
+    "FastKernel",
+    "fast_kernels",
+    "optimized_operators",
+    "register_fast_kernel",
+    "verified_kernel",
+]
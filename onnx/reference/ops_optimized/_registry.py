@@ -0,0 +1,154 @@
+# Copyright (c) ONNX Project Contributors
+#
+# SPDX-License-Identifier: Apache-2.0
+"""Registry of the fast kernels the ReferenceEvaluator may use instead of
+the reference implementations.
+
+Every fast kernel declares the tolerance it guarantees against the
+reference implementation. The evaluator selects the registered kernels
+in mode ``"fast"`` and runs both implementations and compares their
+outputs in mode ``"verify"``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import Any
+
+import numpy as np
+
+from onnx.reference.op_run import OpRun
+
+
+@dataclasses.dataclass(frozen=True)
+class FastKernel:
+    """A fast implementation of an operator.
+
+    Attributes:
+        op_class: class implementing the operator, it must inherit from
+            :class:`OpRun <onnx.reference.op_run.OpRun>`, its name is the
+            operator type and its attribute `op_domain` the domain
+        rtol: relative tolerance of the outputs against the reference
+            implementation
+        atol: absolute tolerance of the outputs against the reference
+            implementation
+    """
+
+    op_class: type[OpRun]
+    rtol: float = 1e-5
+    atol: float = 1e-6
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.op_class.op_domain, self.op_class.__name__
+
+    def check(self, expected: Any, got: Any, name: str) -> None:
+        """Raises an exception if `got` does not match `expected` within the
+        tolerance of this kernel.
+        """
+        if isinstance(expected, (list, tuple)):
+            if not isinstance(got, (list, tuple)) or len(expected) != len(got):
+                raise RuntimeError(
+                    f"Fast kernel {self.op_class.__name__!r} returns {type(got)} "
+                    f"for {name!r} but the reference implementation returns "
+                    f"{type(expected)} of length {len(expected)}."
+                )
+            for i, (e, g) in enumerate(zip(expected, got, strict=True)):
+                self.check(e, g, f"{name}[{i}]")
+            return
+        if not isinstance(expected, np.ndarray):
+            if expected != got:
+                raise RuntimeError(
+                    f"Fast kernel {self.op_class.__name__!r} returns {got!r} "
+                    f"for {name!r} but the reference implementation returns "
+                    f"{expected!r}."
+                )
+            return
+        got = np.asarray(got)
+        if expected.dtype != got.dtype or expected.shape != got.shape:
+            raise RuntimeError(
+                f"Fast kernel {self.op_class.__name__!r} returns "
+                f"{got.dtype}:{got.shape} for {name!r} but the reference "
+                f"implementation returns {expected.dtype}:{expected.shape}."
+            )
+        if np.issubdtype(expected.dtype, np.inexact):
+            equal = np.allclose(
+                got, expected, rtol=self.rtol, atol=self.atol, equal_nan=True
+            )
+        else:
+            equal = np.array_equal(got, expected)
+        if not equal:
+            diff = np.abs(got.astype(np.float64) - expected.astype(np.float64))
+            raise RuntimeError(
+                f"Fast kernel {self.op_class.__name__!r} does not match the "
+                f"reference implementation for {name!r}, the maximum absolute "
+                f"difference is {np.nanmax(diff)} (rtol={self.rtol}, "
+                f"atol={self.atol})."
+            )
+
+
+class _VerifiedOpRun:
+    """Runs a fast kernel and the reference implementation and checks
+    they produce the same outputs.
+
+    It is used as the first base class of a class deriving from the fast
+    kernel, see :func:`verified_kernel`.
+    """
+
+    fast_kernel: FastKernel
+    reference_class: type[OpRun]
+
+    def __init__(self, onnx_node, run_params, *args, **kwargs):
+        super().__init__(onnx_node, run_params, *args, **kwargs)
+        self.reference_ = self.reference_class(onnx_node, run_params)
+
+    def run(self, *args, **kwargs):
+        got = super().run(*args, **kwargs)
+        expected = self.reference_.run(*args, **kwargs)
+        names = self.onnx_node.output
+        for i, (e, g) in enumerate(zip(expected, got, strict=True)):
+            name = names[i] if i < len(names) else str(i)
+            self.fast_kernel.check(e, g, name)
+        return got
+
+
+_fast_kernels: dict[tuple[str, str], FastKernel] = {}
+
+
+def register_fast_kernel(
+    op_class: type[OpRun], rtol: float = 1e-5, atol: float = 1e-6
+) -> type[OpRun]:
+    """Registers a fast implementation of an operator.
+
+    Args:
+        op_class: class implementing the operator
+        rtol: relative tolerance guaranteed against the reference
+            implementation
+        atol: absolute tolerance guaranteed against the reference
+            implementation
+
+    Returns:
+        `op_class` so that the function can be used as a decorator
+    """
+    if not issubclass(op_class, OpRun):
+        raise TypeError(f"Class {op_class} must inherit from OpRun.")
+    kernel = FastKernel(op_class, rtol=rtol, atol=atol)
+    _fast_kernels[kernel.key] = kernel
+    return op_class
+
+
+def fast_kernels() -> dict[tuple[str, str], FastKernel]:
+    """Returns the registered fast kernels indexed by `(domain, op_type)`."""
+    return _fast_kernels.copy()
+
+
+def verified_kernel(kernel: FastKernel, reference_class: type[OpRun]) -> type[OpRun]:
+    """Returns a class running `kernel` and checking its outputs against
+    `reference_class` every time the operator is run.
+    """
+    cls = kernel.op_class
+    return type(
+        cls.__name__,
+        (_VerifiedOpRun, cls),
+        {"fast_kernel": kernel, "reference_class": reference_class},
+    )
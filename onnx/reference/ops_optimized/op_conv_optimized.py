@@ -3,6 +3,8 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import functools
+
 import numpy as np
 
 from onnx.reference.op_run import OpRun
@@ -18,38 +20,69 @@ def _make_ind(dim, shape):
     return m
 
 
-def im2col_fast(X, kernel_shape, pads, strides):
-    n_dims = len(kernel_shape)
-    m, n_C = X.shape[:2]
+@functools.lru_cache
+def _im2col_indices(spatial_shape, kernel_shape, dilations, pads, strides):
+    """Returns the indices gathering the columns of im2col in the flattened
+    spatial dimensions of the padded input and the output spatial shape.
 
-    kernel_size = np.prod(kernel_shape)
+    The index array has shape `(kernel_size, output_size)` and is shared by
+    all the channels and all the batches. The dilations are applied to the
+    kernel offsets so that the kernel never needs to be dilated. The array is
+    cached and must not be modified.
+    """
+    n_dims = len(kernel_shape)
+    padded_shape = []
     shape_out = []
     for i, dim in enumerate(kernel_shape):
-        dx = X.shape[2 + i]
-        shape_out.append((dx + pads[i] + pads[i + n_dims] - dim) // strides[i] + 1)
+        dx = spatial_shape[i] + pads[i] + pads[i + n_dims]
+        padded_shape.append(dx)
+        shape_out.append((dx - (dim - 1) * dilations[i] - 1) // strides[i] + 1)
 
     indices = []
-    for i in range(len(shape_out)):
-        kind = _make_ind(i, kernel_shape)
+    for i in range(n_dims):
+        kind = _make_ind(i, kernel_shape) * dilations[i]
         iind = _make_ind(i, shape_out) * strides[i]
-        index = np.tile(kind.ravel(), n_C).reshape(-1, 1) + iind.reshape(1, -1)
-        indices.append(index)
+        indices.append(kind.reshape(-1, 1) + iind.reshape(1, -1))
+    index = np.ravel_multi_index(tuple(indices), tuple(padded_shape))
+    index.flags.writeable = False
+    return index, tuple(shape_out)
+
 
-    d = np.repeat(np.arange(n_C), kernel_size).reshape(-1, 1)
+def _im2col(X, kernel_shape, dilations, pads, strides):
+    """Returns the columns of `X` with shape
+    `(N, C, kernel_size, output_size)` and the output spatial shape.
+    """
+    n_dims = len(kernel_shape)
+    index, shape_out = _im2col_indices(
+        tuple(X.shape[2:]),
+        tuple(kernel_shape),
+        tuple(dilations),
+        tuple(pads),
+        tuple(strides),
+    )
+    if any(pads):
+        padding = [(pads[i], pads[i + n_dims]) for i in range(n_dims)]
+        X = np.pad(X, ((0, 0), (0, 0), *padding), mode="constant")
+    return np.take(X.reshape((*X.shape[:2], -1)), index, axis=2), shape_out
 
-    nc = [(0, 0)] * 2
-    padding = [(pads[i], pads[i + n_dims]) for i in range(n_dims)]
-    X_padded = np.pad(X, tuple(nc) + tuple(padding), mode="constant")
 
-    getitem = (slice(0, m), d, *indices)
-    cols = X_padded[getitem]
-    conc_cols = np.concatenate(cols, axis=-1)
-    return conc_cols, tuple(shape_out)
+def im2col_fast(X, kernel_shape, pads, strides):
+    cols, shape_out = _im2col(X, kernel_shape, [1] * len(kernel_shape), pads, strides)
+    m, n_C, kernel_size, _ = cols.shape
+    conc_cols = cols.reshape((m, n_C * kernel_size, -1)).transpose((1, 0, 2))
+    return conc_cols.reshape((n_C * kernel_size, -1)), shape_out
 
 
 def _conv_implementation_im2col(
     X, W, B, auto_pad, dilations, group, kernel_shape, pads, strides
 ):
+    """Computes a convolution with im2col.
+
+    The columns of all the batches and all the groups are gathered at once
+    and multiplied with the weights by a single batched matrix
+    multiplication, `(group, M / group, C / group * kernel_size)` by
+    `(N, group, C / group * kernel_size, output_size)`.
+    """
     if dilations is None:
         dilations = [1 for s in X.shape[2:]]
     if kernel_shape is None:
@@ -58,6 +91,7 @@ def _conv_implementation_im2col(
         pads = [0 for s in X.shape[2:]] * 2
     if strides is None:
         strides = [1 for s in X.shape[2:]]
+    group = group or 1
     kernel_shape = tuple(kernel_shape)
 
     if X.shape[1] != W.shape[1] * group or W.shape[0] % group != 0:
@@ -65,80 +99,15 @@ def _conv_implementation_im2col(
             f"Shape inconsistencies, X.shape={X.shape}, W.shape={W.shape}, group={group}, "
             f"W should be {(W.shape[0], X.shape[1] // group, np.prod(W.shape[1:]) // X.shape[1] * group)}."
         )
-    if group > 1:
-        res = []
-        td = 0
-        mg = W.shape[0] // group
-        dw = W.shape[1]
-
-        for b in range(X.shape[0]):
-            for g in range(group):
-                gx = X[b : b + 1, g * dw : (g + 1) * dw]
-                gw = W[g * mg : (g + 1) * mg]
-                try:
-                    cv = _conv_implementation_im2col(
-                        gx,
-                        gw,
-                        None,
-                        auto_pad,
-                        dilations,
-                        1,
-                        kernel_shape,
-                        pads,
-                        strides,
-                    )
-                except (ValueError, RuntimeError) as e:
-                    raise ValueError(
-                        f"Shape inconsistencies, X.shape={X.shape}, W.shape={W.shape}, group={g}/{group}, "
-                        f"gx.shape={gx.shape}, gw.shape={gw.shape}, auto_pad={auto_pad}, "
-                        f"dilations={dilations}, kernel_shape={kernel_shape}, pads={pads}, "
-                        f"strides={strides}."
-                    ) from e
-                if b == 0:
-                    td += cv.shape[1]
-                res.append((b, cv))
-
-        new_shape = [X.shape[0], *list(res[0][1].shape[1:])]
-        new_shape[1] = td
-        final = np.zeros(tuple(new_shape), dtype=res[0][1].dtype)
-        p = 0
-        for b, cv in res:
-            final[b : b + 1, p : p + cv.shape[1]] = cv
-            p += cv.shape[1]
-            if p >= final.shape[1]:
-                p = 0
-        if B is not None:
-            new_shape = [1 for s in final.shape]
-            new_shape[1] = B.shape[0]
-            b = B.reshape(tuple(new_shape))
-            final += b
-        return final
-
-    if dilations[0] != 1 or min(dilations) != max(dilations):
-        # Let's compute the dilated kernel.
-        nd = len(dilations)
-        new_kernel_shape = []
-        new_shape = list(W.shape[:-nd])
-        for i, d in enumerate(dilations):
-            di = len(W.shape) - nd + i
-            new_shape.append(W.shape[di] + (W.shape[di] - 1) * (d - 1))
-            new_kernel_shape.append(kernel_shape[i] + (kernel_shape[i] - 1) * (d - 1))
-        new_w = np.zeros(tuple(new_shape), dtype=W.dtype)
-        indices = [slice(0, new_w.shape[0]), slice(0, new_w.shape[1])]
-        for i, d in enumerate(dilations):
-            di = len(W.shape) - nd + i
-            indices.append(slice(0, new_w.shape[di], d))
-        new_w[tuple(indices)] = W
-        W = new_w
-        kernel_shape = new_kernel_shape
-
-    if auto_pad in {"SAME_LOWER", "SAME_UPPER", "VALID"}:
+
+    if auto_pad in {"SAME_LOWER", "SAME_UPPER"}:
         head = []
         tail = []
         for i in range(len(X.shape) - 2):
-            d = X.shape[i]
+            d = X.shape[i + 2]
             target_size = (d + strides[i] - 1) // strides[i]
-            pad_needed = (target_size - 1) * strides[i] + kernel_shape[i] - d
+            dilated_kernel = (kernel_shape[i] - 1) * dilations[i] + 1
+            pad_needed = max(0, (target_size - 1) * strides[i] + dilated_kernel - d)
             if auto_pad == "SAME_LOWER":
                 pad_head = (pad_needed + 1) // 2
             else:
@@ -147,13 +116,16 @@ def _conv_implementation_im2col(
             head.append(pad_head)
             tail.append(pad_tail)
         pads = head + tail
+    elif auto_pad == "VALID":
+        pads = [0 for s in X.shape[2:]] * 2
 
-    c2, out_shape = im2col_fast(X, kernel_shape, pads, strides)
-    w_reshaped = W.reshape((-1, c2.shape[0]))
-    mul = w_reshaped @ c2
-    mul = mul.reshape((W.shape[0], X.shape[0], *out_shape))
-    perm = (1, 0, *tuple(np.arange(len(X.shape) - 2) + 2))
-    mul = mul.transpose(perm)
+    cols, out_shape = _im2col(X, kernel_shape, dilations, pads, strides)
+    n = cols.shape[0]
+    m = W.shape[0]
+    # (N, group, C / group * kernel_size, output_size)
+    cols = cols.reshape((n, group, -1, cols.shape[-1]))
+    w_reshaped = W.reshape((group, m // group, cols.shape[2]))
+    mul = (w_reshaped @ cols).reshape((n, m, *out_shape))
 
     if B is not None:
         if B.size == 1:
@@ -19,7 +19,7 @@ from onnx.onnx_pb import (
     TypeProto,
 )
 from onnx.reference import op_run
-from onnx.reference.ops_optimized import optimized_operators
+from onnx.reference.ops_optimized import fast_kernels, verified_kernel
 
 
 class ReferenceEvaluator:
@@ -50,9 +50,17 @@ class ReferenceEvaluator:
             case for operator Conv. The naive version is ten times
             slower than the optimized one using a decomposition into
             *Conv = im2col + Gemm*. If True, all optimized kernels are
-            added in `new_ops` and are used instead of the inner
-            implementation if list *new_ops* does not already contain
-            one.
+            used instead of the inner implementation if list *new_ops*
+            does not already contain one. It is ignored if *mode* is
+            specified.
+        mode: selects the tier of kernels, `"reference"` only uses the
+            inner implementations, `"fast"` uses the fast kernels
+            registered with :func:`register_fast_kernel
+            <onnx.reference.ops_optimized.register_fast_kernel>` when
+            one exists, `"verify"` runs both and raises an exception if
+            the outputs differ by more than the tolerance the fast
+            kernel declares. If None, it is `"fast"` if *optimized* is
+            True and `"reference"` otherwise.
 
     The class maps every node to its associated implementation.
     When a subgraph of a function is met,
@@ -200,15 +208,16 @@ class ReferenceEvaluator:
         verbose: int = 0,
         new_ops: list[type[op_run.OpRun]] | None = None,
         optimized: bool = True,
+        mode: str | None = None,
     ) -> None:
-        if optimized:
-            if new_ops is None:
-                new_ops = optimized_operators.copy()
-            else:
-                set_new_ops = set(new_ops)
-                for op in optimized_operators:
-                    if op not in set_new_ops:
-                        new_ops.append(op)
+        if mode is None:
+            mode = "fast" if optimized else "reference"
+        if mode not in {"reference", "fast", "verify"}:
+            raise ValueError(
+                f"mode must be 'reference', 'fast' or 'verify' not {mode!r}."
+            )
+        self.mode_ = mode
+        self.fast_kernels_ = fast_kernels() if mode != "reference" else {}
         self.output_types_ = None
         self.input_types_ = None
 
@@ -280,7 +289,10 @@ class ReferenceEvaluator:
             for f in functions:
                 if isinstance(f, FunctionProto):
                     self.functions_[f.domain, f.name] = self.__class__(
-                        f, verbose=verbose, functions=list(self.functions_.values())
+                        f,
+                        verbose=verbose,
+                        functions=list(self.functions_.values()),
+                        mode=mode,
                     )
                 elif isinstance(f, ReferenceEvaluator):
                     onx = f.proto_
@@ -407,6 +419,7 @@ class ReferenceEvaluator:
             "opsets": self.opsets,
             "verbose": self.verbose,
             "new_ops": self.new_ops_,
+            "mode": self.mode_,
             "existing_functions": self.functions_.copy(),
             "evaluator_cls": self.__class__,
         }
@@ -450,10 +463,27 @@ class ReferenceEvaluator:
                 ) from e
             self.rt_nodes_.append(inst)
 
-    def _load_impl(  # noqa: PLR0911
+    def _load_impl(self, node: NodeProto, input_types: TypeProto | None = None) -> Any:
+        """Loads the implementation for a specified runtime.
+
+        A fast kernel is used if one is registered for the node and
+        *new_ops* does not overwrite it, wrapped in a class comparing its
+        outputs to the reference implementation in mode `"verify"`.
+        """
+        key = node.domain, node.op_type
+        if key not in self.new_ops_ and key in self.fast_kernels_:
+            kernel = self.fast_kernels_[key]
+            if self.mode_ == "verify":
+                return verified_kernel(
+                    kernel, self._load_reference_impl(node, input_types)
+                )
+            return kernel.op_class
+        return self._load_reference_impl(node, input_types)
+
+    def _load_reference_impl(  # noqa: PLR0911
         self, node: NodeProto, input_types: TypeProto | None = None
     ) -> Any:
-        """Loads the implementation for a specified runtime."""
+        """Loads the implementation ignoring the fast kernels."""
         if node.domain not in self.opsets:
             raise RuntimeError(
                 f"Domain {node.domain!r} (node type: {node.op_type!r}) "
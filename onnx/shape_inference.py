@@ -14,16 +14,18 @@ from typing import TYPE_CHECKING
 
 import onnx
 import onnx.onnx_cpp2py_export.shape_inference as C  # noqa: N812
+from onnx._batch import ModelReport, run_batch
 from onnx.onnx_pb import (
     IR_VERSION,
     AttributeProto,
     FunctionProto,
+    GraphProto,
     ModelProto,
     TypeProto,
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterable, Sequence
 
 GraphInferencer = C.GraphInferencer
 InferenceContext = C.InferenceContext
@@ -34,6 +36,8 @@ def infer_shapes(
     check_type: bool = False,
     strict_mode: bool = False,
     data_prop: bool = False,
+    *,
+    inplace: bool = False,
 ) -> ModelProto:
     """Apply shape inference to the provided ModelProto.
 
@@ -49,12 +53,28 @@ def infer_shapes(
         strict_mode: Stricter shape inference, it will throw errors if any;
             Otherwise, simply stop if any error.
         data_prop: Enables data propagation for limited operators to perform shape computation.
+        inplace: If True, `model` (which must be a ModelProto) is updated in
+            place and returned. Only the inferred types (inputs, outputs
+            and value_info of the graph and its subgraphs) are sent back from C++,
+            so the model is not parsed again, which saves a full copy of the
+            model (initializers included) in time and memory.
 
     Returns:
         (ModelProto) model with inferred shape information
     """
+    if inplace and not isinstance(model, ModelProto):
+        raise TypeError(
+            f"infer_shapes with inplace=True only accepts ModelProto, incorrect type: {type(model)}"
+        )
     if isinstance(model, (ModelProto, bytes)):
         model_str = model if isinstance(model, bytes) else model.SerializeToString()
+        if inplace:
+            delta = GraphProto.FromString(
+                C.infer_shapes_delta(model_str, check_type, strict_mode, data_prop)
+            )
+            del model_str
+            _merge_inferred_types(model.graph, delta)  # type: ignore[union-attr]
+            return model  # type: ignore[return-value]
         inferred_model_str = C.infer_shapes(
             model_str, check_type, strict_mode, data_prop
         )
@@ -70,6 +90,80 @@ def infer_shapes(
     )
 
 
+def infer_shapes_incremental(
+    model: ModelProto,
+    changed_values: Iterable[str],
+    check_type: bool = False,
+    strict_mode: bool = False,
+    data_prop: bool = False,
+) -> ModelProto:
+    """Updates the shape information of a model after local edits of its graph.
+
+    The model is expected to hold the result of a previous shape inference
+    in ``graph.value_info``. Only the nodes affected by the edit are
+    re-inferred: the nodes reading or producing one of `changed_values`
+    and the nodes producing a value without value_info. The change is
+    propagated to the consumers of a re-inferred value only if its type
+    differs from the one previously stored in value_info. The other nodes
+    keep their value_info.
+
+    Arguments:
+        model: ModelProto, updated in place as with ``infer_shapes(..., inplace=True)``.
+        changed_values: names of the values whose definition changed,
+            typically the outputs of the nodes added or rewritten, and the
+            graph inputs whose type changed.
+        check_type: Checks the type-equality for input and output.
+        strict_mode: Stricter shape inference, it will throw errors if any;
+            Otherwise, simply stop if any error.
+        data_prop: Enables data propagation for limited operators to perform shape computation.
+
+    Returns:
+        (ModelProto) `model` with updated shape information
+    """
+    if not isinstance(model, ModelProto):
+        raise TypeError(
+            f"infer_shapes_incremental only accepts ModelProto, incorrect type: {type(model)}"
+        )
+    delta = GraphProto.FromString(
+        C.infer_shapes_incremental(
+            model.SerializeToString(),
+            set(changed_values),
+            check_type,
+            strict_mode,
+            data_prop,
+        )
+    )
+    _merge_inferred_types(model.graph, delta)
+    return model
+
+
+def _merge_inferred_types(graph: GraphProto, delta: GraphProto) -> None:
+    """Replaces inputs, outputs and value_info of `graph` and its subgraphs by
+    those in `delta`.
+
+    `delta` is the graph returned by ``C.infer_shapes_delta``: it holds one
+    placeholder node per node of `graph` with only its graph attributes.
+    """
+    del graph.input[:]
+    graph.input.extend(delta.input)
+    del graph.output[:]
+    graph.output.extend(delta.output)
+    del graph.value_info[:]
+    graph.value_info.extend(delta.value_info)
+    for node, delta_node in zip(graph.node, delta.node, strict=True):
+        if not delta_node.attribute:
+            continue
+        attributes = {attr.name: attr for attr in node.attribute}
+        for delta_attr in delta_node.attribute:
+            attr = attributes[delta_attr.name]
+            if delta_attr.HasField("g"):
+                _merge_inferred_types(attr.g, delta_attr.g)
+            for subgraph, delta_subgraph in zip(
+                attr.graphs, delta_attr.graphs, strict=True
+            ):
+                _merge_inferred_types(subgraph, delta_subgraph)
+
+
 def infer_shapes_path(
     model_path: str | os.PathLike,
     output_path: str | os.PathLike = "",
@@ -108,6 +202,50 @@ def infer_shapes_path(
     C.infer_shapes_path(model_path, output_path, check_type, strict_mode, data_prop)
 
 
+def infer_shapes_paths(
+    model_paths: Sequence[str | os.PathLike],
+    output_paths: Sequence[str | os.PathLike] | None = None,
+    check_type: bool = False,
+    strict_mode: bool = False,
+    data_prop: bool = False,
+    *,
+    max_workers: int | None = None,
+    use_processes: bool = False,
+) -> list[ModelReport]:
+    """Run :func:`infer_shapes_path` on many models concurrently.
+
+    Shape inference releases the GIL so a thread pool is used by default.
+    Errors are not raised but recorded in the reports.
+
+    Args:
+        model_paths: Paths of the models.
+        output_paths: Paths the inferred models are written to, one per model.
+            The models are overwritten if None.
+        check_type: See :func:`infer_shapes`.
+        strict_mode: See :func:`infer_shapes`.
+        data_prop: See :func:`infer_shapes`.
+        max_workers: Maximum number of concurrent inferences, the default of
+            the executor if None.
+        use_processes: Use a process pool instead of a thread pool.
+
+    Returns:
+        One :class:`onnx.checker.ModelReport` per model, in the order of `model_paths`.
+    """
+    if output_paths is None:
+        output_paths = [""] * len(model_paths)
+    elif len(output_paths) != len(model_paths):
+        raise ValueError(
+            f"Got {len(output_paths)} output paths for {len(model_paths)} models."
+        )
+    return run_batch(
+        infer_shapes_path,
+        model_paths,
+        [(output, check_type, strict_mode, data_prop) for output in output_paths],
+        max_workers,
+        use_processes,
+    )
+
+
 def infer_node_outputs(
     schema: onnx.defs.OpSchema,
     node: onnx.NodeProto,
@@ -178,4 +316,23 @@ def infer_function_output_types(
     return [to_type_proto(x) for x in result]
 
 
+def function_inference_cache_stats() -> dict[str, int]:
+    """Returns the statistics of the function inference cache.
+
+    Shape inference infers the body of a function once per distinct call
+    signature (input types, constant inputs and attribute values) within a
+    model and reuses the result for the other calls. ``hits`` counts the
+    calls answered from the cache and ``misses`` the function bodies actually
+    inferred, both accumulated since the start of the process or the last
+    call to :func:`reset_function_inference_cache_stats`.
+    """
+    hits, misses = C.get_function_inference_cache_stats()
+    return {"hits": hits, "misses": misses}
+
+
+def reset_function_inference_cache_stats() -> None:
+    """Resets the counters returned by :func:`function_inference_cache_stats`."""
+    C.reset_function_inference_cache_stats()
+
+
 InferenceError = C.InferenceError
@@ -5,7 +5,9 @@
 #include "onnx/shape_inference/implementation.h"
 
 #include <algorithm>
+#include <atomic>
 #include <cassert>
+#include <cstdint>
 #include <fstream>
 #include <list>
 #include <string>
@@ -374,6 +376,233 @@ void BindValuesOnReturn(
   }
 }
 
+std::atomic<uint64_t> function_inference_cache_hits{0};
+std::atomic<uint64_t> function_inference_cache_misses{0};
+
+// Memoizes the output types inferred for function bodies (schema-defined or model-local).
+// Calls sharing the same signature -- callee, actual input types, constant input values,
+// attribute values and requested outputs -- get the same output types, so the body is
+// inferred once per signature. One cache is shared by all the function-body invocations
+// of one graph inference (see the active_functions set, which follows the same path).
+class FunctionInferenceCache {
+ public:
+  // Constant inputs are serialized into the key up to this size. Calls with bigger or
+  // sparse constant inputs are not cached: nested scopes free their constants, so
+  // their addresses cannot identify the values.
+  static constexpr size_t kMaxSerializedDataBytes = 1024;
+
+  // Builds the key identifying the call. Returns false if the call must not be cached.
+  static bool MakeKey(const FunctionProto& callee, InferenceContext& ctx, std::string& key) {
+    AppendPart(key, std::to_string(reinterpret_cast<uintptr_t>(&callee)));
+    const size_t num_inputs = ctx.getNumInputs();
+    AppendPart(key, std::to_string(num_inputs));
+    for (size_t i = 0; i < num_inputs; ++i) {
+      if (!ctx.hasInput(i)) {
+        AppendPart(key, "-");
+        continue;
+      }
+      const TypeProto* type = ctx.getInputType(i);
+      AppendPart(key, type == nullptr ? "?" : type->SerializeAsString());
+      if (const TensorProto* data = ctx.getInputData(i); data != nullptr) {
+        if (data->ByteSizeLong() > kMaxSerializedDataBytes) {
+          return false;
+        }
+        TensorProto unnamed(*data);
+        unnamed.clear_name();
+        AppendPart(key, "=" + unnamed.SerializeAsString());
+      } else if (ctx.getInputSparseData(i) != nullptr) {
+        return false;
+      } else if (ctx.getSymbolicInput(i) != nullptr) {
+        // Partial values propagated by the caller are not part of the key.
+        return false;
+      } else {
+        AppendPart(key, "");
+      }
+    }
+    const size_t num_outputs = ctx.getNumOutputs();
+    AppendPart(key, std::to_string(num_outputs));
+    for (size_t i = 0; i < num_outputs; ++i) {
+      AppendPart(key, ctx.hasOutput(i) ? "+" : "-");
+    }
+    auto append_attribute = [&](const std::string& name) {
+      const AttributeProto* attr = ctx.getAttribute(name);
+      AppendPart(key, attr == nullptr ? "-" : attr->SerializeAsString());
+    };
+    for (const auto& name : callee.attribute()) {
+      append_attribute(name);
+    }
+    for (const auto& default_value : callee.attribute_proto()) {
+      append_attribute(default_value.name());
+    }
+    return true;
+  }
+
+  // Copies the cached output types into ctx. Returns false if the key is unknown.
+  bool Lookup(const std::string& key, InferenceContext& ctx) const {
+    auto it = entries_.find(key);
+    if (it == entries_.end()) {
+      return false;
+    }
+    for (size_t i = 0; i < it->second.size(); ++i) {
+      if (it->second[i].value_case() != TypeProto::VALUE_NOT_SET) {
+        ctx.getOutputType(i)->CopyFrom(it->second[i]);
+      }
+    }
+    return true;
+  }
+
+  // Stores the output types the body inference wrote into ctx.
+  void Insert(std::string key, InferenceContext& ctx) {
+    std::unordered_set<std::string> input_symbols;
+    for (size_t i = 0; i < ctx.getNumInputs(); ++i) {
+      if (ctx.hasInput(i) && ctx.getInputType(i) != nullptr) {
+        CollectSymbols(*ctx.getInputType(i), input_symbols);
+      }
+    }
+    std::vector<TypeProto> output_types(ctx.getNumOutputs());
+    for (size_t i = 0; i < output_types.size(); ++i) {
+      output_types[i] = *ctx.getOutputType(i);
+      // Symbols generated while inferring the body stand for dimensions specific to this
+      // call. They are dropped so that the caller generates fresh ones on every cache hit.
+      ClearUnknownSymbols(output_types[i], input_symbols);
+    }
+    entries_.emplace(std::move(key), std::move(output_types));
+  }
+
+ private:
+  static void AppendPart(std::string& key, const std::string& part) {
+    key += std::to_string(part.size());
+    key += ':';
+    key += part;
+  }
+
+  template <typename Visitor>
+  static void VisitShapes(TypeProto& type, Visitor&& visitor) {
+    switch (type.value_case()) {
+      case TypeProto::kTensorType:
+        if (type.tensor_type().has_shape()) {
+          visitor(*type.mutable_tensor_type()->mutable_shape());
+        }
+        break;
+      case TypeProto::kSparseTensorType:
+        if (type.sparse_tensor_type().has_shape()) {
+          visitor(*type.mutable_sparse_tensor_type()->mutable_shape());
+        }
+        break;
+      case TypeProto::kSequenceType:
+        VisitShapes(*type.mutable_sequence_type()->mutable_elem_type(), visitor);
+        break;
+      case TypeProto::kOptionalType:
+        VisitShapes(*type.mutable_optional_type()->mutable_elem_type(), visitor);
+        break;
+      case TypeProto::kMapType:
+        VisitShapes(*type.mutable_map_type()->mutable_value_type(), visitor);
+        break;
+      default:
+        break;
+    }
+  }
+
+  static void CollectSymbols(const TypeProto& type, std::unordered_set<std::string>& symbols) {
+    TypeProto copy(type);
+    VisitShapes(copy, [&](TensorShapeProto& shape) {
+      for (const auto& dim : shape.dim()) {
+        if (dim.has_dim_param()) {
+          symbols.insert(dim.dim_param());
+        }
+      }
+    });
+  }
+
+  static void ClearUnknownSymbols(TypeProto& type, const std::unordered_set<std::string>& known) {
+    VisitShapes(type, [&](TensorShapeProto& shape) {
+      for (auto& dim : *shape.mutable_dim()) {
+        if (dim.has_dim_param() && known.count(dim.dim_param()) == 0) {
+          dim.clear_dim_param();
+        }
+      }
+    });
+  }
+
+  std::unordered_map<std::string, std::vector<TypeProto>> entries_;
+};
+
+// Returns true if re-inference produced the same type as the one previously inferred, up to the
+// symbols generated for unknown dimensions: a dimension left unknown by inference matches any
+// symbolic dimension of the previous type.
+bool IsSameInferredType(const TypeProto& inferred, const TypeProto& previous) {
+  if (inferred.value_case() != previous.value_case()) {
+    return false;
+  }
+  auto same_tensor_type = [](const auto& inferred_tensor, const auto& previous_tensor) {
+    if (inferred_tensor.elem_type() != previous_tensor.elem_type() ||
+        inferred_tensor.has_shape() != previous_tensor.has_shape()) {
+      return false;
+    }
+    if (!inferred_tensor.has_shape()) {
+      return true;
+    }
+    const auto& inferred_shape = inferred_tensor.shape();
+    const auto& previous_shape = previous_tensor.shape();
+    if (inferred_shape.dim_size() != previous_shape.dim_size()) {
+      return false;
+    }
+    for (int i = 0; i < inferred_shape.dim_size(); ++i) {
+      const auto& inferred_dim = inferred_shape.dim(i);
+      const auto& previous_dim = previous_shape.dim(i);
+      if (inferred_dim.has_dim_value()) {
+        if (!previous_dim.has_dim_value() || previous_dim.dim_value() != inferred_dim.dim_value()) {
+          return false;
+        }
+      } else if (inferred_dim.has_dim_param()) {
+        if (!previous_dim.has_dim_param() || previous_dim.dim_param() != inferred_dim.dim_param()) {
+          return false;
+        }
+      } else if (previous_dim.has_dim_value()) {
+        return false;
+      }
+    }
+    return true;
+  };
+  switch (inferred.value_case()) {
+    case TypeProto::kTensorType:
+      return same_tensor_type(inferred.tensor_type(), previous.tensor_type());
+    case TypeProto::kSparseTensorType:
+      return same_tensor_type(inferred.sparse_tensor_type(), previous.sparse_tensor_type());
+    case TypeProto::kSequenceType:
+      return IsSameInferredType(inferred.sequence_type().elem_type(), previous.sequence_type().elem_type());
+    case TypeProto::kOptionalType:
+      return IsSameInferredType(inferred.optional_type().elem_type(), previous.optional_type().elem_type());
+    case TypeProto::kMapType:
+      return inferred.map_type().key_type() == previous.map_type().key_type() &&
+          IsSameInferredType(inferred.map_type().value_type(), previous.map_type().value_type());
+    default:
+      return inferred.SerializeAsString() == previous.SerializeAsString();
+  }
+}
+
+// Returns true if a node of graph, or of one of its subgraphs, reads one of the given values.
+bool GraphReadsAny(const GraphProto& graph, const std::unordered_set<std::string>& names) {
+  for (const auto& node : graph.node()) {
+    for (const auto& input : node.input()) {
+      if (names.count(input) > 0) {
+        return true;
+      }
+    }
+    for (const auto& attr : node.attribute()) {
+      if (attr.has_g() && GraphReadsAny(attr.g(), names)) {
+        return true;
+      }
+      for (const auto& subgraph : attr.graphs()) {
+        if (GraphReadsAny(subgraph, names)) {
+          return true;
+        }
+      }
+    }
+  }
+  return false;
+}
+
 // ShapeInferenceImplBase drives type-and-shape inference over a GraphProto or FunctionProto.
 // A single instance is used to process one top-level graph, or one function-body invocation
 // (a "callee" scope): ProcessCall()/InferShapeForFunctionNodeInternal() construct a brand-new
@@ -389,6 +618,34 @@ class ShapeInferenceImplBase {
       return;
     }
 
+    if (incremental) {
+      if (pending_types.erase(name) > 0) {
+        // The output of a re-inferred node: replace the previous type in value_info rather than
+        // merging into it, and only mark the value stale (its consumers are then re-inferred) if
+        // the type changed. A graph output keeps its declared type: the new type is merged into it
+        // as in a full inference, a conflict is an inference error.
+        auto value_info = value_info_types.find(name);
+        auto output = output_types.find(name);
+        bool changed =
+            (value_info != value_info_types.end() && !IsSameInferredType(*inferred_type, *value_info->second)) ||
+            (output != output_types.end() && !IsSameInferredType(*inferred_type, *output->second));
+        if (changed) {
+          if (symbol_table) {
+            MaterializeSymbolicShape(inferred_type, *symbol_table);
+          }
+          stale_values.insert(name);
+          if (value_info != value_info_types.end()) {
+            *value_info->second = *inferred_type;
+          }
+          if (output != output_types.end()) {
+            mergeShapesAndTypes(*inferred_type, output->second);
+          }
+        }
+        return;
+      }
+      stale_values.insert(name);
+    }
+
     if (symbol_table) {
       MaterializeSymbolicShape(inferred_type, *symbol_table);
     }
@@ -497,6 +754,18 @@ class ShapeInferenceImplBase {
     }
     auto domain_version = dit->second;
     const auto* const schema = schema_registry->GetSchema(n.op_type(), domain_version, n.domain());
+    if (incremental && !IsAffected(n, schema)) {
+      // The types of the outputs are the ones already stored in value_info.
+      ProcessConstant(n);
+      return;
+    }
+    if (incremental) {
+      for (const auto& output : n.output()) {
+        if (value_info_types.count(output) > 0 || output_types.count(output) > 0) {
+          pending_types.insert(output);
+        }
+      }
+    }
     InferenceContextImpl ctx(
         n,
         value_types_by_name,
@@ -601,12 +870,18 @@ class ShapeInferenceImplBase {
     }
     for (auto& vi : *graph.mutable_value_info()) {
       UpdateType(vi);
+      if (incremental && vi.has_type()) {
+        value_info_types[vi.name()] = vi.mutable_type();
+      }
     }
     for (auto& vi : *graph.mutable_input()) {
       UpdateType(vi);
     }
     for (auto& vi : *graph.mutable_output()) {
       UpdateType(vi);
+      if (incremental && vi.has_type()) {
+        output_types[vi.name()] = vi.mutable_type();
+      }
     }
     for (const auto& tp : graph.initializer()) {
       TypeProto initializer_type;
@@ -632,7 +907,78 @@ class ShapeInferenceImplBase {
     }
     for (auto& n : *graph.mutable_node()) {
       Process(n);
+      if (incremental) {
+        DropUninferredTypes();
+      }
+    }
+    if (incremental) {
+      RemoveEmptyValueInfos(graph);
+    }
+  }
+
+  // Restricts the inference of the graph to the nodes affected by changed_values: the nodes that
+  // read a stale value (changed_values initially, then the outputs whose re-inferred type differs
+  // from the one in value_info), that produce one of changed_values, or that produce a value
+  // without type. Other nodes keep the types already stored in value_info.
+  void EnableIncrementalInference(const std::unordered_set<std::string>& changed_values) {
+    incremental = true;
+    stale_values = changed_values;
+  }
+
+  bool IsAffected(const NodeProto& n, const OpSchema* schema) const {
+    // Data propagation is not recorded in the model, values are recomputed by the (cheap) nodes
+    // defining a propagation function so that the nodes re-inferred downstream can use them.
+    if (options.enable_data_propagation && schema && schema->has_data_propagation_function()) {
+      return true;
+    }
+    for (const auto& output : n.output()) {
+      if (!output.empty() && (stale_values.count(output) > 0 || value_types_by_name.count(output) == 0)) {
+        return true;
+      }
+    }
+    for (const auto& input : n.input()) {
+      if (stale_values.count(input) > 0) {
+        return true;
+      }
+    }
+    for (const auto& attr : n.attribute()) {
+      if (attr.has_g() && GraphReadsAny(attr.g(), stale_values)) {
+        return true;
+      }
+      for (const auto& subgraph : attr.graphs()) {
+        if (GraphReadsAny(subgraph, stale_values)) {
+          return true;
+        }
+      }
+    }
+    return false;
+  }
+
+  // Clears the previous types of the outputs of the last re-inferred node that inference did not
+  // produce: they are no longer known, except the declared types of the graph outputs.
+  void DropUninferredTypes() {
+    for (const auto& name : pending_types) {
+      auto value_info = value_info_types.find(name);
+      if (value_info != value_info_types.end()) {
+        value_info->second->Clear();
+      }
+      if (output_types.count(name) == 0) {
+        value_types_by_name.erase(name);
+      }
+      stale_values.insert(name);
     }
+    pending_types.clear();
+  }
+
+  static void RemoveEmptyValueInfos(GraphProto& graph) {
+    auto* value_infos = graph.mutable_value_info();
+    int kept = 0;
+    for (int i = 0; i < value_infos->size(); ++i) {
+      if (value_infos->Get(i).type().value_case() != TypeProto::VALUE_NOT_SET) {
+        value_infos->SwapElements(i, kept++);
+      }
+    }
+    value_infos->DeleteSubrange(kept, value_infos->size() - kept);
   }
 
   void Process(const NodeProto& n, internal::AttributeBinder& attribute_binder) {
@@ -733,7 +1079,8 @@ class ShapeInferenceImplBase {
       const ISchemaRegistry* schema_registry_in = OpSchemaRegistry::Instance(),
       DataValueMap* generated_shape_data_by_name_in = nullptr,
       const int64_t ir_version_in = IR_VERSION,
-      std::shared_ptr<std::unordered_set<const FunctionProto*>> active_functions_in = nullptr)
+      std::shared_ptr<std::unordered_set<const FunctionProto*>> active_functions_in = nullptr,
+      std::shared_ptr<FunctionInferenceCache> function_cache_in = nullptr)
       : inferred_types(graph),
         value_types_by_name(outer_scope_value_types_by_name_in),
         opset_imports(opset_imports_in),
@@ -746,6 +1093,7 @@ class ShapeInferenceImplBase {
         active_functions(
             active_functions_in ? std::move(active_functions_in)
                                 : std::make_shared<std::unordered_set<const FunctionProto*>>()),
+        function_cache(function_cache_in ? std::move(function_cache_in) : std::make_shared<FunctionInferenceCache>()),
         graph_inference_context{
             value_types_by_name,
             opset_imports,
@@ -791,6 +1139,7 @@ class ShapeInferenceImplBase {
   DataValueMap* generated_shape_data_by_name;
   int64_t ir_version;
   std::shared_ptr<std::unordered_set<const FunctionProto*>> active_functions;
+  std::shared_ptr<FunctionInferenceCache> function_cache;
   GraphInferenceContext graph_inference_context;
 
   std::unordered_map<std::string, TypeProto*> undefined_value_types_by_name;
@@ -800,6 +1149,15 @@ class ShapeInferenceImplBase {
 
   bool has_unsupported_op = false;
 
+  // State of incremental inference, see EnableIncrementalInference.
+  bool incremental = false;
+  std::unordered_set<std::string> stale_values;
+  // Types of the graph value_info and of the graph outputs, by name.
+  std::unordered_map<std::string, TypeProto*> value_info_types;
+  std::unordered_map<std::string, TypeProto*> output_types;
+  // Outputs of the node being re-inferred which already have a type, updated by UpdateType.
+  std::unordered_set<std::string> pending_types;
+
   std::vector<std::string> inference_errors;
 
   std::list<TypeProto> initializer_type_list;
@@ -893,6 +1251,38 @@ void InferShapes(
       m.ir_version());
 }
 
+void InferShapesIncremental(
+    ModelProto& m,
+    const std::unordered_set<std::string>& changed_values,
+    const ISchemaRegistry* schema_registry,
+    const ShapeInferenceOptions& options,
+    DataValueMap* generated_shape_data_by_name) {
+  auto opset_imports = GetOpsetImportsFromProto(m);
+  SymbolTableImpl symbol_table;
+  ModelLocalFunctionsMap model_local_functions_by_id;
+  for (const auto& function_proto : m.functions()) {
+    model_local_functions_by_id.insert({GetFunctionIdentifier(function_proto), &function_proto});
+  }
+  checker::check_function_call_cycles(m);
+  DataValueMap empty;
+  if (generated_shape_data_by_name == nullptr) {
+    generated_shape_data_by_name = &empty;
+  }
+  ShapeInferenceImplBase base(
+      m.mutable_graph(),
+      std::unordered_map<std::string, TypeProto*>(0),
+      opset_imports,
+      options,
+      &symbol_table,
+      model_local_functions_by_id,
+      schema_registry,
+      generated_shape_data_by_name,
+      m.ir_version());
+  base.EnableIncrementalInference(changed_values);
+  base.Process(*m.mutable_graph());
+  base.FinalizeShapeInference();
+}
+
 void InferShapes(
     const std::string& model_path,
     const std::string& save_path,
@@ -924,7 +1314,8 @@ static void InferShapeForFunctionNodeInternal(
     const std::unordered_map<std::string, const FunctionProto*>& model_local_functions_map,
     SymbolTable* symbol_table,
     DataValueMap* generated_shape_data_by_name,
-    std::shared_ptr<std::unordered_set<const FunctionProto*>> active_functions) {
+    std::shared_ptr<std::unordered_set<const FunctionProto*>> active_functions,
+    std::shared_ptr<FunctionInferenceCache> function_cache = nullptr) {
   ShapeInferenceImplBase base(
       nullptr, // no graph
       {}, // outer_scope_value_types_by_name
@@ -935,7 +1326,8 @@ static void InferShapeForFunctionNodeInternal(
       schema_registry,
       generated_shape_data_by_name,
       IR_VERSION,
-      std::move(active_functions));
+      std::move(active_functions),
+      std::move(function_cache));
   base.Process(func_proto, ctx);
   base.FinalizeShapeInference();
 }
@@ -953,6 +1345,15 @@ void ShapeInferenceImplBase::ProcessCall(const NodeProto& caller, const Function
   if (generated_shape_data_by_name != nullptr) {
     BindValuesOnCall(*generated_shape_data_by_name, caller, callee_value_map, callee);
   }
+  std::string cache_key;
+  const bool cacheable = callee_value_map.empty() && FunctionInferenceCache::MakeKey(callee, ctx, cache_key);
+  if (cacheable) {
+    if (function_cache->Lookup(cache_key, ctx)) {
+      ++function_inference_cache_hits;
+      return;
+    }
+    ++function_inference_cache_misses;
+  }
   InferShapeForFunctionNodeInternal(
       callee,
       GetOpsetImportsFromProto(callee),
@@ -962,10 +1363,28 @@ void ShapeInferenceImplBase::ProcessCall(const NodeProto& caller, const Function
       model_local_functions_map,
       symbol_table,
       &callee_value_map,
-      active_functions);
+      active_functions,
+      function_cache);
   if (generated_shape_data_by_name != nullptr) {
     BindValuesOnReturn(callee_value_map, callee, *generated_shape_data_by_name, caller);
   }
+  // Outputs with propagated values cannot be replayed from the cache.
+  const bool propagated_output_values = std::any_of(
+      callee.output().begin(), callee.output().end(), [&](const std::string& name) {
+        return callee_value_map.count(name) > 0;
+      });
+  if (cacheable && !propagated_output_values) {
+    function_cache->Insert(std::move(cache_key), ctx);
+  }
+}
+
+FunctionInferenceCacheStats GetFunctionInferenceCacheStats() {
+  return {function_inference_cache_hits.load(), function_inference_cache_misses.load()};
+}
+
+void ResetFunctionInferenceCacheStats() {
+  function_inference_cache_hits = 0;
+  function_inference_cache_misses = 0;
 }
 
 void InferShapeForFunctionNode(
@@ -4,6 +4,7 @@
 
 #pragma once
 
+#include <cstdint>
 #include <memory>
 #include <string>
 #include <unordered_map>
@@ -512,6 +513,21 @@ ONNX_API void InferShapes(
     const ShapeInferenceOptions& options = ShapeInferenceOptions(),
     DataValueMap* generated_shape_data_by_name = nullptr);
 
+///
+/// Updates the types inferred for the main graph of m after local edits of the graph, without
+/// re-inferring it entirely. changed_values names the values whose definition changed, typically
+/// the outputs of the nodes added or rewritten. The nodes reading or producing these values are
+/// re-inferred, as well as the nodes producing values without value_info; the change is then
+/// propagated to their consumers as long as the re-inferred types differ from the ones stored
+/// in value_info. Other nodes are not re-inferred and keep their value_info.
+///
+ONNX_API void InferShapesIncremental(
+    ModelProto& m,
+    const std::unordered_set<std::string>& changed_values,
+    const ISchemaRegistry* schema_registry = OpSchemaRegistry::Instance(),
+    const ShapeInferenceOptions& options = ShapeInferenceOptions(),
+    DataValueMap* generated_shape_data_by_name = nullptr);
+
 ONNX_API void InferShapes(
     const std::string& model_path,
     const std::string& save_path = "",
@@ -565,6 +581,17 @@ std::vector<TypeProto> InferFunctionOutputTypes(
     const std::vector<TypeProto>& input_types,
     const std::vector<AttributeProto>& attributes);
 
+// Number of function-body inferences answered from (hits) or added to (misses) the
+// per-inference cache of function call signatures, accumulated over the process.
+struct FunctionInferenceCacheStats {
+  uint64_t hits;
+  uint64_t misses;
+};
+
+ONNX_API FunctionInferenceCacheStats GetFunctionInferenceCacheStats();
+
+ONNX_API void ResetFunctionInferenceCacheStats();
+
 std::string GetErrorWithNodeInfo(const NodeProto& n, const std::runtime_error& err);
 
 void TraverseGraphsToAddExistingSymbols(const GraphProto& g, SymbolTable& symbol_table);
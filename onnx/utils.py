@@ -9,12 +9,14 @@ from collections import deque
 from typing import TYPE_CHECKING
 
 import onnx.checker
+import onnx.external_data_helper
 import onnx.helper
 import onnx.shape_inference
 
 if TYPE_CHECKING:
     from onnx.onnx_pb import (
         FunctionProto,
+        GraphProto,
         ModelProto,
         NodeProto,
         TensorProto,
@@ -23,6 +25,13 @@ if TYPE_CHECKING:
 
 
 class Extractor:
+    """Extracts sub-models from a model.
+
+    The name indices are built once in the constructor, so several sub-models
+    can be extracted from the same instance at a cost proportional to the size
+    of each sub-model.
+    """
+
     def __init__(self, model: ModelProto) -> None:
         self.model = model
         self.graph = self.model.graph
@@ -36,6 +45,13 @@ class Extractor:
         self.value_infos.update(self._build_name2obj_dict(self.graph.input))
         self.value_infos.update(self._build_name2obj_dict(self.graph.output))
         self.outmap: dict[str, int] = self._build_output_dict(self.graph)
+        self.functions: dict[tuple[str, str], FunctionProto] = {
+            (function.name, function.domain): function
+            for function in self.model.functions
+        }
+        # Positions used to keep the extracted tensors in the order of the model.
+        self._initializer_index = {name: i for i, name in enumerate(self.initializers)}
+        self._value_info_index = {name: i for i, name in enumerate(self.value_infos)}
 
     @staticmethod
     def _build_name2obj_dict(objs) -> dict:
@@ -114,16 +130,16 @@ class Extractor:
         # a function contains nodes, some of which may in turn refer a function.
         # we need to find functions referred by graph nodes and
         # by nodes used to define functions.
-        function_map: dict[tuple[str, str], FunctionProto] = {}
-        for function in self.model.functions:
-            function_map[(function.name, function.domain)] = function
         referred_local_functions: list[FunctionProto] = []
+        referred: set[tuple[str, str]] = set()
         queue = deque(nodes)
         while queue:
             node = queue.popleft()
             # check if the node is a function op
-            if (node.op_type, node.domain) in function_map:
-                function = function_map.pop((node.op_type, node.domain))
+            key = (node.op_type, node.domain)
+            if key in self.functions and key not in referred:
+                referred.add(key)
+                function = self.functions[key]
                 referred_local_functions.append(function)
                 queue.extend(function.node)
         # needs to be topologically sorted
@@ -138,10 +154,18 @@ class Extractor:
             all_tensors_names.update(node.input)
             all_tensors_names.update(node.output)
         initializer = [
-            self.initializers[t] for t in self.initializers if t in all_tensors_names
+            self.initializers[t]
+            for t in sorted(
+                all_tensors_names.intersection(self._initializer_index),
+                key=self._initializer_index.__getitem__,
+            )
         ]
         value_info = [
-            self.value_infos[t] for t in self.value_infos if t in all_tensors_names
+            self.value_infos[t]
+            for t in sorted(
+                all_tensors_names.intersection(self._value_info_index),
+                key=self._value_info_index.__getitem__,
+            )
         ]
         len_sparse_initializer = len(self.graph.sparse_initializer)
         if len_sparse_initializer != 0:
@@ -191,6 +215,19 @@ class Extractor:
         )
 
 
+def _has_complete_value_info(graph: GraphProto) -> bool:
+    """Returns True if every value produced by a node of the main graph has a type."""
+    typed = {
+        vi.name
+        for values in (graph.input, graph.output, graph.value_info)
+        for vi in values
+        if vi.HasField("type")
+    }
+    return all(
+        name in typed for node in graph.node for name in node.output if name != ""
+    )
+
+
 def extract_model(
     input_path: str | os.PathLike,
     output_path: str | os.PathLike,
@@ -207,7 +244,10 @@ def extract_model(
     which is defined by the input and output tensors, should not *cut through* the
     subgraph that is connected to the *main graph* as attributes of these operators.
 
-    Note: When the extracted model size is larger than 2GB, the extra data will be saved in "output_path.data".
+    Note: The external data of the original model is not loaded. The data of the
+    extracted tensors stored as external data is copied to "output_path.data".
+    When the extracted model size is larger than 2GB, its other tensors are saved
+    there as well.
 
     Arguments:
         input_path (str | os.PathLike): The path to original ONNX model.
@@ -216,6 +256,7 @@ def extract_model(
         output_names (list of string): The names of the output tensors that to be extracted.
         check_model (bool): Whether to run model checker on the original model and the extracted model.
         infer_shapes (bool): Whether to infer the shapes of the original model.
+            Shape inference is skipped if every value already has a type.
     """
     if not os.path.exists(input_path):
         raise ValueError(f"Invalid input model path: {input_path}")
@@ -234,25 +275,32 @@ def extract_model(
     if check_model:
         onnx.checker.check_model(input_path)
 
+    # The external data is not loaded, only the data of the extracted tensors
+    # is copied when the extracted model is saved.
     if infer_shapes and os.path.getsize(input_path) > onnx.checker.MAXIMUM_PROTOBUF:
         onnx.shape_inference.infer_shapes_path(input_path, output_path)
-        model = onnx.load(output_path)
-    elif infer_shapes:
-        model = onnx.load(input_path, load_external_data=False)
-        model = onnx.shape_inference.infer_shapes(model)
-        base_dir = os.path.dirname(input_path)
-        onnx.load_external_data_for_model(model, base_dir)
+        model = onnx.load(output_path, load_external_data=False)
     else:
-        model = onnx.load(input_path)
+        model = onnx.load(input_path, load_external_data=False)
+        if infer_shapes and not _has_complete_value_info(model.graph):
+            model = onnx.shape_inference.infer_shapes(model)
 
     e = Extractor(model)
     extracted = e.extract_model(input_names, output_names)
 
+    location = os.path.basename(output_path) + ".data"
+    onnx.external_data_helper._copy_external_data(
+        extracted,
+        os.path.dirname(input_path),
+        os.path.dirname(output_path),
+        location,
+    )
     if extracted.ByteSize() > onnx.checker.MAXIMUM_PROTOBUF:
-        location = os.path.basename(output_path) + ".data"
-        onnx.save(extracted, output_path, save_as_external_data=True, location=location)
-    else:
-        onnx.save(extracted, output_path)
+        # The tensors are appended to the external data file when the model is saved.
+        for tensor in onnx.external_data_helper._get_initializer_tensors(extracted):
+            if tensor.HasField("raw_data"):
+                onnx.external_data_helper.set_external_data(tensor, location)
+    onnx.save(extracted, output_path)
 
     if check_model:
         onnx.checker.check_model(output_path)
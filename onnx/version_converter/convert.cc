@@ -26,12 +26,31 @@ ModelProto ConvertVersion(const ModelProto& mp_in, int target_version) {
   return v.convert_version(mp_in, initial_struct, target_struct);
 }
 
+// Stage given to the nodes created by an adapter, to find them in the node list.
+static constexpr size_t kAdaptedNodeStage = 1;
+
+const std::vector<int64_t>& DefaultVersionConverter::plan_for(
+    const std::string& op_name,
+    const std::unordered_map<std::string, std::map<int64_t, const OpSchema*>>& op_domain_map,
+    ConversionPlans& plans) const {
+  auto it = plans.adapter_versions.find(op_name);
+  if (it == plans.adapter_versions.end()) {
+    const int64_t step = plans.target_version > plans.initial_version ? 1 : -1;
+    std::vector<int64_t> versions;
+    for (int64_t v = plans.initial_version; v != plans.target_version; v += step) {
+      if (searchOpDomainMap(op_domain_map, v, step)) {
+        versions.push_back(v);
+      }
+    }
+    it = plans.adapter_versions.emplace(op_name, std::move(versions)).first;
+  }
+  return it->second;
+}
+
 void DefaultVersionConverter::convert_graph(
     const std::shared_ptr<Graph>& g,
     const OpSetID& initial_version,
     const OpSetID& target_version) const {
-  assertNonNull(g);
-
   // TODO(ONNX): Move to Inter-Domain Converter
   // Get initial model versions
   // std::vector<OpSetID> initial_versions = g->opset_versions_mutable();
@@ -47,13 +66,21 @@ void DefaultVersionConverter::convert_graph(
   assertInVersionRange(initial_version.version());
   assertInVersionRange(target_version.version());
 
-  // Iterate over all versions to target_version for specified
-  int64_t curr_version = initial_version.version();
-  int64_t step = 0;
-  if (target_version.version() > initial_version.version()) {
-    step = 1;
-  } else {
-    step = -1;
+  ConversionPlans plans{initial_version.version(), target_version.version(), {}, kAdaptedNodeStage + 1};
+  convert_graph(g, initial_version.version(), target_version.version(), plans);
+}
+
+// Converts the nodes of g from from_version to to_version in a single traversal: each node goes
+// through the chain of adapters its op needs in the range. Only when an adapter rewrites the
+// node into other nodes are these converted separately, from the version they were created for.
+void DefaultVersionConverter::convert_graph(
+    const std::shared_ptr<Graph>& g,
+    int64_t from_version,
+    int64_t to_version,
+    ConversionPlans& plans) const {
+  assertNonNull(g);
+  if (from_version == to_version) {
+    return;
   }
   // Identify index of the default domain ("" or "ai.onnx") in g.opset_versions.
   // ImportModelProto preserves domain strings verbatim from the proto, so both
@@ -67,67 +94,132 @@ void DefaultVersionConverter::convert_graph(
     }
   }
   ONNX_ASSERTM(domain_index >= 0, "Graph has no default-domain (\"\" or \"ai.onnx\") opset entry")
-  while (curr_version != target_version.version()) {
-    debug(
-        "curr_version: " + ONNX_NAMESPACE::to_string(curr_version) +
-        ", next_version: " + ONNX_NAMESPACE::to_string(curr_version + step));
-    Node* cur_op = nullptr;
-    graph_node_list_iterator it = g->begin();
-    // Iterate through and call adapter returned by adapter_lookup for ops from
-    // current_version opset. We have to manipulate the iterator explicitly because cur_op
-    // might change when applying the adapter (e.g. for deprecated ops)
-    while (it != g->end()) {
-      cur_op = *it;
-      debug(std::string("Finding schema for ") + std::string(cur_op->kind().toString()));
-      const std::string op_name = cur_op->kind().toString();
-      if (op_name == "ConstantFill") {
-        if (DEBUG) {
-          std::cerr
-              << "Warning: skipping schema search for experimental op 'ConstantFill' and keeping the op as is. "
-                 "Please be advised the converted model may not be working properly if target runtime does not support this "
-                 "experimental op."
-              << '\n';
-        }
-      } else if (!cur_op->domain().empty() && cur_op->domain() != "ai.onnx") {
-        if (DEBUG) {
-          std::cerr << "Warning: opset domain '" << cur_op->domain() << "' is not supported." << '\n';
-        }
-      } else if (op_name != "Undefined" && op_name != "Captured") {
-        const auto schema_it = all_schemas.find(op_name);
-        ONNX_ASSERTM(
-            schema_it != all_schemas.end(),
-            "Op '%s' has no registered schema; cannot convert it from version %lld to %lld.",
-            op_name.c_str(),
-            static_cast<long long>(curr_version),
-            static_cast<long long>(target_version.version()));
-        const auto& op_domain_map = schema_it->second;
-        OpSetID curr_id(curr_version);
-        OpSetID next_id(curr_version + step);
-        if (searchOpDomainMap(op_domain_map, curr_version, step)) {
-          // Op is specifically defined for this domain and version
-          const auto& op_adapter = adapter_lookup(cur_op, curr_id, next_id);
-          // If adapter_lookup returns null, no adapter is present.
-          // Error thrown by adapter_lookup
-          if (DEBUG) {
-            std::cerr << "Applying adapter" << '\n';
-          }
-          // adapt should handle replacing node in graph
-          cur_op = op_adapter.adapt(g, cur_op);
-          it = graph_node_list_iterator(cur_op, kNextDirection);
-        }
-        // Recursively convert any subgraph attributes
-        for (const auto& attr : cur_op->attributeNames()) {
-          if (cur_op->kindOf(attr) == AttributeKind::g) {
-            convert_graph(cur_op->g(attr), curr_id, next_id);
-          }
-        }
+  debug("from_version: " + ONNX_NAMESPACE::to_string(from_version) + ", to_version: " + ONNX_NAMESPACE::to_string(to_version));
+  // We have to manipulate the iterator explicitly because the node might change when applying
+  // an adapter (e.g. for deprecated ops).
+  graph_node_list_iterator it = g->begin();
+  while (it != g->end()) {
+    Node* last = convert_node(g, *it, from_version, from_version, to_version, plans);
+    it = graph_node_list_iterator(last, kNextDirection);
+    ++it;
+  }
+  // Update model version
+  g->opset_versions_mutable()[static_cast<size_t>(domain_index)].incrementVersion(to_version - from_version);
+}
+
+void DefaultVersionConverter::convert_subgraphs(
+    Node* node,
+    int64_t from_version,
+    int64_t to_version,
+    ConversionPlans& plans) const {
+  if (from_version == to_version) {
+    return;
+  }
+  for (const auto& attr : node->attributeNames()) {
+    if (node->kindOf(attr) == AttributeKind::g) {
+      convert_graph(node->g(attr), from_version, to_version, plans);
+    }
+  }
+}
+
+// Converts node, which is at version `version` and whose subgraphs are at `subgraph_version`, to
+// to_version. Returns the last node of the nodes node was rewritten into (node itself if none).
+Node* DefaultVersionConverter::convert_node(
+    const std::shared_ptr<Graph>& g,
+    Node* node,
+    int64_t version,
+    int64_t subgraph_version,
+    int64_t to_version,
+    ConversionPlans& plans) const {
+  debug(std::string("Finding schema for ") + std::string(node->kind().toString()));
+  const std::string op_name = node->kind().toString();
+  if (op_name == "ConstantFill") {
+    if (DEBUG) {
+      std::cerr
+          << "Warning: skipping schema search for experimental op 'ConstantFill' and keeping the op as is. "
+             "Please be advised the converted model may not be working properly if target runtime does not support this "
+             "experimental op."
+          << '\n';
+    }
+    return node;
+  }
+  if (!node->domain().empty() && node->domain() != "ai.onnx") {
+    if (DEBUG) {
+      std::cerr << "Warning: opset domain '" << node->domain() << "' is not supported." << '\n';
+    }
+    return node;
+  }
+  if (op_name == "Undefined" || op_name == "Captured") {
+    return node;
+  }
+  const auto schema_it = all_schemas.find(op_name);
+  ONNX_ASSERTM(
+      schema_it != all_schemas.end(),
+      "Op '%s' has no registered schema; cannot convert it from version %lld to %lld.",
+      op_name.c_str(),
+      static_cast<long long>(version),
+      static_cast<long long>(to_version));
+  const int64_t step = to_version > version ? 1 : -1;
+  for (const int64_t v : plan_for(op_name, schema_it->second, plans)) {
+    // Skip the steps outside of [version, to_version).
+    if ((v - version) * step < 0) {
+      continue;
+    }
+    if ((to_version - v) * step <= 0) {
+      break;
+    }
+    // Subgraphs are converted up to the version the adapter expects, as the node itself.
+    convert_subgraphs(node, subgraph_version, v, plans);
+    subgraph_version = v;
+    Node* adapted = nullptr;
+    {
+      const auto stage_guard = g->setStageTemporary(kAdaptedNodeStage);
+      // Op is specifically defined for this domain and version
+      const auto& op_adapter = adapter_lookup(node, OpSetID(v), OpSetID(v + step));
+      // If adapter_lookup returns null, no adapter is present.
+      // Error thrown by adapter_lookup
+      if (DEBUG) {
+        std::cerr << "Applying adapter" << '\n';
       }
-      ++it;
+      // adapt should handle replacing node in graph
+      adapted = op_adapter.adapt(g, node);
+    }
+    graph_node_list_iterator before(adapted, kPrevDirection);
+    graph_node_list_iterator after(adapted, kNextDirection);
+    ++before;
+    ++after;
+    if (adapted == node && (*before)->stage() != kAdaptedNodeStage && (*after)->stage() != kAdaptedNodeStage) {
+      version = v + step;
+      continue;
+    }
+    // The adapter rewrote the node: the new nodes, which precede or follow the adapted node, are
+    // converted from the next version on, one after the other. They are given a stage of their
+    // own to be told apart from the nodes of enclosing regions while they are converted.
+    const size_t region_stage = plans.next_region_stage++;
+    adapted->setStage(region_stage);
+    graph_node_list_iterator first(adapted, kPrevDirection);
+    while ((*before)->stage() == kAdaptedNodeStage) {
+      (*before)->setStage(region_stage);
+      first = before;
+      ++before;
+    }
+    while ((*after)->stage() == kAdaptedNodeStage) {
+      (*after)->setStage(region_stage);
+      ++after;
+    }
+    Node* cur = *first;
+    Node* last = cur;
+    while (cur->stage() == region_stage) {
+      cur->setStage(0);
+      last = convert_node(g, cur, v + step, cur == adapted ? v : v + step, to_version, plans);
+      graph_node_list_iterator next(last, kNextDirection);
+      ++next;
+      cur = *next;
     }
-    // Update model version
-    curr_version += step;
-    g->opset_versions_mutable()[static_cast<size_t>(domain_index)].incrementVersion(step);
+    return last;
   }
+  convert_subgraphs(node, subgraph_version, to_version, plans);
+  return node;
 }
 
 ModelProto DefaultVersionConverter::convert_version(
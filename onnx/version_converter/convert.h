@@ -107,9 +107,38 @@ class DefaultVersionConverter : public BaseVersionConverter {
     ONNX_ASSERTM(initial_domain == target_domain, "initial_version and target_version must have the same domains")
   }
 
+  // The adapters needed by each op to convert a graph from initial_version to target_version:
+  // adapter_versions[op_name] lists, in conversion order, the versions v for which the op has an
+  // adapter from v to the next version.
+  struct ConversionPlans {
+    int64_t initial_version;
+    int64_t target_version;
+    std::unordered_map<std::string, std::vector<int64_t>> adapter_versions;
+    // Node stage identifying the nodes of the next rewritten region, see convert_node.
+    size_t next_region_stage;
+  };
+
+  const std::vector<int64_t>& plan_for(
+      const std::string& op_name,
+      const std::unordered_map<std::string, std::map<int64_t, const OpSchema*>>& op_domain_map,
+      ConversionPlans& plans) const;
+
   void convert_graph(const std::shared_ptr<Graph>& g, const OpSetID& initial_version, const OpSetID& target_version)
       const;
 
+  void convert_graph(const std::shared_ptr<Graph>& g, int64_t from_version, int64_t to_version, ConversionPlans& plans)
+      const;
+
+  void convert_subgraphs(Node* node, int64_t from_version, int64_t to_version, ConversionPlans& plans) const;
+
+  Node* convert_node(
+      const std::shared_ptr<Graph>& g,
+      Node* node,
+      int64_t version,
+      int64_t subgraph_version,
+      int64_t to_version,
+      ConversionPlans& plans) const;
+
  public:
   DefaultVersionConverter() {
     const std::unordered_map<std::string, std::pair<int, int>>& versions_map =
@@ -375,6 +375,58 @@ bar (x) => (y) {
   ASSERT_EQ(node2.attribute_size(), 0);
 }
 
+TEST(FunctionInliner, PolicyTest) {
+  const char* code = R"ONNX(
+<
+  ir_version: 8,
+  opset_import: [ "" : 10, "local" : 1 ]
+>
+agraph (float[N, 128] X, float[128,10] W, float[10] B) => (float[N, 10] C)
+{
+  T = local.foo (X, W, B)
+  C = local.square(T)
+}
+
+<
+  opset_import: [ "" : 10 ],
+  domain: "local"
+>
+foo (x, w, b) => (c) {
+  T = MatMul(x, w)
+  S = Add(T, b)
+  c = Softmax(S)
+}
+
+<
+  opset_import: [ "" : 10 ],
+  domain: "local"
+>
+square (x) => (y) {
+  y = Mul (x, x)
+}
+)ONNX";
+
+  ModelProto model;
+  OnnxParser parser(code);
+  auto status = parser.Parse(model);
+  ASSERT_TRUE(status.IsOK()) << status.ErrorMessage();
+
+  inliner::InliningPolicy policy;
+  policy.max_node_count = 1;
+  auto stats = inliner::InlineLocalFunctionsWithPolicy(model, policy);
+  checker::check_model(model, false, true);
+
+  ASSERT_EQ(model.graph().node_size(), 2);
+  ASSERT_EQ(model.graph().node(0).op_type(), "foo");
+  ASSERT_EQ(model.graph().node(1).op_type(), "Mul");
+  ASSERT_EQ(model.functions_size(), 1);
+  ASSERT_EQ(stats.inlined_calls, 1);
+  ASSERT_EQ(stats.nodes_before, 6);
+  ASSERT_EQ(stats.nodes_after, 5);
+  ASSERT_EQ(stats.functions_before, 2);
+  ASSERT_EQ(stats.functions_after, 1);
+}
+
 TEST(SchemaFunctionInliner, BasicTest) {
   const char* code = R"ONNX(
 <ir_version: 8, opset_import: ["" : 18]>
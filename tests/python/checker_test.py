@@ -1723,3 +1723,86 @@ class TestChecker:
             match=r"Input channels C must be divisible by group for ConvTranspose",
         ):
             checker.check_model(model, full_check=True)
+
+    def _large_model(self, num_nodes: int = 600) -> onnx.ModelProto:
+        nodes = [
+            helper.make_node("Relu" if i % 2 else "Neg", [f"X{i}"], [f"X{i + 1}"])
+            for i in range(num_nodes)
+        ]
+        initializers = [
+            helper.make_tensor(f"W{i}", TensorProto.FLOAT, [2], [1.0, 2.0])
+            for i in range(8)
+        ]
+        graph = helper.make_graph(
+            nodes,
+            "large",
+            [helper.make_tensor_value_info("X0", TensorProto.FLOAT, [2])],
+            [helper.make_tensor_value_info(f"X{num_nodes}", TensorProto.FLOAT, [2])],
+            initializer=initializers,
+        )
+        return helper.make_model(graph, opset_imports=[helper.make_opsetid("", 18)])
+
+    def test_check_model_num_threads(self) -> None:
+        checker.check_model(self._large_model(), full_check=True, num_threads=4)
+
+    @pytest.mark.parametrize("num_threads", [1, 4])
+    def test_check_model_num_threads_reports_first_error(self, num_threads) -> None:
+        model = self._large_model()
+        # Two invalid nodes, the first one is reported.
+        model.graph.node[100].attribute.append(helper.make_attribute("alpha", 1.0))
+        model.graph.node[500].attribute.append(helper.make_attribute("beta", 1.0))
+        del model.graph.initializer[5].float_data[:]
+        with pytest.raises(checker.ValidationError) as sequential:
+            checker.check_model(model)
+        with pytest.raises(checker.ValidationError) as parallel:
+            checker.check_model(model, num_threads=num_threads)
+        assert str(parallel.value) == str(sequential.value)
+        assert "W5" in str(parallel.value)
+
+        del model.graph.initializer[:]
+        with pytest.raises(checker.ValidationError, match="alpha"):
+            checker.check_model(model, num_threads=num_threads)
+
+    def test_check_model_num_threads_local_functions(self) -> None:
+        model = onnx.parser.parse_model(
+            """
+            <ir_version: 8, opset_import: [ "" : 18, "local" : 1 ]>
+            g (float[N] X) => (float[N] Y) { T = local.F (X) Y = local.G (T) }
+            <opset_import: [ "" : 18 ], domain: "local">
+            F (x) => (y) { y = Relu(x) }
+            <opset_import: [ "" : 18 ], domain: "local">
+            G (x) => (y) { y = Neg(x) }
+            <opset_import: [ "" : 18 ], domain: "local">
+            H (x) => (y) { y = Neg(undefined) }
+            """
+        )
+        with pytest.raises(checker.ValidationError, match="undefined"):
+            checker.check_model(model, num_threads=3)
+        del model.functions[2]
+        checker.check_model(model, num_threads=3)
+
+    @pytest.mark.parametrize("use_processes", [False, True])
+    def test_check_models(self, use_processes) -> None:
+        valid = onnx.parser.parse_model(
+            """
+            <ir_version: 8, opset_import: [ "" : 18 ]>
+            g (float[N] X) => (float[N] Y) { Y = Relu(X) }
+            """
+        )
+        invalid = onnx.ModelProto()
+        invalid.CopyFrom(valid)
+        invalid.graph.node[0].op_type = "Unknown"
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = [os.path.join(temp_dir, f"model{i}.onnx") for i in range(4)]
+            for i, path in enumerate(paths):
+                onnx.save(invalid if i == 2 else valid, path)
+            paths.append(os.path.join(temp_dir, "missing.onnx"))
+            reports = checker.check_models(
+                paths, full_check=True, max_workers=2, use_processes=use_processes
+            )
+        assert [r.path for r in reports] == paths
+        assert [r.ok for r in reports] == [True, True, False, True, False]
+        assert reports[2].error_type == "ValidationError"
+        assert "Unknown" in reports[2].error
+        assert reports[0].error is None
+        assert reports[4].to_dict()["ok"] is False
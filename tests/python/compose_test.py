@@ -396,6 +396,59 @@ class TestComposeFunctions:
         m3 = compose.merge_models(m1, m2, io_map=io_map)
         checker.check_model(m3)
 
+    def _chain_models(self, n: int) -> list[ModelProto]:
+        models = []
+        for i in range(n):
+            m = _load_model(
+                f"""
+                <
+                    ir_version: 7,
+                    opset_import: [ "": 13]
+                >
+                g{i} (float[N] X{i}, float[N] S{i}) => (float[N] X{i + 1})
+                <float[1] W{i} = {{{i + 1}.0}}>
+                {{
+                    T{i} = Mul(X{i}, W{i})
+                    X{i + 1} = Add(T{i}, S{i})
+                }}
+                """
+            )
+            models.append(m)
+        return models
+
+    def test_merge_multiple_models(self) -> None:
+        models = self._chain_models(4)
+        for i, m in enumerate(models):
+            m.graph.doc_string = f"model {i}"
+        io_maps = [[(f"X{i + 1}", f"X{i + 1}")] for i in range(3)]
+        merged = compose.merge_multiple_models(models, io_maps)
+
+        expected = models[0]
+        for io_map, m in zip(io_maps, models[1:], strict=True):
+            expected = compose.merge_models(expected, m, io_map=io_map)
+
+        for field in ("node", "input", "output", "initializer", "value_info"):
+            assert list(getattr(merged.graph, field)) == list(
+                getattr(expected.graph, field)
+            )
+        assert [i.name for i in merged.graph.input] == ["X0", "S0", "S1", "S2", "S3"]
+        assert [o.name for o in merged.graph.output] == ["X4"]
+        assert merged.graph.name == "g0_g1_g2_g3"
+        assert merged.graph.doc_string == expected.graph.doc_string
+
+    def test_merge_multiple_models_errors(self) -> None:
+        models = self._chain_models(3)
+        with pytest.raises(ValueError, match="io_maps"):
+            compose.merge_multiple_models(models, [[("X1", "X1")]])
+
+        # Both models have an input S1.
+        models[2] = compose.add_prefix(models[2], "p/")
+        models[2].graph.input[1].name = "S1"
+        models[2].graph.node[1].input[1] = "S1"
+        io_maps = [[("X1", "X1")], [("X2", "p/X2")]]
+        with pytest.raises(ValueError, match="S1"):
+            compose.merge_multiple_models(models, io_maps)
+
     def test_add_prefix_to_inputs_outputs(self) -> None:
         """Tests prefixing inputs and outputs nodes."""
         input_graph = """
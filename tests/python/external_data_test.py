@@ -502,6 +502,48 @@ class TestSaveAllTensorsAsExternalData:
         assert not attribute_tensor.HasField("data_location")
         np.testing.assert_allclose(to_array(attribute_tensor), self.attribute_value)
 
+    @pytest.mark.parametrize("all_tensors_to_one_file", [True, False])
+    def test_save_model_deduplicates_external_data(
+        self, all_tensors_to_one_file: bool
+    ) -> None:
+        model_file_path = self.get_temp_model_filename()
+        duplicate = from_array(self.initializer_value, "duplicate_value")
+        self.model.graph.initializer.append(duplicate)
+        other = from_array(self.initializer_value + 1, "other_value")
+        self.model.graph.initializer.append(other)
+        onnx.save_model(
+            self.model,
+            model_file_path,
+            self.serialization_format,
+            save_as_external_data=True,
+            all_tensors_to_one_file=all_tensors_to_one_file,
+            size_threshold=0,
+            deduplicate_external_data=True,
+        )
+
+        model = onnx.load_model(
+            model_file_path, self.serialization_format, load_external_data=False
+        )
+        infos = [ExternalDataInfo(t) for t in model.graph.initializer]
+        assert [(i.location, i.offset, i.length) for i in infos[:2]] == [
+            (infos[0].location, infos[0].offset, infos[0].length)
+        ] * 2
+        assert (infos[2].location, infos[2].offset) != (
+            infos[0].location,
+            infos[0].offset,
+        )
+        assert infos[0].checksum == infos[1].checksum
+        assert infos[0].checksum != infos[2].checksum
+        assert len(infos[0].checksum) == 40
+
+        model = onnx.load_model(model_file_path, self.serialization_format)
+        np.testing.assert_equal(
+            to_array(model.graph.initializer[1]), self.initializer_value
+        )
+        np.testing.assert_equal(
+            to_array(model.graph.initializer[2]), self.initializer_value + 1
+        )
+
     def test_save_model_without_loading_external_data(self) -> None:
         model_file_path = self.get_temp_model_filename()
         onnx.save_model(
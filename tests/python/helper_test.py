@@ -461,6 +461,15 @@ class TestHelperTensorFunctions:
         )
         assert string_list == list(tensor.string_data)
 
+    def test_make_string_tensor_mixed_str_bytes(self) -> None:
+        tensor = helper.make_tensor(
+            name="test",
+            data_type=TensorProto.STRING,
+            dims=(3,),
+            vals=["Amy", b"B\x00", "Çindy"],
+        )
+        assert list(tensor.string_data) == [b"Amy", b"B\x00", "Çindy".encode()]
+
     def test_make_bfloat16_tensor(self) -> None:
         # numpy doesn't support bf16, so we have to compute the correct result manually
         np_array = np.array(
@@ -138,3 +138,81 @@ class TestInliner:
         )
         inlined_nodes = inlined.graph.node
         assert "Abs" in [n.op_type for n in inlined_nodes]
+
+    _POLICY_MODEL = """
+        <ir_version: 8, opset_import: [ "" : 17, "local" : 1 ]>
+        agraph (float[N] X, bool cond, int64 n) => (float[N] Y, float[N] Z)
+        {
+            T = local.square (X)
+            Y = local.big (T)
+            Z = Loop (n, cond, X) <body = body (int64 i, bool c, float[N] x) => (bool c_out, float[N] y) {
+                c_out = Identity (c)
+                y = local.big (x)
+            }>
+        }
+
+        <opset_import: [ "" : 17, "local" : 1 ], domain: "local">
+        big (x) => (y) {
+            a = Add (x, x)
+            b = Mul (a, a)
+            y = local.square (b)
+        }
+
+        <opset_import: [ "" : 17 ], domain: "local">
+        square (x) => (y) {
+            y = Mul (x, x)
+        }
+    """
+
+    def test_policy_inlines_small_functions(self):
+        model = parser.parse_model(self._POLICY_MODEL)
+        inlined, stats = inliner.inline_local_functions_with_policy(
+            model, max_node_count=2
+        )
+        checker.check_model(inlined)
+        assert [n.op_type for n in inlined.graph.node] == ["Mul", "big", "Loop"]
+        # square is no longer called, big is kept with the call to square inlined.
+        assert [f.name for f in inlined.functions] == ["big"]
+        assert [n.op_type for n in inlined.functions[0].node] == ["Add", "Mul", "Mul"]
+        assert stats == {
+            "inlined_calls": 2,
+            "nodes_before": 9,
+            "nodes_after": 8,
+            "functions_before": 2,
+            "functions_after": 1,
+        }
+
+    def test_policy_inlines_in_loops(self):
+        model = parser.parse_model(self._POLICY_MODEL)
+        inlined, stats = inliner.inline_local_functions_with_policy(
+            model, max_node_count=0, inline_in_loops=True
+        )
+        checker.check_model(inlined)
+        assert [n.op_type for n in inlined.graph.node] == ["square", "big", "Loop"]
+        body = inlined.graph.node[2].attribute[0].g
+        assert [n.op_type for n in body.node] == ["Identity", "Add", "Mul", "Mul"]
+        assert [f.name for f in inlined.functions] == ["big", "square"]
+        assert stats["inlined_calls"] == 2
+        assert stats["nodes_after"] == stats["nodes_before"] + 2
+
+    def test_policy_always_inline(self):
+        model = parser.parse_model(self._POLICY_MODEL)
+        inlined, stats = inliner.inline_local_functions_with_policy(
+            model, max_node_count=0, always_inline=[("local", "big")]
+        )
+        checker.check_model(inlined)
+        assert [n.op_type for n in inlined.graph.node] == [
+            "square",
+            "Add",
+            "Mul",
+            "square",
+            "Loop",
+        ]
+        assert [f.name for f in inlined.functions] == ["square"]
+        assert stats["functions_after"] == 1
+
+    def test_policy_without_limit_matches_inline_local_functions(self):
+        model = parser.parse_model(self._POLICY_MODEL)
+        inlined, stats = inliner.inline_local_functions_with_policy(model)
+        assert inlined == inliner.inline_local_functions(model)
+        assert stats["functions_after"] == 0
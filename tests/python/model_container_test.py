@@ -131,3 +131,73 @@ class TestLargeOnnx:
                     assert tested == 1
             loaded_model = onnx.load_model(filename, load_external_data=True)
             onnx.checker.check_model(loaded_model)
+
+    def test_add_large_initializer(self):
+        container = onnx.model_container.ModelContainer()
+        value = (np.arange(9) * 100).astype(np.float32).reshape((-1, 3))
+        tensor = container.add_large_initializer("A", value)
+        assert tensor.name == "A"
+        assert ext_data.uses_external_data(tensor)
+        assert container["#A"] is value
+        with pytest.raises(ValueError, match="already used"):
+            container.add_large_initializer("A", value)
+        with pytest.raises(ValueError, match="must start with '#'"):
+            container.add_large_initializer("B", value, location="B")
+
+        X = onnx.helper.make_tensor_value_info("X", onnx.TensorProto.FLOAT, [None, 3])
+        Y = onnx.helper.make_tensor_value_info("Y", onnx.TensorProto.FLOAT, [None, 3])
+        graph = onnx.helper.make_graph(
+            [onnx.helper.make_node("MatMul", ["X", "A"], ["Y"])],
+            "mm",
+            [X],
+            [Y],
+            [tensor],
+        )
+        container.model_proto = onnx.helper.make_model(graph)
+        container.check_large_initializers()
+        with tempfile.TemporaryDirectory() as temp:
+            filename = os.path.join(temp, "model.onnx")
+            container.save(filename, True)
+            loaded_model = onnx.load_model(filename, load_external_data=True)
+            np.testing.assert_equal(
+                onnx.numpy_helper.to_array(loaded_model.graph.initializer[0]), value
+            )
+
+    @pytest.mark.parametrize("use_mmap", [False, True])
+    def test_lazy_load(self, use_mmap):
+        large_model = _large_linear_regression()
+        with tempfile.TemporaryDirectory() as temp:
+            filename = os.path.join(temp, "model.onnx")
+            large_model.save(filename, True)
+            expected = onnx.model_container.ModelContainer()
+            expected.load(filename)
+
+            copy = onnx.model_container.ModelContainer(max_resident_bytes=40)
+            copy.load(filename, lazy=True, use_mmap=use_mmap)
+            copy.check_large_initializers()
+            assert copy.large_initializers == {}
+            keys = sorted(expected.large_initializers)
+            assert len(keys) == 2
+            assert all(k in copy for k in keys)
+
+            np.testing.assert_equal(copy[keys[0]], expected[keys[0]])
+            assert list(copy.large_initializers) == [keys[0]]
+            assert copy.resident_bytes == 36
+            # The cap only allows one 3x3 float tensor, the first one is released.
+            np.testing.assert_equal(copy[keys[1]], expected[keys[1]])
+            assert list(copy.large_initializers) == [keys[1]]
+            assert copy.resident_bytes == 36
+            # A modified tensor is never released.
+            modified = expected[keys[1]] * 2
+            copy[keys[1]] = modified
+            np.testing.assert_equal(copy[keys[0]], expected[keys[0]])
+            assert copy[keys[1]] is modified
+            assert copy.resident_bytes == 36
+
+            filename2 = os.path.join(temp, "model2.onnx")
+            copy.save(filename2, True)
+            loaded = onnx.model_container.ModelContainer()
+            loaded.load(filename2)
+            np.testing.assert_equal(loaded[keys[0]], expected[keys[0]])
+            np.testing.assert_equal(loaded[keys[1]], modified)
+            del copy
@@ -3,12 +3,13 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import ml_dtypes
 import numpy as np
 import pytest
 
 import onnx
 import onnx.reference
-from onnx import helper, numpy_helper
+from onnx import _packing, helper, numpy_helper
 
 
 class TestNumpyHelper:
@@ -56,6 +57,40 @@ class TestNumpyHelper:
         a_recover = numpy_helper.to_array(tensor_def)
         np.testing.assert_equal(a, a_recover)
 
+    @pytest.mark.parametrize(
+        "dtype",
+        [object, np.str_, np.dtypes.StringDType()]
+        if hasattr(np.dtypes, "StringDType")
+        else [object, np.str_],
+    )
+    def test_string_array_dtypes(self, dtype) -> None:
+        a = np.array([["Amy", "Billy"], ["", "Dävid"]], dtype=dtype)
+        tensor_def = numpy_helper.from_array(a, "test")
+        assert tensor_def.data_type == onnx.TensorProto.STRING
+        assert list(tensor_def.string_data) == [
+            b"Amy",
+            b"Billy",
+            b"",
+            "Dävid".encode(),
+        ]
+        a_recover = numpy_helper.to_array(tensor_def)
+        assert a_recover.dtype == object
+        assert a_recover.shape == (2, 2)
+        np.testing.assert_equal(a_recover, a.astype(object))
+
+    def test_bytes_array(self) -> None:
+        a = np.array([b"a", b"bc", b"def"])
+        tensor_def = numpy_helper.from_array(a, "test")
+        assert tensor_def.data_type == onnx.TensorProto.STRING
+        assert list(tensor_def.string_data) == [b"a", b"bc", b"def"]
+
+    def test_string_to_array_without_decoding(self) -> None:
+        a = np.array(["x", "ÿ", "z"], dtype=object)
+        tensor_def = numpy_helper.from_array(a, "test")
+        a_recover = numpy_helper.to_array(tensor_def, decode_strings=False)
+        assert a_recover.dtype == object
+        assert a_recover.tolist() == [b"x", "ÿ".encode(), b"z"]
+
     def test_bool(self) -> None:
         a = np.random.randint(2, size=(13, 37)).astype(bool)
         tensor_def = numpy_helper.from_array(a, "test")
@@ -322,3 +357,98 @@ class TestNumpyHelper:
         tensor.int32_data.append(0)  # encodes 16 elements, not 1000
         with pytest.raises(ValueError):
             numpy_helper.to_array(tensor)
+
+
+class TestPacking:
+    @staticmethod
+    def _reference_pack(values: np.ndarray, bits: int) -> np.ndarray:
+        per_byte = 8 // bits
+        flat = [int(v) & ((1 << bits) - 1) for v in values.ravel().view(np.uint8)]
+        flat += [0] * (-len(flat) % per_byte)
+        return np.array(
+            [
+                sum(flat[i + k] << (k * bits) for k in range(per_byte))
+                for i in range(0, len(flat), per_byte)
+            ],
+            dtype=np.uint8,
+        )
+
+    @pytest.mark.parametrize("size", [0, 1, 2, 3, 4, 5, 7, 8, 33, 101])
+    @pytest.mark.parametrize("bits", [2, 4])
+    def test_pack_unpack_roundtrip_chunked(self, size: int, bits: int) -> None:
+        values = np.random.randint(0, 1 << bits, size=size).astype(np.uint8)
+        pack = _packing.pack_4bitx2 if bits == 4 else _packing.pack_2bitx4
+        unpack = _packing.unpack_4bit if bits == 4 else _packing.unpack_2bit
+        packed = pack(values, chunk_size=3)
+        np.testing.assert_equal(packed, self._reference_pack(values, bits))
+        assert packed.size == _packing.packed_size(size, bits)
+        unpacked = unpack(packed, [size], chunk_size=2)
+        np.testing.assert_equal(unpacked, values)
+
+    def test_pack_4bit_negative_values(self) -> None:
+        values = np.array([-8, 7, -1, 0, 3], dtype=ml_dtypes.int4)
+        packed = _packing.pack_4bitx2(values)
+        np.testing.assert_equal(packed, self._reference_pack(values, 4))
+        unpacked = _packing.unpack_4bit(packed, values.shape).view(ml_dtypes.int4)
+        np.testing.assert_equal(unpacked, values)
+
+    def test_unpack_into_preallocated_buffer(self) -> None:
+        values = np.random.randint(0, 16, size=(6, 5)).astype(np.uint8)
+        packed = _packing.pack_4bitx2(values)
+        out = np.empty((6, 5), dtype=ml_dtypes.uint4)
+        result = _packing.unpack_4bit(packed, out.shape, out=out)
+        assert result is out
+        np.testing.assert_equal(out.view(np.uint8), values)
+
+    def test_pack_into_preallocated_buffer_wrong_size(self) -> None:
+        values = np.zeros(10, dtype=np.uint8)
+        with pytest.raises(ValueError, match="Output buffer"):
+            _packing.pack_4bitx2(values, out=np.empty(4, dtype=np.uint8))
+
+    def test_unpack_from_memmap(self, tmp_path) -> None:
+        values = np.random.randint(0, 4, size=1001).astype(np.uint8)
+        path = tmp_path / "packed.bin"
+        _packing.pack_2bitx4(values).tofile(path)
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+        np.testing.assert_equal(
+            _packing.unpack_2bit(data, [1001], chunk_size=16), values
+        )
+
+
+class TestFromArrayToExternalData:
+    @pytest.mark.parametrize(
+        "array",
+        [
+            np.arange(12, dtype=np.float32).reshape((3, 4)),
+            np.arange(6, dtype=np.int64).reshape((2, 3)).T,
+            np.arange(10, dtype=np.float64)[::2],
+            np.array([-8, 7, -1], dtype=ml_dtypes.int4),
+        ],
+    )
+    def test_roundtrip(self, tmp_path, array: np.ndarray) -> None:
+        first = numpy_helper.from_array_to_external_data(
+            np.zeros(3, dtype=np.int16),
+            "first",
+            base_path=str(tmp_path),
+            location="weights.bin",
+        )
+        tensor = numpy_helper.from_array_to_external_data(
+            array, "t", base_path=str(tmp_path), location="weights.bin"
+        )
+        assert not tensor.HasField("raw_data")
+        info = onnx.external_data_helper.ExternalDataInfo(tensor)
+        assert info.location == "weights.bin"
+        assert info.offset == 6
+        np.testing.assert_equal(
+            numpy_helper.to_array(tensor, base_dir=str(tmp_path)), array
+        )
+        np.testing.assert_equal(
+            numpy_helper.to_array(first, base_dir=str(tmp_path)),
+            np.zeros(3, dtype=np.int16),
+        )
+
+    def test_string_not_supported(self, tmp_path) -> None:
+        with pytest.raises(TypeError):
+            numpy_helper.from_array_to_external_data(
+                np.array(["a"]), base_path=str(tmp_path), location="weights.bin"
+            )
@@ -55,9 +55,11 @@ from onnx.reference.ops.op_attention import _apply_causal, _softmax
 from onnx.reference.ops.op_celu import _vcelu1
 from onnx.reference.ops.op_col2im import (
     _col2im_naive_implementation_2d,
+    col2im,
     col2im_naive_implementation,
 )
 from onnx.reference.ops.op_conv import Conv, _conv_implementation
+from onnx.reference.ops.op_resize import _axis_weights
 from onnx.reference.ops_optimized import Conv as ConvOptimized
 from onnx.reference.ops_optimized.op_conv_optimized import _conv_implementation_im2col
 
@@ -180,6 +182,47 @@ def im2col(
     return res.reshape(new_shape)
 
 
+def linear_attention_naive_implementation(
+    query, key, value, past_state, decay, beta, q_num_heads, kv_num_heads
+):
+    """Naive implementation of LinearAttention processing one token at a time.
+
+    Args:
+        query: queries (B, T, H_q * d_k)
+        key: keys (B, T, H_kv * d_k)
+        value: values (B, T, H_kv * d_v)
+        past_state: initial state (B, H_kv, d_k, d_v)
+        decay: log decay (B, T, H_kv or H_kv * d_k) or None
+        beta: delta rule strength (B, T, H_kv or 1) or None
+        q_num_heads: number of query heads
+        kv_num_heads: number of key and value heads
+
+    Returns:
+        output (B, T, H_q * d_v), present state (B, H_kv, d_k, d_v)
+    """
+    b, t, _ = query.shape
+    d_k = query.shape[-1] // q_num_heads
+    d_v = value.shape[-1] // kv_num_heads
+    q = query.reshape((b, t, q_num_heads, d_k)).astype(np.float64)
+    k = key.reshape((b, t, kv_num_heads, d_k)).astype(np.float64)
+    v = value.reshape((b, t, kv_num_heads, d_v)).astype(np.float64)
+    state = past_state.astype(np.float64)
+    scale = 1.0 / np.sqrt(d_k)
+    output = np.zeros((b, t, q_num_heads, d_v), dtype=np.float64)
+    for i in range(t):
+        v_t = v[:, i]
+        if decay is not None:
+            g_t = decay[:, i].reshape((b, kv_num_heads, -1))
+            state = state * np.exp(g_t)[..., np.newaxis]
+        if beta is not None:
+            beta_t = beta[:, i].reshape((b, -1, 1))
+            v_t = beta_t * (v_t - np.einsum("bhdm,bhd->bhm", state, k[:, i]))
+        state = state + k[:, i, :, :, np.newaxis] * v_t[:, :, np.newaxis]
+        read = np.repeat(state, q_num_heads // kv_num_heads, axis=1)
+        output[:, i] = scale * np.einsum("bhd,bhdm->bhm", q[:, i], read)
+    return output.reshape((b, t, -1)), state
+
+
 class TestReferenceEvaluator:
     m2_def = """
         <
@@ -1517,6 +1560,104 @@ class TestReferenceEvaluator:
                 got4 = sess4.run(None, {"X": X, "W": W, "B": B})[0]
                 assert_allclose(got4, expected)
 
+    @pytest.mark.parametrize("op_type", ["LSTM", "GRU", "RNN"])
+    def test_recurrent_sequence_lens_bidirectional(self, op_type):
+        n_gates = {"LSTM": 4, "GRU": 3, "RNN": 1}[op_type]
+        seq_length, batch_size, input_size, hidden_size = 5, 3, 4, 2
+        rng = np.random.default_rng(0)
+        X = rng.standard_normal((seq_length, batch_size, input_size))
+        W = rng.standard_normal((2, n_gates * hidden_size, input_size))
+        R = rng.standard_normal((2, n_gates * hidden_size, hidden_size))
+        lens = np.array([5, 2, 0], dtype=np.int32)
+
+        def run(x, sequence_lens=None):
+            inputs = ["X", "W", "R", "", "lens" if sequence_lens is not None else ""]
+            node = make_node(
+                op_type,
+                inputs,
+                ["Y", "Y_h"],
+                direction="bidirectional",
+                hidden_size=hidden_size,
+            )
+            feeds = {"X": x.astype(np.float32), "W": W.astype(np.float32)}
+            feeds["R"] = R.astype(np.float32)
+            if sequence_lens is not None:
+                feeds["lens"] = sequence_lens
+            return ReferenceEvaluator(node).run(None, feeds)
+
+        Y, Y_h = run(X, lens)
+        for b, length in enumerate(lens):
+            assert_allclose(Y[length:, :, b], 0)
+            if length == 0:
+                assert_allclose(Y_h[:, b], 0)
+                continue
+            expected_Y, expected_Y_h = run(X[:length, b : b + 1])
+            assert_allclose(Y[:length, :, b], expected_Y[:, :, 0], atol=1e-5)
+            assert_allclose(Y_h[:, b], expected_Y_h[:, 0], atol=1e-5)
+
+    @pytest.mark.parametrize(
+        "auto_pad", ["NOTSET", "SAME_UPPER", "SAME_LOWER", "VALID"]
+    )
+    def test_conv_kernel_modes(self, auto_pad):
+        X = make_tensor_value_info("X", TensorProto.FLOAT, [None, None, None, None])
+        W = make_tensor_value_info("W", TensorProto.FLOAT, [None, None, None, None])
+        Y = make_tensor_value_info("Y", TensorProto.FLOAT, [None, None, None, None])
+        kwargs = {"pads": [1, 1, 1, 1]} if auto_pad == "NOTSET" else {}
+        node = make_node(
+            "Conv",
+            ["X", "W"],
+            ["Y"],
+            auto_pad=auto_pad,
+            group=2,
+            strides=[2, 1],
+            **kwargs,
+        )
+        graph = make_graph([node], "g", [X, W], [Y])
+        onnx_model = make_model(graph, opset_imports=[make_opsetid("", 18)])
+        rng = np.random.default_rng(0)
+        feeds = {
+            "X": rng.standard_normal((2, 4, 5, 6)).astype(np.float32),
+            "W": rng.standard_normal((6, 2, 3, 3)).astype(np.float32),
+        }
+
+        ref = ReferenceEvaluator(onnx_model, mode="reference")
+        assert isinstance(ref.rt_nodes_[0], Conv)
+        fast = ReferenceEvaluator(onnx_model, mode="fast")
+        assert isinstance(fast.rt_nodes_[0], ConvOptimized)
+        verify = ReferenceEvaluator(onnx_model, mode="verify")
+        assert isinstance(verify.rt_nodes_[0], ConvOptimized)
+        assert isinstance(verify.rt_nodes_[0].reference_, Conv)
+
+        expected = ref.run(None, feeds)[0]
+        assert_allclose(fast.run(None, feeds)[0], expected, atol=1e-5)
+        assert_allclose(verify.run(None, feeds)[0], expected, atol=1e-5)
+        with pytest.raises(ValueError, match="mode must be"):
+            ReferenceEvaluator(onnx_model, mode="unknown")
+
+    def test_fast_kernel_verify_mismatch(self, monkeypatch):
+        from onnx.reference.ops_optimized import _registry  # noqa: PLC0415
+
+        class Relu(OpRun):
+            def _run(self, x):
+                return (np.abs(x),)
+
+        monkeypatch.setattr(_registry, "_fast_kernels", _registry.fast_kernels())
+        _registry.register_fast_kernel(Relu)
+
+        X = make_tensor_value_info("X", TensorProto.FLOAT, [None])
+        Y = make_tensor_value_info("Y", TensorProto.FLOAT, [None])
+        graph = make_graph([make_node("Relu", ["X"], ["Y"])], "g", [X], [Y])
+        onnx_model = make_model(graph, opset_imports=[make_opsetid("", 18)])
+        x = np.array([-1, 2], dtype=np.float32)
+
+        got = ReferenceEvaluator(onnx_model, mode="fast").run(None, {"X": x})[0]
+        assert_allclose(got, np.array([1, 2], dtype=np.float32))
+        got = ReferenceEvaluator(onnx_model, mode="reference").run(None, {"X": x})[0]
+        assert_allclose(got, np.array([0, 2], dtype=np.float32))
+        verify = ReferenceEvaluator(onnx_model, mode="verify")
+        with pytest.raises(RuntimeError, match="does not match the reference"):
+            verify.run(None, {"X": x})
+
     @skip_if_no_onnxruntime
     def test_qlinearconv(self):
         x = make_tensor_value_info("x", TensorProto.UINT8, [None, None, None, None])
@@ -2101,6 +2242,97 @@ class TestReferenceEvaluator:
         )
         assert_allclose(r1, r2)
 
+    @pytest.mark.parametrize(
+        ("strides", "dilations", "pads"),
+        [([1, 1, 1], [1, 1, 1], [0] * 6), ([2, 1, 2], [1, 2, 1], [1, 0, 1, 0, 1, 1])],
+    )
+    def test_col2im_batch_3d(self, strides, dilations, pads):
+        image_shape, kernel_shape = (5, 4, 6), (2, 3, 2)
+        n_blocks = [
+            (image_shape[i] + pads[i] + pads[i + 3] - dilations[i] * (k - 1) - 1)
+            // strides[i]
+            + 1
+            for i, k in enumerate(kernel_shape)
+        ]
+        data = np.random.randn(2, 3, 12, np.prod(n_blocks)).astype(np.float32)
+        got = col2im(data, image_shape, kernel_shape, dilations, pads, strides)
+        assert got.shape == (2, 3, *image_shape)
+        for n in range(2):
+            for c in range(3):
+                expected = col2im_naive_implementation(
+                    data[n, c], image_shape, kernel_shape, dilations, pads, strides
+                )
+                assert_allclose(got[n, c], expected, rtol=1e-6)
+
+    def test_deform_conv_3d_zero_offset(self):
+        x = np.random.randn(2, 4, 4, 5, 3).astype(np.float32)
+        w = np.random.randn(6, 2, 3, 2, 2).astype(np.float32)
+        b = np.random.randn(6).astype(np.float32)
+        node = make_node(
+            "Conv",
+            ["X", "W", "B"],
+            ["Y"],
+            group=2,
+            pads=[1, 0, 1, 1, 0, 1],
+            strides=[1, 2, 1],
+        )
+        expected = ReferenceEvaluator(node).run(None, {"X": x, "W": w, "B": b})[0]
+        offset = np.zeros((2, 12 * 3, *expected.shape[2:]), dtype=np.float32)
+        node = make_node(
+            "DeformConv",
+            ["X", "W", "offset", "B"],
+            ["Y"],
+            group=2,
+            pads=[1, 0, 1, 1, 0, 1],
+            strides=[1, 2, 1],
+        )
+        got = ReferenceEvaluator(node).run(
+            None, {"X": x, "W": w, "offset": offset, "B": b}
+        )[0]
+        assert_allclose(got, expected, rtol=1e-5, atol=1e-5)
+
+    def test_conv_transpose_group(self):
+        x = np.random.randn(2, 6, 4, 5).astype(np.float32)
+        w = np.random.randn(6, 2, 3, 3).astype(np.float32)
+        b = np.random.randn(6).astype(np.float32)
+        node = make_node(
+            "ConvTranspose",
+            ["X", "W", "B"],
+            ["Y"],
+            group=3,
+            pads=[1, 0, 1, 0],
+            strides=[2, 1],
+        )
+        got = ReferenceEvaluator(node).run(None, {"X": x, "W": w, "B": b})[0]
+        # Every group is an independent ConvTranspose.
+        node = make_node(
+            "ConvTranspose",
+            ["X", "W", "B"],
+            ["Y"],
+            pads=[1, 0, 1, 0],
+            strides=[2, 1],
+        )
+        single = ReferenceEvaluator(node)
+        expected = np.concatenate(
+            [
+                single.run(
+                    None,
+                    {
+                        "X": x[:, 2 * g : 2 * g + 2],
+                        "W": w[2 * g : 2 * g + 2],
+                        "B": b[2 * g : 2 * g + 2],
+                    },
+                )[0]
+                for g in range(3)
+            ],
+            axis=1,
+        )
+        assert got.shape == (2, 6, 7, 7)
+        assert_allclose(got, expected, rtol=1e-5, atol=1e-5)
+        # A bias of the wrong length is rejected.
+        with pytest.raises(ValueError):
+            single.run(None, {"X": x, "W": w, "B": np.zeros(7, dtype=np.float32)})
+
     def test_conv_im2col_group4(self):
         # model 1
         X = make_tensor_value_info("X", TensorProto.FLOAT, [2, 4, 6, 6])
@@ -2429,7 +2661,7 @@ class TestReferenceEvaluator:
         feeds = {
             "X": np.arange(1 * 3 * 5 * 4).reshape((1, 3, 5, 4)).astype(np.float32),
             "W": np.arange(3 * 1 * 3 * 3).reshape((3, 1, 3, 3)).astype(np.float32),
-            "B": np.array([0, 0, 0, 0], dtype=np.float32),
+            "B": np.array([0], dtype=np.float32),
         }
 
         ref1 = ReferenceEvaluator(onnx_model)
@@ -2490,7 +2722,7 @@ class TestReferenceEvaluator:
         feeds = {
             "X": np.arange(1 * 1 * 3 * 3).reshape((1, 1, 3, 3)).astype(np.float32),
             "W": np.arange(1 * 2 * 3 * 3).reshape((1, 2, 3, 3)).astype(np.float32),
-            "B": np.array([0, 0, 0, 0], dtype=np.float32),
+            "B": np.array([0, 0], dtype=np.float32),
         }
 
         expected = np.array(
@@ -4244,6 +4476,61 @@ class TestReferenceEvaluator:
         got = _conv_implementation_im2col(**feeds, **kwargs)
         assert_allclose(got, expected)
 
+    @pytest.mark.parametrize("group", [1, 2, 6])
+    def test_conv_im2col_group_batch(self, group):
+        rng = np.random.default_rng(0)
+        feeds = {
+            "X": rng.standard_normal((3, 6, 7, 8)).astype(np.float32),
+            "W": rng.standard_normal((12, 6 // group, 3, 2)).astype(np.float32),
+            "B": rng.standard_normal((12,)).astype(np.float32),
+        }
+        kwargs = dict(
+            group=group,
+            dilations=[2, 1],
+            kernel_shape=[3, 2],
+            pads=[1, 0, 2, 1],
+            strides=[1, 2],
+            auto_pad="NOTSET",
+        )
+        expected = _conv_implementation(**feeds, **kwargs)
+        got = _conv_implementation_im2col(**feeds, **kwargs)
+        assert_allclose(got, expected, atol=1e-5)
+
+        kwargs.update(auto_pad="SAME_UPPER", pads=None, strides=[2, 2])
+        got = _conv_implementation_im2col(**feeds, **kwargs)
+        assert got.shape == (3, 12, 4, 4)
+
+    @pytest.mark.parametrize("auto_pad", ["SAME_UPPER", "SAME_LOWER", "VALID"])
+    @pytest.mark.parametrize("strides", [[1, 1], [2, 2]])
+    @pytest.mark.parametrize("dilations", [[1, 1], [2, 2]])
+    def test_conv_im2col_auto_pad(self, auto_pad, strides, dilations):
+        rng = np.random.default_rng(0)
+        feeds = {
+            "X": rng.standard_normal((1, 2, 6, 7)).astype(np.float32),
+            "W": rng.standard_normal((3, 2, 3, 3)).astype(np.float32),
+            "B": None,
+        }
+        kwargs = dict(
+            group=1,
+            dilations=dilations,
+            kernel_shape=[3, 3],
+            pads=None,
+            strides=strides,
+            auto_pad=auto_pad,
+        )
+        expected = _conv_implementation(**feeds, **kwargs)
+        got = _conv_implementation_im2col(**feeds, **kwargs)
+        assert_allclose(got, expected, atol=1e-5)
+        extent = [(3 - 1) * d + 1 for d in dilations]
+        if auto_pad == "VALID":
+            shape = [
+                (n - e) // s + 1
+                for n, e, s in zip((6, 7), extent, strides, strict=True)
+            ]
+        else:
+            shape = [-(-n // s) for n, s in zip((6, 7), strides, strict=True)]
+        assert got.shape == (1, 3, *shape)
+
     @pytest.mark.parametrize(
         "op",
         [
@@ -6313,6 +6600,126 @@ class TestReferenceEvaluator:
         got = ref.run(None, {"data": data, "indices": indices, "updates": updates})
         assert_allclose(got[0], expected)
 
+    @pytest.mark.parametrize("reduction", ["none", "add", "mul", "max", "min"])
+    def test_scatternd_duplicated_indices(self, reduction):
+        model = make_model(
+            make_graph(
+                [
+                    make_node(
+                        "ScatterND",
+                        ["data", "indices", "updates"],
+                        ["Y"],
+                        reduction=reduction,
+                    )
+                ],
+                "g",
+                [
+                    make_tensor_value_info("data", TensorProto.FLOAT, None),
+                    make_tensor_value_info("indices", TensorProto.INT64, None),
+                    make_tensor_value_info("updates", TensorProto.FLOAT, None),
+                ],
+                [make_tensor_value_info("Y", TensorProto.FLOAT, None)],
+            ),
+            opset_imports=[make_opsetid("", 18)],
+        )
+        data = np.random.randn(3, 4, 5).astype(np.float32)
+        indices = np.array([[[0, 1], [2, 3]], [[0, 1], [-3, 1]]], dtype=np.int64)
+        updates = np.random.randn(2, 2, 5).astype(np.float32)
+
+        expected = data.copy()
+        for i in np.ndindex(indices.shape[:-1]):
+            index = tuple(indices[i])
+            if reduction == "add":
+                expected[index] += updates[i]
+            elif reduction == "mul":
+                expected[index] *= updates[i]
+            elif reduction == "max":
+                expected[index] = np.maximum(expected[index], updates[i])
+            elif reduction == "min":
+                expected[index] = np.minimum(expected[index], updates[i])
+            else:
+                expected[index] = updates[i]
+
+        got = ReferenceEvaluator(model).run(
+            None, {"data": data, "indices": indices, "updates": updates}
+        )[0]
+        assert_allclose(got, expected)
+
+    @pytest.mark.parametrize(("batch_dims", "k"), [(0, 2), (1, 1), (2, 2), (1, 3)])
+    def test_gathernd_batch_dims_negative_indices(self, batch_dims, k):
+        model = make_model(
+            make_graph(
+                [
+                    make_node(
+                        "GatherND", ["data", "indices"], ["Y"], batch_dims=batch_dims
+                    )
+                ],
+                "g",
+                [
+                    make_tensor_value_info("data", TensorProto.FLOAT, None),
+                    make_tensor_value_info("indices", TensorProto.INT64, None),
+                ],
+                [make_tensor_value_info("Y", TensorProto.FLOAT, None)],
+            ),
+            opset_imports=[make_opsetid("", 13)],
+        )
+        data = np.random.randn(2, 3, 4, 5).astype(np.float32)
+        dims = data.shape[batch_dims : batch_dims + k]
+        indices = np.stack(
+            [
+                np.random.randint(-d, d, size=(*data.shape[:batch_dims], 3))
+                for d in dims
+            ],
+            axis=-1,
+        ).astype(np.int64)
+
+        batch_shape = data.shape[:batch_dims]
+        expected = np.stack(
+            [
+                np.stack([data[b][tuple(i)] for i in indices[b]])
+                for b in np.ndindex(batch_shape)
+            ]
+        ).reshape((*batch_shape, 3, *data.shape[batch_dims + k :]))
+
+        got = ReferenceEvaluator(model).run(None, {"data": data, "indices": indices})[0]
+        assert_allclose(got, expected)
+
+    def test_tensor_scatter_circular_wraps(self):
+        model = make_model(
+            make_graph(
+                [
+                    make_node(
+                        "TensorScatter",
+                        ["past", "update", "write_indices"],
+                        ["present"],
+                        mode="circular",
+                        axis=2,
+                    )
+                ],
+                "g",
+                [
+                    make_tensor_value_info("past", TensorProto.FLOAT, None),
+                    make_tensor_value_info("update", TensorProto.FLOAT, None),
+                    make_tensor_value_info("write_indices", TensorProto.INT64, None),
+                ],
+                [make_tensor_value_info("present", TensorProto.FLOAT, None)],
+            ),
+            opset_imports=[make_opsetid("", 24)],
+        )
+        past = np.random.randn(2, 3, 4, 2).astype(np.float32)
+        update = np.random.randn(2, 3, 3, 2).astype(np.float32)
+        write_indices = np.array([3, 6], dtype=np.int64)
+
+        expected = past.copy()
+        for b in range(2):
+            for s in range(3):
+                expected[b, :, (write_indices[b] + s) % 4] = update[b, :, s]
+
+        got = ReferenceEvaluator(model).run(
+            None, {"past": past, "update": update, "write_indices": write_indices}
+        )[0]
+        assert_allclose(got, expected)
+
     def test_sequence_axis(self):
         model = self._load_model(
             """
@@ -6342,6 +6749,84 @@ class TestReferenceEvaluator:
         output = evaluator.run(["preprocessed"], {"images": [imageIn]})[0]
         assert output.shape == (1, 5, 5)
 
+    @pytest.mark.parametrize(
+        ("mode", "antialias"),
+        [
+            ("nearest", 0),
+            ("linear", 0),
+            ("linear", 1),
+            ("cubic", 0),
+            ("cubic", 1),
+        ],
+    )
+    def test_resize_axes_and_cached_weights(self, mode, antialias):
+        x = np.random.randn(2, 3, 7, 9).astype(np.float32)
+        node = make_node(
+            "Resize",
+            ["X", "", "scales"],
+            ["Y"],
+            mode=mode,
+            antialias=antialias,
+            exclude_outside=1,
+        )
+        scales = np.array([1, 1, 0.6, 1.8], dtype=np.float32)
+        expected = ReferenceEvaluator(node).run(None, {"X": x, "scales": scales})[0]
+        assert expected.shape == (2, 3, 4, 16)
+        for axes, scales in [([2, 3], [0.6, 1.8]), ([-1, -2], [1.8, 0.6])]:
+            node = make_node(
+                "Resize",
+                ["X", "", "scales"],
+                ["Y"],
+                mode=mode,
+                antialias=antialias,
+                exclude_outside=1,
+                axes=axes,
+            )
+            feeds = {"X": x, "scales": np.array(scales, dtype=np.float32)}
+            got = ReferenceEvaluator(node).run(None, feeds)[0]
+            assert_allclose(expected, got, rtol=1e-6)
+
+        # The interpolation tables are computed once for the same node.
+        ref = ReferenceEvaluator(node)
+        ref.run(None, feeds)
+        hits = _axis_weights.cache_info().hits
+        got = ref.run(None, {**feeds, "X": x + 1})[0]
+        assert _axis_weights.cache_info().hits == hits + 2
+        assert got.shape == (2, 3, 4, 16)
+
+    @pytest.mark.parametrize("mode", ["nearest", "linear", "cubic"])
+    @pytest.mark.parametrize("padding_mode", ["zeros", "border", "reflection"])
+    def test_grid_sample_3d_identity(self, mode, padding_mode):
+        model = make_model(
+            make_graph(
+                [
+                    make_node(
+                        "GridSample",
+                        ["X", "grid"],
+                        ["Y"],
+                        mode=mode,
+                        padding_mode=padding_mode,
+                        align_corners=1,
+                    )
+                ],
+                "g",
+                [
+                    make_tensor_value_info("X", TensorProto.FLOAT, None),
+                    make_tensor_value_info("grid", TensorProto.FLOAT, None),
+                ],
+                [make_tensor_value_info("Y", TensorProto.FLOAT, None)],
+            ),
+            opset_imports=[make_opsetid("", 20)],
+        )
+        x = np.random.randn(2, 3, 4, 1, 5).astype(np.float32)
+        # The last coordinate of the grid indexes the first spatial dimension.
+        d, h, w = np.meshgrid(
+            np.linspace(-1, 1, 4), np.zeros(1), np.linspace(-1, 1, 5), indexing="ij"
+        )
+        grid = np.stack([w, h, d], axis=-1)[None].repeat(2, axis=0).astype(np.float32)
+        got = ReferenceEvaluator(model).run(None, {"X": x, "grid": grid})[0]
+        assert_allclose(got, x, atol=1e-5)
+
     def test_convert_ml_dtypes(self):
         model = make_model(
             make_graph(
@@ -6571,6 +7056,68 @@ class TestReferenceEvaluator:
         # Each of the 3 iterations adds `bias` to the running state.
         assert_allclose(final, np.array([30, 300], dtype=np.float32))
 
+    @pytest.mark.parametrize(
+        ("update_rule", "max_decay"),
+        [
+            ("linear", None),
+            ("gated", 1.0),
+            ("delta", None),
+            ("gated_delta", 1.0),
+            # Every chunk of 4 tokens cumulates a log decay above 40, the
+            # decays per key dimension cannot be factorized.
+            ("gated", 20.0),
+            ("gated_delta", 20.0),
+        ],
+    )
+    def test_linear_attention_chunks_and_streaming(self, update_rule, max_decay):
+        b, t, q_heads, kv_heads, d = 2, 11, 4, 2, 3
+        rng = np.random.default_rng(0)
+        feeds = {
+            "query": rng.standard_normal((b, t, q_heads * d)).astype(np.float32),
+            "key": (rng.standard_normal((b, t, kv_heads * d)) / 3).astype(np.float32),
+            "value": rng.standard_normal((b, t, kv_heads * d)).astype(np.float32),
+            "past_state": rng.standard_normal((b, kv_heads, d, d)).astype(np.float32),
+            "decay": None,
+            "beta": None,
+        }
+        if max_decay is not None:
+            feeds["decay"] = -rng.uniform(
+                max_decay / 2, max_decay, (b, t, kv_heads * d)
+            ).astype(np.float32)
+        if update_rule in ("delta", "gated_delta"):
+            feeds["beta"] = rng.uniform(0, 1, (b, t, kv_heads)).astype(np.float32)
+        expected, expected_state = linear_attention_naive_implementation(
+            *feeds.values(), q_heads, kv_heads
+        )
+
+        node = make_node(
+            "LinearAttention",
+            ["query", "key", "value", "past_state", "decay", "beta"],
+            ["output", "present_state"],
+            update_rule=update_rule,
+            q_num_heads=q_heads,
+            kv_num_heads=kv_heads,
+            chunk_size=4,
+        )
+        ref = ReferenceEvaluator(node)
+        got, got_state = ref.run(None, feeds)
+        assert_allclose(got, expected, rtol=1e-4, atol=1e-5)
+        assert_allclose(got_state, expected_state, rtol=1e-4, atol=1e-5)
+
+        # Streaming: segments are processed one after another, the state is
+        # carried by past_state and present_state.
+        state = feeds["past_state"]
+        outputs = []
+        for start in range(0, t, 5):
+            segment = {
+                k: None if v is None else v[:, start : start + 5]
+                for k, v in feeds.items()
+            }
+            output, state = ref.run(None, {**segment, "past_state": state})
+            outputs.append(output)
+        assert_allclose(np.concatenate(outputs, axis=1), expected, rtol=1e-4, atol=1e-5)
+        assert_allclose(state, expected_state, rtol=1e-4, atol=1e-5)
+
     def test_causal_conv_with_state_silu_fp16_function_body(self):
         # Regression test: the CausalConvWithState function body must upcast
         # Sigmoid/Mul to float32 for the SiLU activation, matching the
@@ -5,6 +5,8 @@
 from __future__ import annotations
 
 import contextlib
+import os
+import tempfile
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -13258,6 +13260,78 @@ class TestShapeInference(TestShapeInferenceHelper):
         assert inferred.graph.output[0].type.tensor_type.elem_type == TensorProto.FLOAT
         assert len(inferred.graph.output[0].type.tensor_type.shape.dim) == 0
 
+    def test_function_inference_is_cached_per_signature(self):
+        model = onnx.parser.parse_model(
+            """
+            <ir_version: 8, opset_import: [ "" : 18, "local" : 1 ]>
+            agraph (float[N, 4] X, float[N, 8] Z) => (float[N, 4] Y, float[N, 8] W) {
+                A = local.F (X)
+                B = local.F (A)
+                Y = local.F (B)
+                W = local.F (Z)
+            }
+            <opset_import: [ "" : 18 ], domain: "local">
+            F (x) => (y) { t = Relu(x) y = Neg(t) }
+            """
+        )
+        onnx.shape_inference.reset_function_inference_cache_stats()
+        inferred = onnx.shape_inference.infer_shapes(model, strict_mode=True)
+        assert onnx.shape_inference.function_inference_cache_stats() == {
+            "hits": 2,
+            "misses": 2,
+        }
+        value_infos = {vi.name: vi.type for vi in inferred.graph.value_info}
+        for name in ("A", "B"):
+            dims = value_infos[name].tensor_type.shape.dim
+            assert [d.dim_param or d.dim_value for d in dims] == ["N", 4]
+
+    def test_function_inference_cache_does_not_share_generated_symbols(self):
+        model = onnx.parser.parse_model(
+            """
+            <ir_version: 8, opset_import: [ "" : 18, "local" : 1 ]>
+            agraph (float[3] X) => (int64[1, ?] Y) {
+                A = local.F (X)
+                B = local.F (X)
+                Y = Concat <axis = 1> (A, B)
+            }
+            <opset_import: [ "" : 18 ], domain: "local">
+            F (x) => (y) { y = NonZero(x) }
+            """
+        )
+        onnx.shape_inference.reset_function_inference_cache_stats()
+        inferred = onnx.shape_inference.infer_shapes(model, strict_mode=True)
+        assert onnx.shape_inference.function_inference_cache_stats()["hits"] == 1
+        value_infos = {vi.name: vi.type for vi in inferred.graph.value_info}
+        a_dim = value_infos["A"].tensor_type.shape.dim[1]
+        b_dim = value_infos["B"].tensor_type.shape.dim[1]
+        # Both calls produce unknown, independent dimensions.
+        assert a_dim.dim_param != b_dim.dim_param
+
+    def test_function_inference_cache_skips_large_constant_inputs(self):
+        model = onnx.parser.parse_model(
+            """
+            <ir_version: 8, opset_import: [ "" : 18, "local" : 1 ]>
+            agraph (float[N] X) => (float[N] Y, float[N] Z) {
+                Y = local.F (X, C)
+                Z = local.F (X, C)
+            }
+            <opset_import: [ "" : 18 ], domain: "local">
+            F (x, c) => (y) { y = Add(x, c) }
+            """
+        )
+        # Larger than the constants serialized into the cache key.
+        model.graph.initializer.append(
+            onnx.numpy_helper.from_array(np.zeros(512, dtype=np.float32), "C")
+        )
+        onnx.shape_inference.reset_function_inference_cache_stats()
+        inferred = onnx.shape_inference.infer_shapes(model, strict_mode=True)
+        assert onnx.shape_inference.function_inference_cache_stats() == {
+            "hits": 0,
+            "misses": 0,
+        }
+        for output in inferred.graph.output:
+            assert output.type.tensor_type.elem_type == TensorProto.FLOAT
+
     def test_conv_transpose_undersized_weight_raises(self):
         # Weight rank < 3 violates ConvTranspose spec (C x M/group x k1...kn).
         model = onnx.parser.parse_model(
@@ -13269,6 +13343,157 @@ class TestShapeInference(TestShapeInferenceHelper):
         with pytest.raises(onnx.shape_inference.InferenceError):
             onnx.shape_inference.infer_shapes(model, strict_mode=True)
 
+    def test_infer_shapes_inplace(self):
+        model = onnx.parser.parse_model(
+            """
+            <ir_version: 8, opset_import: [ "" : 18 ]>
+            g (bool cond, float[N, 4] X) => (Y) {
+                T = Relu(X)
+                Y = If(cond) <
+                    then_branch = then () => (out) { out = Neg(T) },
+                    else_branch = else () => (out) { out = Abs(T) }
+                >
+            }
+            """
+        )
+        expected = onnx.shape_inference.infer_shapes(model, strict_mode=True)
+        result = onnx.shape_inference.infer_shapes(
+            model, strict_mode=True, inplace=True
+        )
+        assert result is model
+        assert model == expected
+        then_branch = model.graph.node[1].attribute[0].g
+        assert then_branch.output[0].type == expected.graph.output[0].type
+
+    def test_infer_shapes_inplace_subgraph_inputs(self):
+        model = onnx.parser.parse_model(
+            """
+            <ir_version: 8, opset_import: [ "" : 18 ]>
+            g (int64 M, bool cond, float[3] X) => (Y, S) {
+                Y = Loop(M, cond, X) <
+                    body = body (i, cond_in, x_in) => (cond_out, x_out) {
+                        cond_out = Identity(cond_in)
+                        x_out = Neg(x_in)
+                    }
+                >
+                S = Scan(X) <
+                    num_scan_inputs = 1,
+                    body = scan_body (x) => (y) { y = Abs(x) }
+                >
+            }
+            """
+        )
+        expected = onnx.shape_inference.infer_shapes(model, strict_mode=True)
+        onnx.shape_inference.infer_shapes(model, strict_mode=True, inplace=True)
+        assert model == expected
+        body_inputs = model.graph.node[0].attribute[0].g.input
+        assert body_inputs[0].type.tensor_type.elem_type == TensorProto.INT64
+        assert body_inputs[2].type.tensor_type.elem_type == TensorProto.FLOAT
+
+    def test_infer_shapes_inplace_rejects_bytes(self):
+        with pytest.raises(TypeError, match="inplace=True"):
+            onnx.shape_inference.infer_shapes(b"", inplace=True)
+
+    def _incremental_model(self) -> onnx.ModelProto:
+        model = onnx.parser.parse_model(
+            """
+            <ir_version: 8, opset_import: [ "" : 18 ]>
+            g (float[N, 4] X) => (C, D) {
+                A = Relu(X)
+                B = Neg(A)
+                C = Abs(B)
+                D = Sigmoid(X)
+            }
+            """
+        )
+        outputs = list(model.graph.output)
+        onnx.shape_inference.infer_shapes(model, strict_mode=True, inplace=True)
+        # The graph outputs are declared without type.
+        del model.graph.output[:]
+        model.graph.output.extend(outputs)
+        # Unaffected values keep their value_info, a wrong one shows they were not re-inferred.
+        for vi in model.graph.value_info:
+            if vi.name in ("C", "D"):
+                vi.type.tensor_type.shape.dim[1].dim_value = 7
+        return model
+
+    def _shapes(self, model: onnx.ModelProto) -> dict[str, list[int | str]]:
+        return {
+            vi.name: [d.dim_param or d.dim_value for d in vi.type.tensor_type.shape.dim]
+            for vi in model.graph.value_info
+        }
+
+    def test_infer_shapes_incremental_propagates_changes(self):
+        model = self._incremental_model()
+        model.graph.node[0].CopyFrom(make_node("Concat", ["X", "X"], ["A"], axis=1))
+        result = onnx.shape_inference.infer_shapes_incremental(
+            model, {"A"}, strict_mode=True
+        )
+        assert result is model
+        shapes = self._shapes(model)
+        assert shapes["A"] == shapes["B"] == shapes["C"] == ["N", 8]
+        assert shapes["D"] == ["N", 7]
+        value_infos = {vi.name: vi.type for vi in model.graph.value_info}
+        assert model.graph.output[0].type == value_infos["C"]
+
+    def test_infer_shapes_incremental_checks_graph_outputs(self):
+        model = onnx.parser.parse_model(
+            """
+            <ir_version: 8, opset_import: [ "" : 18 ]>
+            g (float[2, 3] X) => (float[2, 3] Z) {
+                A = Relu(X)
+                B = Neg(A)
+                C = Abs(B)
+                Z = Identity(C)
+            }
+            """
+        )
+        onnx.shape_inference.infer_shapes(model, strict_mode=True, inplace=True)
+        model.graph.node[0].CopyFrom(make_node("Transpose", ["X"], ["A"], perm=[1, 0]))
+        # The new shape of Z conflicts with the declared output as in a full inference.
+        with pytest.raises(onnx.shape_inference.InferenceError):
+            onnx.shape_inference.infer_shapes(model, strict_mode=True)
+        with pytest.raises(onnx.shape_inference.InferenceError):
+            onnx.shape_inference.infer_shapes_incremental(
+                model, ["A"], strict_mode=True
+            )
+
+    def test_infer_shapes_incremental_stops_on_unchanged_types(self):
+        model = self._incremental_model()
+        model.graph.node[0].CopyFrom(make_node("Sigmoid", ["X"], ["A"]))
+        onnx.shape_inference.infer_shapes_incremental(model, ["A"], strict_mode=True)
+        shapes = self._shapes(model)
+        # B reads A and is re-inferred, its type is unchanged so C is not.
+        assert shapes["B"] == ["N", 4]
+        assert shapes["C"] == ["N", 7]
+
+    def test_infer_shapes_incremental_infers_new_values(self):
+        model = self._incremental_model()
+        model.graph.node.append(make_node("Shape", ["D"], ["S"]))
+        onnx.shape_inference.infer_shapes_incremental(model, [], strict_mode=True)
+        shapes = self._shapes(model)
+        assert shapes["S"] == [2]
+        assert shapes["D"] == ["N", 7]
+
+    def test_infer_shapes_paths(self) -> None:
+        model = onnx.parser.parse_model(
+            """
+            <ir_version: 8, opset_import: [ "" : 18 ]>
+            g (float[N, 4] X) => (Y) { Y = Relu(X) }
+            """
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            inputs = [os.path.join(temp_dir, f"in{i}.onnx") for i in range(3)]
+            outputs = [os.path.join(temp_dir, f"out{i}.onnx") for i in range(3)]
+            for path in inputs[:2]:
+                onnx.save(model, path)
+            reports = onnx.shape_inference.infer_shapes_paths(
+                inputs, outputs, strict_mode=True, max_workers=2
+            )
+            assert [r.ok for r in reports] == [True, True, False]
+            for path in outputs[:2]:
+                assert self._shapes(onnx.load(path))["Y"] == ["N", 4]
+
     def test_infer_shapes_pathlike_error(self) -> None:
         with pytest.raises(
             TypeError,
@@ -9,9 +9,12 @@ import shutil
 import tarfile
 import tempfile
 
+import numpy as np
 import pytest
 
 import onnx
+import onnx.numpy_helper
+import onnx.parser
 from onnx import TensorProto, helper
 
 
@@ -62,6 +65,109 @@ class TestUtilityFunctions:
         assert m1.graph.output[1] == C1
         shutil.rmtree(tdir, ignore_errors=True)
 
+    def _chain_model(self) -> onnx.ModelProto:
+        model = onnx.parser.parse_model(
+            """
+            <ir_version: 8, opset_import: [ "" : 18 ]>
+            g (float[N] X) => (float[N] Y) <float[1] W = {2.0}, float[1] V = {3.0}> {
+                A = Mul (X, W)
+                B = Add (A, V)
+                C = Mul (B, W)
+                Y = Add (C, V)
+            }
+            """
+        )
+        return onnx.shape_inference.infer_shapes(model)
+
+    def test_extractor_reuse(self) -> None:
+        model = self._chain_model()
+        extractor = onnx.utils.Extractor(model)
+        boundaries = [(["X"], ["A"]), (["A"], ["C"]), (["B"], ["Y"]), (["X"], ["Y"])]
+        extracted = [extractor.extract_model(i, o) for i, o in boundaries]
+        for (inputs, outputs), sub_model in zip(boundaries, extracted, strict=True):
+            assert sub_model == onnx.utils.Extractor(model).extract_model(
+                inputs, outputs
+            )
+        assert [n.op_type for n in extracted[1].graph.node] == ["Add", "Mul"]
+        assert [t.name for t in extracted[1].graph.initializer] == ["W", "V"]
+        assert [t.name for t in extracted[0].graph.initializer] == ["W"]
+        assert [vi.name for vi in extracted[3].graph.value_info] == [
+            "A",
+            "B",
+            "C",
+            "X",
+            "Y",
+        ]
+
+    def test_extract_model_skips_complete_shape_inference(self, monkeypatch) -> None:
+        model = self._chain_model()
+        with tempfile.TemporaryDirectory() as tdir:
+            p0 = os.path.join(tdir, "original.onnx")
+            p1 = os.path.join(tdir, "extracted.onnx")
+            onnx.save(model, p0)
+
+            def fail(*_args, **_kwargs):
+                raise AssertionError("shape inference should be skipped")
+
+            monkeypatch.setattr(onnx.shape_inference, "infer_shapes", fail)
+            onnx.utils.extract_model(p0, p1, ["A"], ["C"])
+            assert len(onnx.load(p1).graph.node) == 2
+
+            del model.graph.value_info[1]
+            onnx.save(model, p0)
+            with pytest.raises(AssertionError, match="skipped"):
+                onnx.utils.extract_model(p0, p1, ["A"], ["C"])
+
+    def test_extract_model_copies_external_data_of_extracted_tensors(self) -> None:
+        model = self._chain_model()
+        model.graph.initializer.extend(
+            [
+                onnx.numpy_helper.from_array(
+                    np.full((256,), i, dtype=np.float32), f"unused{i}"
+                )
+                for i in range(4)
+            ]
+        )
+        for name, value in (("W", 5.0), ("V", 7.0)):
+            tensor = next(t for t in model.graph.initializer if t.name == name)
+            tensor.CopyFrom(
+                onnx.numpy_helper.from_array(
+                    np.full((1,), value, dtype=np.float32), name
+                )
+            )
+        with tempfile.TemporaryDirectory() as tdir:
+            p0 = os.path.join(tdir, "original.onnx")
+            p1 = os.path.join(tdir, "sub", "extracted.onnx")
+            os.mkdir(os.path.dirname(p1))
+            onnx.save(
+                model,
+                p0,
+                save_as_external_data=True,
+                location="original.data",
+                size_threshold=0,
+            )
+            onnx.utils.extract_model(p0, p1, ["B"], ["C"])
+
+            # Only W is read from the external data of the original model.
+            assert os.path.getsize(p1 + ".data") == 4
+            extracted = onnx.load(p1, load_external_data=False)
+            (tensor,) = extracted.graph.initializer
+            info = onnx.external_data_helper.ExternalDataInfo(tensor)
+            assert (info.location, info.offset, info.length) == (
+                "extracted.onnx.data",
+                0,
+                4,
+            )
+            onnx.load_external_data_for_model(extracted, os.path.dirname(p1))
+            np.testing.assert_array_equal(
+                onnx.numpy_helper.to_array(extracted.graph.initializer[0]), [5.0]
+            )
+
+            with pytest.raises(ValueError, match="overwritten"):
+                onnx.utils.extract_model(
+                    p0, os.path.join(tdir, "original"), ["B"], ["C"]
+                )
+
     def test_tar_members_filter_rejects_sibling_prefix_escape(self) -> None:
         with tempfile.TemporaryDirectory() as tdir:
             base = os.path.join(tdir, "model")
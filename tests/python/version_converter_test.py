@@ -15,6 +15,7 @@ import onnx.version_converter
 from onnx import (
     GraphProto,
     ModelProto,
+    NodeProto,
     OperatorSetIdProto,
     TensorProto,
     checker,
@@ -3241,3 +3242,42 @@ class TestVersionConverter:
     def test_celu_28_27_unsupported_type_fails(self, dtype: int) -> None:
         with pytest.raises(RuntimeError):
             self._celu_converted(dtype, 28, 27)
+
+    # Adapters rewriting a node (Upsample -> Resize) in a graph and a subgraph,
+    # the new nodes must go through the remaining conversion steps.
+    def test_upsample_rewritten_to_resize_8_13(self) -> None:
+        def upsample(name: str) -> NodeProto:
+            return helper.make_node(
+                "Upsample", ["X"], [name], mode="nearest", scales=[1.0, 1.0, 2.0, 2.0]
+            )
+
+        branch = helper.make_graph(
+            [upsample("Z")],
+            "then",
+            [],
+            [helper.make_tensor_value_info("Z", TensorProto.FLOAT, [1, 1, 4, 4])],
+        )
+        graph = helper.make_graph(
+            [
+                upsample("Y"),
+                helper.make_node(
+                    "If", ["C"], ["W"], then_branch=branch, else_branch=branch
+                ),
+            ],
+            "test_upsample_8_13",
+            [
+                helper.make_tensor_value_info("X", TensorProto.FLOAT, [1, 1, 2, 2]),
+                helper.make_tensor_value_info("C", TensorProto.BOOL, []),
+            ],
+            [
+                helper.make_tensor_value_info("Y", TensorProto.FLOAT, [1, 1, 4, 4]),
+                helper.make_tensor_value_info("W", TensorProto.FLOAT, [1, 1, 4, 4]),
+            ],
+        )
+        converted_model = self._converted(graph, helper.make_operatorsetid("", 8), 13)
+        assert converted_model.opset_import[0].version == 13
+        op_types = [n.op_type for n in converted_model.graph.node]
+        assert "Upsample" not in op_types
+        assert "Resize" in op_types
+        then_branch = converted_model.graph.node[-1].attribute[0].g
+        assert [n.op_type for n in then_branch.node] == op_types[:-1]